@@ -1,7 +1,9 @@
 from __future__ import with_statement
 from logging.config import fileConfig
+import asyncio
 from alembic import context
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 
 # Alembic config object (values from alembic.ini)
 config = context.config
@@ -32,14 +34,32 @@ def run_migrations_offline() -> None:
         context.run_migrations()
 
 
-def run_migrations_online() -> None:
-    # Use sync driver for running migrations
-    connectable = create_engine(settings.db_url.replace("+aiosqlite", ""))
+def do_run_migrations(connection) -> None:
+    if connection.dialect.name != "sqlite":
+        # Our revision ids are longer than Alembic's default VARCHAR(32), which
+        # SQLite never enforced; pre-create the version table wide enough.
+        connection.exec_driver_sql(
+            "CREATE TABLE IF NOT EXISTS alembic_version ("
+            "version_num VARCHAR(128) NOT NULL, "
+            "CONSTRAINT alembic_version_pkc PRIMARY KEY (version_num))"
+        )
+        connection.commit()
+    context.configure(connection=connection, target_metadata=Base.metadata)
+    with context.begin_transaction():
+        context.run_migrations()
+
 
-    with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=Base.metadata)
-        with context.begin_transaction():
-            context.run_migrations()
+async def run_async_migrations() -> None:
+    # Runs through the app's own async driver (aiosqlite or asyncpg), so no
+    # separate sync driver is needed for either backend.
+    connectable = create_async_engine(settings.db_url, poolclass=NullPool)
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await connectable.dispose()
+
+
+def run_migrations_online() -> None:
+    asyncio.run(run_async_migrations())
 
 
 if context.is_offline_mode():
@@ -44,7 +44,7 @@ def upgrade() -> None:
         sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
         sa.Column("group_id", sa.String(length=36), sa.ForeignKey("groups.id", ondelete="CASCADE"), nullable=False),
         sa.Column("user_id", sa.String(length=36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
-        sa.Column("is_admin", sa.Boolean, nullable=False, server_default=sa.text("0")),
+        sa.Column("is_admin", sa.Boolean, nullable=False, server_default=sa.false()),
         sa.Column("joined_at", sa.DateTime(timezone=True), nullable=False),
         sa.UniqueConstraint("group_id", "user_id", name="uq_group_user"),
     )
@@ -20,7 +20,7 @@ def upgrade() -> None:
     with op.batch_alter_table('group_members') as batch_op:
         batch_op.alter_column('user_id', existing_type=sa.String(length=36), nullable=True)
         batch_op.add_column(sa.Column('name', sa.String(length=120), nullable=True))
-        batch_op.add_column(sa.Column('is_ghost', sa.Boolean(), nullable=False, server_default=sa.text('0')))
+        batch_op.add_column(sa.Column('is_ghost', sa.Boolean(), nullable=False, server_default=sa.false()))
 
 
 def downgrade() -> None:
@@ -26,7 +26,7 @@ def upgrade() -> None:
         sa.Column("splits_json", sa.JSON(), nullable=False),
         sa.Column("day_of_month", sa.SmallInteger(), nullable=False),
         sa.Column("next_run_at", sa.Date(), nullable=False),
-        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.text("1")),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()),
         sa.Column("paused_reason", sa.Text(), nullable=True),
         sa.Column("created_by", sa.String(36), sa.ForeignKey("users.id"), nullable=False),
         sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
@@ -0,0 +1,27 @@
+"""scheduler_leases: DB-backed leases so one worker materializes each recurring shard
+
+Revision ID: 20261019_0001
+Revises: 20260701_0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0001"
+down_revision = "20260701_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scheduler_leases",
+        sa.Column("name", sa.String(100), primary_key=True),
+        sa.Column("holder", sa.String(200), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduler_leases")
@@ -0,0 +1,30 @@
+"""recurring_rules.frequency + interval; day_of_month nullable for weekly rules
+
+Revision ID: 20261019_0002
+Revises: 20261019_0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0002"
+down_revision = "20261019_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("recurring_rules") as batch:
+        batch.add_column(sa.Column("frequency", sa.String(10), nullable=False, server_default="monthly"))
+        batch.add_column(sa.Column("interval", sa.SmallInteger(), nullable=False, server_default="1"))
+        batch.alter_column("day_of_month", existing_type=sa.SmallInteger(), nullable=True)
+
+
+def downgrade() -> None:
+    # Weekly rules can't be expressed any more; they degrade to monthly on the 1st.
+    op.execute("UPDATE recurring_rules SET day_of_month = 1 WHERE day_of_month IS NULL")
+    with op.batch_alter_table("recurring_rules") as batch:
+        batch.alter_column("day_of_month", existing_type=sa.SmallInteger(), nullable=False)
+        batch.drop_column("interval")
+        batch.drop_column("frequency")
@@ -0,0 +1,28 @@
+"""expenses: partial index over live (non-deleted) expenses per group
+
+Revision ID: 20261019_0003
+Revises: 20261019_0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0003"
+down_revision = "20261019_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_expenses_group_live",
+        "expenses",
+        ["group_id", "date"],
+        sqlite_where=sa.text("deleted_at IS NULL"),
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_expenses_group_live", table_name="expenses")
@@ -0,0 +1,43 @@
+"""activity: types for every group change, feed pagination index
+
+Revision ID: 20261019_0005
+Revises: 20261019_0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0005"
+down_revision = "20261019_0004"
+branch_labels = None
+depends_on = None
+
+
+NEW_TYPES = (
+    "expense_deleted",
+    "member_removed",
+    "group_created",
+    "recurring_rule_created",
+    "recurring_rule_updated",
+    "recurring_rule_deleted",
+)
+
+
+def upgrade() -> None:
+    # SQLite stores the enum as plain VARCHAR without a CHECK; only PostgreSQL has a type to extend.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for value in NEW_TYPES:
+                op.execute(f"ALTER TYPE activity_type ADD VALUE IF NOT EXISTS '{value}'")
+    op.create_index("idx_activity_group_created", "activity", ["group_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_activity_group_created", table_name="activity")
+    # PostgreSQL cannot drop enum values; remove the rows that use them instead.
+    op.execute(
+        sa.text("DELETE FROM activity WHERE CAST(type AS TEXT) IN :types").bindparams(
+            sa.bindparam("types", value=list(NEW_TYPES), expanding=True)
+        )
+    )
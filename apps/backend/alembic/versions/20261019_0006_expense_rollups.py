@@ -0,0 +1,54 @@
+"""expense_rollups: monthly spend per group, member and currency
+
+Revision ID: 20261019_0006
+Revises: 20261019_0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0006"
+down_revision = "20261019_0005"
+branch_labels = None
+depends_on = None
+
+
+BACKFILL = """
+INSERT INTO expense_rollups (group_id, month, member_id, currency, paid_amount, paid_count, share_amount)
+SELECT group_id, month, member_id, currency, SUM(paid), SUM(n), SUM(share)
+FROM (
+    SELECT e.group_id, {month} AS month, e.paid_by_member_id AS member_id, e.currency,
+           e.total_amount AS paid, 1 AS n, 0 AS share
+    FROM expenses e
+    WHERE e.deleted_at IS NULL
+    UNION ALL
+    SELECT e.group_id, {month}, s.member_id, e.currency, 0, 0, s.share_amount
+    FROM expense_splits s JOIN expenses e ON e.id = s.expense_id
+    WHERE e.deleted_at IS NULL
+) AS rows
+GROUP BY group_id, month, member_id, currency
+"""
+
+MONTH = {
+    "postgresql": "CAST(date_trunc('month', timezone('UTC', e.date)) AS DATE)",
+    "sqlite": "date(e.date, 'start of month')",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "expense_rollups",
+        sa.Column("group_id", sa.String(length=36), sa.ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("month", sa.Date(), primary_key=True),
+        sa.Column("member_id", sa.Integer(), sa.ForeignKey("group_members.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("currency", sa.String(length=3), primary_key=True),
+        sa.Column("paid_amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("paid_count", sa.Integer(), nullable=False),
+        sa.Column("share_amount", sa.Numeric(14, 2), nullable=False),
+    )
+    op.execute(BACKFILL.format(month=MONTH[op.get_bind().dialect.name]))
+
+
+def downgrade() -> None:
+    op.drop_table("expense_rollups")
@@ -0,0 +1,55 @@
+"""expenses: full-text search over notes (SQLite FTS5, PostgreSQL GIN tsvector)
+
+Revision ID: 20261019_0007
+Revises: 20261019_0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "20261019_0007"
+down_revision = "20261019_0006"
+branch_labels = None
+depends_on = None
+
+
+# Same statements as app.db.models.expense.SEARCH_DDL, copied so this revision never changes.
+SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS expense_fts USING fts5("
+    "grp, note, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_insert AFTER INSERT ON expenses "
+    "WHEN new.deleted_at IS NULL AND new.note IS NOT NULL BEGIN "
+    "INSERT INTO expense_fts (rowid, grp, note) "
+    "VALUES (new.rowid, 'g' || replace(new.group_id, '-', ''), new.note); END",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_update AFTER UPDATE OF note, deleted_at, group_id ON expenses "
+    "BEGIN DELETE FROM expense_fts WHERE rowid = old.rowid; "
+    "INSERT INTO expense_fts (rowid, grp, note) "
+    "SELECT new.rowid, 'g' || replace(new.group_id, '-', ''), new.note "
+    "WHERE new.deleted_at IS NULL AND new.note IS NOT NULL; END",
+    "CREATE TRIGGER IF NOT EXISTS expenses_fts_delete AFTER DELETE ON expenses "
+    "BEGIN DELETE FROM expense_fts WHERE rowid = old.rowid; END",
+    # Backfill.
+    "INSERT INTO expense_fts (rowid, grp, note) "
+    "SELECT rowid, 'g' || replace(group_id, '-', ''), note FROM expenses "
+    "WHERE deleted_at IS NULL AND note IS NOT NULL",
+]
+
+POSTGRESQL = [
+    "CREATE INDEX IF NOT EXISTS idx_expenses_note_fts ON expenses "
+    "USING gin (to_tsvector('simple', coalesce(note, ''))) WHERE deleted_at IS NULL",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    for statement in {"sqlite": SQLITE, "postgresql": POSTGRESQL}.get(dialect, []):
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ("expenses_fts_insert", "expenses_fts_update", "expenses_fts_delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS expense_fts")
+    else:
+        op.execute("DROP INDEX IF EXISTS idx_expenses_note_fts")
@@ -0,0 +1,48 @@
+"""expenses: indexes for filtering by payer, amount, recurring rule and participant
+
+Revision ID: 20261019_0008
+Revises: 20261019_0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0008"
+down_revision = "20261019_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    live = sa.text("deleted_at IS NULL")
+    op.create_index(
+        "idx_expenses_payer_live",
+        "expenses",
+        ["paid_by_member_id", "date"],
+        sqlite_where=live,
+        postgresql_where=live,
+    )
+    op.create_index(
+        "idx_expenses_group_amount_live",
+        "expenses",
+        ["group_id", "total_amount"],
+        sqlite_where=live,
+        postgresql_where=live,
+    )
+    recurring = sa.text("recurring_rule_id IS NOT NULL")
+    op.create_index(
+        "idx_expenses_recurring_rule",
+        "expenses",
+        ["recurring_rule_id", "date"],
+        sqlite_where=recurring,
+        postgresql_where=recurring,
+    )
+    op.create_index("idx_expense_splits_member", "expense_splits", ["member_id", "expense_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("idx_expense_splits_member", table_name="expense_splits")
+    op.drop_index("idx_expenses_recurring_rule", table_name="expenses")
+    op.drop_index("idx_expenses_group_amount_live", table_name="expenses")
+    op.drop_index("idx_expenses_payer_live", table_name="expenses")
@@ -0,0 +1,42 @@
+"""recurring_rules: payer and creator FKs set null on delete
+
+With SQLite foreign keys enforced, removing a member who pays a recurring rule
+(or deleting its creator) failed on these FKs, which had no ON DELETE action.
+
+Revision ID: 20261019_0009
+Revises: 20261019_0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0009"
+down_revision = "20261019_0008"
+branch_labels = None
+depends_on = None
+
+# SQLite's FKs are unnamed; the convention names them when batch mode reflects the table.
+NAMING = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+FKS = [
+    ("recurring_rules_paid_by_member_id_fkey", "paid_by_member_id", sa.Integer(), "group_members"),
+    ("recurring_rules_created_by_fkey", "created_by", sa.String(36), "users"),
+]
+
+
+def _set_fks(ondelete: str | None, nullable: bool) -> None:
+    with op.batch_alter_table("recurring_rules", naming_convention=NAMING) as batch:
+        for name, column, type_, target in FKS:
+            batch.drop_constraint(name, type_="foreignkey")
+            batch.alter_column(column, existing_type=type_, nullable=nullable)
+            batch.create_foreign_key(name, target, [column], ["id"], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    _set_fks("SET NULL", nullable=True)
+
+
+def downgrade() -> None:
+    # Rules whose payer or creator is gone cannot satisfy NOT NULL any more.
+    op.execute("DELETE FROM recurring_rules WHERE paid_by_member_id IS NULL OR created_by IS NULL")
+    _set_fks(None, nullable=False)
@@ -0,0 +1,38 @@
+"""recurring_rules: stored group_hash for selecting a scheduler shard in SQL
+
+A worker's shard is group_hash % shard_count; filtering on it in the WHERE
+clause keeps `FOR UPDATE SKIP LOCKED` from locking other shards' rules.
+
+Revision ID: 20261019_0010
+Revises: 20261019_0009
+Create Date: 2026-10-19
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0010"
+down_revision = "20261019_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("recurring_rules", sa.Column("group_hash", sa.BigInteger(), nullable=True))
+    conn = op.get_bind()
+    rules = sa.table("recurring_rules", sa.column("group_id", sa.String), sa.column("group_hash", sa.BigInteger))
+    for (group_id,) in conn.execute(sa.select(rules.c.group_id).distinct()).all():
+        conn.execute(
+            rules.update()
+            .where(rules.c.group_id == group_id)
+            .values(group_hash=zlib.crc32(group_id.encode()))
+        )
+    with op.batch_alter_table("recurring_rules") as batch:
+        batch.alter_column("group_hash", existing_type=sa.BigInteger(), nullable=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("recurring_rules") as batch:
+        batch.drop_column("group_hash")
@@ -0,0 +1,80 @@
+"""expense_fts: key rows by expense id instead of the expenses rowid
+
+The rowid of `expenses` can be renumbered by VACUUM or a table rebuild, which
+silently pointed search hits at the wrong expenses. Rows now carry the expense
+id in an UNINDEXED column. SQLite only; PostgreSQL's index is unaffected.
+
+Revision ID: 20261019_0011
+Revises: 20261019_0010
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+
+revision = "20261019_0011"
+down_revision = "20261019_0010"
+branch_labels = None
+depends_on = None
+
+
+TRIGGERS = ("expenses_fts_insert", "expenses_fts_update", "expenses_fts_delete")
+
+# Same statements as app.db.models.expense.SEARCH_DDL, copied so this revision never changes.
+UPGRADE = [
+    "CREATE VIRTUAL TABLE expense_fts USING fts5("
+    "expense_id UNINDEXED, grp, note, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER expenses_fts_insert AFTER INSERT ON expenses "
+    "WHEN new.deleted_at IS NULL AND new.note IS NOT NULL BEGIN "
+    "INSERT INTO expense_fts (expense_id, grp, note) "
+    "VALUES (new.id, 'g' || replace(new.group_id, '-', ''), new.note); END",
+    "CREATE TRIGGER expenses_fts_update AFTER UPDATE OF note, deleted_at, group_id ON expenses "
+    "BEGIN DELETE FROM expense_fts "
+    "WHERE expense_fts MATCH 'grp : \"g' || replace(old.group_id, '-', '') || '\"' AND expense_id = old.id; "
+    "INSERT INTO expense_fts (expense_id, grp, note) "
+    "SELECT new.id, 'g' || replace(new.group_id, '-', ''), new.note "
+    "WHERE new.deleted_at IS NULL AND new.note IS NOT NULL; END",
+    "CREATE TRIGGER expenses_fts_delete AFTER DELETE ON expenses "
+    "BEGIN DELETE FROM expense_fts "
+    "WHERE expense_fts MATCH 'grp : \"g' || replace(old.group_id, '-', '') || '\"' AND expense_id = old.id; END",
+    "INSERT INTO expense_fts (expense_id, grp, note) "
+    "SELECT id, 'g' || replace(group_id, '-', ''), note FROM expenses "
+    "WHERE deleted_at IS NULL AND note IS NOT NULL",
+]
+
+# The 20261019_0007 schema.
+DOWNGRADE = [
+    "CREATE VIRTUAL TABLE expense_fts USING fts5("
+    "grp, note, tokenize = 'unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER expenses_fts_insert AFTER INSERT ON expenses "
+    "WHEN new.deleted_at IS NULL AND new.note IS NOT NULL BEGIN "
+    "INSERT INTO expense_fts (rowid, grp, note) "
+    "VALUES (new.rowid, 'g' || replace(new.group_id, '-', ''), new.note); END",
+    "CREATE TRIGGER expenses_fts_update AFTER UPDATE OF note, deleted_at, group_id ON expenses "
+    "BEGIN DELETE FROM expense_fts WHERE rowid = old.rowid; "
+    "INSERT INTO expense_fts (rowid, grp, note) "
+    "SELECT new.rowid, 'g' || replace(new.group_id, '-', ''), new.note "
+    "WHERE new.deleted_at IS NULL AND new.note IS NOT NULL; END",
+    "CREATE TRIGGER expenses_fts_delete AFTER DELETE ON expenses "
+    "BEGIN DELETE FROM expense_fts WHERE rowid = old.rowid; END",
+    "INSERT INTO expense_fts (rowid, grp, note) "
+    "SELECT rowid, 'g' || replace(group_id, '-', ''), note FROM expenses "
+    "WHERE deleted_at IS NULL AND note IS NOT NULL",
+]
+
+
+def _replace(statements: list[str]) -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for trigger in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS expense_fts")
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    _replace(UPGRADE)
+
+
+def downgrade() -> None:
+    _replace(DOWNGRADE)
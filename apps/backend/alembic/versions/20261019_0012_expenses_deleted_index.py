@@ -0,0 +1,31 @@
+"""expenses: index the group's soft-deleted expenses by deletion time
+
+Balances as of a past moment add back the expenses deleted after it.
+
+Revision ID: 20261019_0012
+Revises: 20261019_0011
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0012"
+down_revision = "20261019_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    deleted = sa.text("deleted_at IS NOT NULL")
+    op.create_index(
+        "idx_expenses_group_deleted",
+        "expenses",
+        ["group_id", "deleted_at"],
+        sqlite_where=deleted,
+        postgresql_where=deleted,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_expenses_group_deleted", table_name="expenses")
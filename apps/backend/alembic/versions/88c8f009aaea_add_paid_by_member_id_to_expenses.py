@@ -16,6 +16,24 @@ branch_labels = None
 depends_on = None
 
 def upgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        # Databases with real ALTER TABLE (PostgreSQL) keep the table, and with
+        # it the expense_splits foreign key that would block the drop below.
+        op.add_column(
+            'expenses',
+            sa.Column('paid_by_member_id', sa.Integer(), sa.ForeignKey('group_members.id', ondelete='CASCADE'), nullable=True),
+        )
+        op.execute("""
+            UPDATE expenses SET paid_by_member_id = (
+                SELECT gm.id FROM group_members gm
+                WHERE gm.group_id = expenses.group_id AND gm.user_id = expenses.created_by
+            )
+        """)
+        # Same outcome as the JOIN in the copy below: unmatched expenses are dropped.
+        op.execute("DELETE FROM expenses WHERE paid_by_member_id IS NULL")
+        op.alter_column('expenses', 'paid_by_member_id', nullable=False)
+        return
+
     # Add paid_by_member_id column to expenses table
     # For SQLite, we need to:
     # 1. Create new table with the new column
@@ -72,6 +90,10 @@ def upgrade() -> None:
 
 
 def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        op.drop_column('expenses', 'paid_by_member_id')
+        return
+
     # Reverse: remove paid_by_member_id column
     op.create_table(
         'expenses_old',
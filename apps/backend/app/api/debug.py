@@ -0,0 +1,54 @@
+"""Operator-only debugging endpoints (profiling). Hidden unless PROFILING_TOKEN is set."""
+import asyncio
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiling import StackSampler, profile_store, sampling_lock, token_ok
+
+
+router = APIRouter(prefix="/debug", tags=["debug"], include_in_schema=False)
+
+
+def _require_token(token: str | None) -> None:
+    if not settings.profiling_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not token_ok(token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def sample_profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    x_profile_token: str | None = Header(default=None),
+):
+    """Sample every thread of this worker for `seconds` and return collapsed stacks.
+
+    The worker keeps serving traffic meanwhile; feed the output to flamegraph.pl
+    or speedscope.
+    """
+    _require_token(x_profile_token)
+    if not sampling_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A profile is already being sampled")
+    try:
+        sampler = StackSampler(interval_ms / 1000)
+        sampler.start()
+        try:
+            await asyncio.sleep(min(seconds, settings.profiling_max_seconds))
+        finally:
+            sampler.stop()
+    finally:
+        sampling_lock.release()
+    return PlainTextResponse(sampler.collapsed(), headers={"X-Profile-Samples": str(sampler.samples)})
+
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_request_profile(profile_id: str, x_profile_token: str | None = Header(default=None)):
+    """pstats text of a request profiled via the X-Profile-Token header."""
+    _require_token(x_profile_token)
+    text = profile_store.get(profile_id)
+    if text is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(text)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from . import auth, users, groups, expenses, settlements, activity, uploads, recurring_rules
+from . import auth, users, groups, expenses, settlements, activity, stats, uploads, recurring_rules, events
 
 router = APIRouter()
 
@@ -10,5 +10,7 @@ router.include_router(groups.router, prefix="/groups", tags=["groups"])
 router.include_router(expenses.router, prefix="/groups", tags=["expenses"])  # nested under groups
 router.include_router(settlements.router, prefix="/groups", tags=["settlements"])  # nested
 router.include_router(activity.router, prefix="/groups", tags=["activity"])  # nested
+router.include_router(stats.router, prefix="/groups", tags=["stats"])  # spending rollups
+router.include_router(events.router, prefix="/groups", tags=["events"])  # SSE change stream
 router.include_router(uploads.router, prefix="/uploads", tags=["uploads"])  # receipts
 router.include_router(recurring_rules.router)  # prefix="/groups" already set on router
@@ -1,23 +1,40 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
-from app.core.deps import get_current_user, get_db
-from app.db.models.activity import Activity
+from app.api.v1._helpers import require_membership
+from app.core.deps import get_read_db, get_read_user
+from app.services.activity import list_group_activity, tail
 
 router = APIRouter()
 
 
-@router.get("/{group_id}/activity", response_model=list[dict])
-async def list_activity(group_id: str, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    res = await db.execute(select(Activity).where(Activity.group_id == group_id).order_by(Activity.created_at.desc()).limit(100))
-    items = res.scalars().all()
-    return [
-        {
-            "id": a.id,
-            "type": a.type,
-            "payload": a.payload,
-            "created_at": a.created_at.isoformat(),
-        }
-        for a in items
-    ]
+class ActivityItem(BaseModel):
+    id: str
+    type: str
+    user_id: str | None
+    payload: dict
+    created_at: str
+
+
+class ActivityPage(BaseModel):
+    items: list[ActivityItem]
+    # Pass as `before` to get the next (older) page; null on the last page.
+    next_cursor: str | None
+
+
+@router.get("/{group_id}/activity", response_model=ActivityPage)
+async def list_activity(
+    group_id: str,
+    before: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    current_user=Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """The group's activity feed, newest first, paginated with `next_cursor`."""
+    group = await require_membership(db, group_id, current_user.id)
+    try:
+        items, next_cursor = await list_group_activity(db, group, limit or tail.size, before)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ActivityPage(items=[ActivityItem(**i) for i in items], next_cursor=next_cursor)
@@ -0,0 +1,116 @@
+"""Server-Sent Events stream of a group's changes.
+
+``GET /groups/{group_id}/events`` starts with a ``hello`` event carrying the
+group's current revision, then relays every change event (``expense.created``,
+``settlement.created``, ``member.removed``, ...) with the revision after that
+change, as ``id:`` too. A client refetches when the revision moves past what it
+has shown, and always on ``resync``; there is nothing to poll in between.
+
+Browsers' EventSource cannot set headers. Such clients first call
+``POST /groups/{group_id}/events/token`` with the bearer header and connect with
+the returned short-lived ``?token=``, which only opens that group's stream; the
+access token itself never goes into a URL (and so into access logs). A
+reconnect fetches a fresh token.
+"""
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.background import BackgroundTask
+
+from app.api.v1._helpers import require_membership
+from app.core.config import settings
+from app.core.deps import get_current_user, get_db, security
+from app.core.events import hub
+from app.core.security import create_stream_token, decode_token
+from app.db.crud.user import get_user_by_id
+from app.db.models.user import User
+
+router = APIRouter()
+
+
+class StreamTokenResponse(BaseModel):
+    token: str
+    expires_in: int
+
+
+async def _stream_user(
+    group_id: str,
+    token: str | None = Query(default=None),
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    if credentials is not None or not token:
+        return await get_current_user(credentials, db)
+    payload = decode_token(token)
+    if not payload or payload.get("type") != "stream" or payload.get("grp") != group_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    user = await get_user_by_id(db, payload.get("sub"))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
+
+
+def _sse(event: dict) -> str:
+    lines = [f"event: {event['type']}"]
+    if event.get("revision") is not None:
+        lines.append(f"id: {event['revision']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(group_id: str, user_id: str, revision: int, queue: asyncio.Queue):
+    try:
+        yield _sse({"type": "hello", "group_id": group_id, "revision": revision})
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.events_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _sse(event)
+            if event["type"] == "group.deleted" or (
+                event["type"] == "member.removed" and event.get("user_id") == user_id
+            ):
+                return
+    finally:
+        hub.unsubscribe(group_id, queue)
+
+
+@router.post("/{group_id}/events/token", response_model=StreamTokenResponse)
+async def group_events_token(
+    group_id: str,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    await require_membership(db, group_id, current_user.id)
+    seconds = settings.events_token_seconds
+    return {"token": create_stream_token(current_user.id, group_id, seconds), "expires_in": seconds}
+
+
+@router.get("/{group_id}/events", response_class=StreamingResponse)
+async def group_events(
+    group_id: str,
+    current_user: User = Depends(_stream_user),
+    db: AsyncSession = Depends(get_db),
+):
+    # Subscribe before reading the revision so no change slips in between.
+    queue = hub.subscribe(group_id)
+    try:
+        group = await require_membership(db, group_id, current_user.id)
+    except HTTPException:
+        hub.unsubscribe(group_id, queue)
+        raise
+    # The request's session is closed before the body streams, so an open stream
+    # holds no pooled connection.
+    return StreamingResponse(
+        event_stream(group_id, current_user.id, group.revision, queue),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also runs if the client goes away before the stream's first chunk.
+        background=BackgroundTask(hub.unsubscribe, group_id, queue),
+    )
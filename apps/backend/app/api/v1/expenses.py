@@ -1,15 +1,22 @@
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from decimal import Decimal
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 import os
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_user, get_db, get_read_db, get_read_user
 from app.core.config import settings
 from app.db.models.expense import Expense, ExpenseSplit
 from app.db.models.group import GroupMember
 from app.services.expense_parser import parse_expense_text
+from app.services.activity import expense_payload, record_activity
+from app.services.expense_queries import ExpenseFilters, list_group_expenses
+from app.services.expense_search import search_expenses
+from app.services.group_events import queue_group_event
+from app.services.spending_stats import apply_expenses
 from app.api.v1._helpers import require_membership
 from app.services.receipt_parser import (
     parse_receipt,
@@ -32,39 +39,139 @@ class ExpenseCreate(BaseModel):
     paid_by_member_id: int  # member_id of the payer
 
 
-router = APIRouter()
+class ExpenseListItem(BaseModel):
+    id: str
+    total_amount: float
+    currency: str
+    note: str | None
+    date: str
+    created_by: str | None
+    participant_member_ids: list[int]
+    recurring_rule_id: int | None
 
 
-@router.get("/{group_id}/expenses", response_model=list[dict])
-async def list_expenses(group_id: str, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    # simple list without pagination for MVP
-    res = await db.execute(select(Expense).where(Expense.group_id == group_id, Expense.deleted_at.is_(None)).order_by(Expense.date.desc()))
-    expenses = res.scalars().all()
-    
-    result = []
-    for e in expenses:
-        # Get splits for this expense
-        splits_res = await db.execute(select(ExpenseSplit).where(ExpenseSplit.expense_id == e.id))
-        splits = splits_res.scalars().all()
-        
-        # Get member IDs involved in this expense
-        participant_ids = [s.member_id for s in splits]
-        
-        result.append({
+class ExpenseSplitOut(BaseModel):
+    member_id: int
+    share_amount: float
+    share_percentage: float | None
+
+
+class ExpenseOut(BaseModel):
+    id: str
+    group_id: str
+    created_by: str | None
+    total_amount: float
+    currency: str
+    note: str | None
+    date: str
+    splits: list[ExpenseSplitOut]
+    receipt_path: str | None
+    recurring_rule_id: int | None
+
+
+class ExpenseId(BaseModel):
+    id: str
+
+
+class ExpenseSearchPage(BaseModel):
+    items: list[ExpenseListItem]
+    # Pass as `offset` for the next page; null on the last page.
+    next_offset: int | None
+
+
+# Expense ids bound per splits query; asyncpg allows at most 32767 parameters per statement.
+SPLITS_BATCH = 10_000
+
+
+async def _list_items(db: AsyncSession, expenses: list[Expense]) -> list[dict]:
+    """ExpenseListItem dicts for `expenses`, loading their splits SPLITS_BATCH expenses per query."""
+    participants: dict[str, list[int]] = {e.id: [] for e in expenses}
+    ids = list(participants)
+    for i in range(0, len(ids), SPLITS_BATCH):
+        res = await db.execute(
+            select(ExpenseSplit.expense_id, ExpenseSplit.member_id)
+            .where(ExpenseSplit.expense_id.in_(ids[i:i + SPLITS_BATCH]))
+            .order_by(ExpenseSplit.id)
+        )
+        for expense_id, member_id in res.all():
+            participants[expense_id].append(member_id)
+    return [
+        {
             "id": e.id,
             "total_amount": float(e.total_amount),
             "currency": e.currency,
             "note": e.note,
             "date": e.date.isoformat(),
             "created_by": e.created_by,
-            "participant_member_ids": participant_ids,  # List of member_ids involved
+            "participant_member_ids": participants[e.id],
             "recurring_rule_id": e.recurring_rule_id,
-        })
-    
-    return result
+        }
+        for e in expenses
+    ]
+
+
+router = APIRouter()
+
+
+@router.get("/{group_id}/expenses", response_model=list[ExpenseListItem])
+async def list_expenses(
+    group_id: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    paid_by_member_id: int | None = None,
+    member_id: int | None = None,
+    min_amount: Decimal | None = Query(default=None, ge=0),
+    max_amount: Decimal | None = Query(default=None, ge=0),
+    recurring: bool | None = None,
+    recurring_rule_id: int | None = None,
+    limit: int | None = Query(default=None, ge=1, le=500),
+    before: str | None = None,
+    current_user=Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """The group's live expenses, newest first, optionally filtered.
+
+    `start` <= date < `end`; `member_id` keeps expenses that member shares in;
+    `recurring` picks materialized (true) or manual (false) expenses. With
+    `limit`, the `X-Next-Cursor` response header (absent on the last page) is
+    passed back as `before` for the next page.
+    """
+    await require_membership(db, group_id, current_user.id)
+    filters = ExpenseFilters(
+        start=start, end=end, paid_by_member_id=paid_by_member_id, member_id=member_id,
+        min_amount=min_amount, max_amount=max_amount, recurring=recurring, recurring_rule_id=recurring_rule_id,
+    )
+    try:
+        expenses, next_cursor = await list_group_expenses(db, group_id, filters, limit, before)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Rendered directly: FastAPI would re-validate every row against ExpenseListItem,
+    # which costs several times more than orjson itself on long lists.
+    response = ORJSONResponse(await _list_items(db, expenses))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response
+
+
+@router.get("/{group_id}/expenses/search", response_model=ExpenseSearchPage)
+async def search_group_expenses(
+    group_id: str,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    current_user=Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Live expenses whose note matches every word of `q` (as prefixes), best match first."""
+    await require_membership(db, group_id, current_user.id)
+    found = await search_expenses(db, group_id, q, limit + 1, offset)
+    return ExpenseSearchPage(
+        items=[ExpenseListItem(**i) for i in await _list_items(db, found[:limit])],
+        next_offset=offset + limit if len(found) > limit else None,
+    )
 
 
-@router.post("/{group_id}/expenses", response_model=dict)
+@router.post("/{group_id}/expenses", response_model=ExpenseId)
 async def create_expense(group_id: str, payload: ExpenseCreate, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     # basic membership check
     member = await db.execute(
@@ -87,7 +194,7 @@ async def create_expense(group_id: str, payload: ExpenseCreate, current_user=Dep
         created_by=payer_member.user_id,  # Will be None for ghost members
         paid_by_member_id=payload.paid_by_member_id,
         total_amount=payload.total_amount,
-        currency=payload.currency,
+        currency=payload.currency.upper(),
         note=payload.note,
         date=payload.date or datetime.utcnow(),
     )
@@ -102,46 +209,53 @@ async def create_expense(group_id: str, payload: ExpenseCreate, current_user=Dep
                 share_percentage=s.share_percentage,
             )
         )
+    await apply_expenses(db, [expense.id])
+    await queue_group_event(db, group_id, "expense.created", expense_id=expense.id)
+    record_activity(
+        db, group_id, "expense_created", current_user.id,
+        **expense_payload(expense.id, expense.total_amount, expense.currency, expense.note),
+    )
     await db.commit()
     await db.refresh(expense)
-    return {"id": expense.id}
+    return ExpenseId(id=expense.id)
 
 
-@router.get("/expenses/{expense_id}", response_model=dict)
-async def get_expense(expense_id: str, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+@router.get("/expenses/{expense_id}", response_model=ExpenseOut)
+async def get_expense(expense_id: str, current_user=Depends(get_read_user), db: AsyncSession = Depends(get_read_db)):
     expense = await db.get(Expense, expense_id)
     if not expense or expense.deleted_at is not None:
         raise HTTPException(status_code=404, detail="Expense not found")
     splits_res = await db.execute(select(ExpenseSplit).where(ExpenseSplit.expense_id == expense_id))
     splits = [
-        {
-            "member_id": s.member_id,
-            "share_amount": float(s.share_amount),
-            "share_percentage": float(s.share_percentage) if s.share_percentage is not None else None,
-        }
+        ExpenseSplitOut(
+            member_id=s.member_id,
+            share_amount=float(s.share_amount),
+            share_percentage=float(s.share_percentage) if s.share_percentage is not None else None,
+        )
         for s in splits_res.scalars().all()
     ]
-    return {
-        "id": expense.id,
-        "group_id": expense.group_id,
-        "created_by": expense.created_by,
-        "total_amount": float(expense.total_amount),
-        "currency": expense.currency,
-        "note": expense.note,
-        "date": expense.date.isoformat(),
-        "splits": splits,
-        "receipt_path": expense.receipt_path,
-        "recurring_rule_id": expense.recurring_rule_id,
-    }
-
-
-@router.put("/expenses/{expense_id}", response_model=dict)
+    return ExpenseOut(
+        id=expense.id,
+        group_id=expense.group_id,
+        created_by=expense.created_by,
+        total_amount=float(expense.total_amount),
+        currency=expense.currency,
+        note=expense.note,
+        date=expense.date.isoformat(),
+        splits=splits,
+        receipt_path=expense.receipt_path,
+        recurring_rule_id=expense.recurring_rule_id,
+    )
+
+
+@router.put("/expenses/{expense_id}", response_model=ExpenseId)
 async def update_expense(expense_id: str, payload: ExpenseCreate, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
     expense = await db.get(Expense, expense_id)
     if not expense or expense.deleted_at is not None:
         raise HTTPException(status_code=404, detail="Expense not found")
+    await apply_expenses(db, [expense_id], -1)
     expense.total_amount = payload.total_amount
-    expense.currency = payload.currency
+    expense.currency = payload.currency.upper()
     expense.note = payload.note
     expense.date = payload.date or expense.date
     
@@ -159,8 +273,14 @@ async def update_expense(expense_id: str, payload: ExpenseCreate, current_user=D
     )
     for s in payload.splits:
         db.add(ExpenseSplit(expense_id=expense_id, member_id=s.member_id, share_amount=s.share_amount, share_percentage=s.share_percentage))
+    await apply_expenses(db, [expense_id])
+    await queue_group_event(db, expense.group_id, "expense.updated", expense_id=expense_id)
+    record_activity(
+        db, expense.group_id, "expense_updated", current_user.id,
+        **expense_payload(expense_id, expense.total_amount, expense.currency, expense.note),
+    )
     await db.commit()
-    return {"id": expense.id}
+    return ExpenseId(id=expense.id)
 
 
 @router.delete("/expenses/{expense_id}", status_code=204)
@@ -168,7 +288,13 @@ async def delete_expense(expense_id: str, current_user=Depends(get_current_user)
     expense = await db.get(Expense, expense_id)
     if not expense or expense.deleted_at is not None:
         return None
+    await apply_expenses(db, [expense_id], -1)
     expense.deleted_at = datetime.utcnow()
+    await queue_group_event(db, expense.group_id, "expense.deleted", expense_id=expense_id)
+    record_activity(
+        db, expense.group_id, "expense_deleted", current_user.id,
+        **expense_payload(expense_id, expense.total_amount, expense.currency, expense.note),
+    )
     await db.commit()
     return None
 
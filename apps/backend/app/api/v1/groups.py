@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import exists, or_, select
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_user, get_db, get_read_db, get_read_user
+from app.db.models.expense import Expense, ExpenseSplit
 from app.db.models.group import Group, GroupMember
+from app.db.models.settlement import Settlement
 from app.db.models.user import User
 from app.db.crud.user import get_user_by_email
+from app.services.activity import record_activity
+from app.services.group_events import queue_group_event
+from app.services.recurring_expenses import pause_member_rules
 
 
 class GroupCreate(BaseModel):
@@ -15,11 +20,38 @@ class GroupCreate(BaseModel):
     icon: str | None = None
 
 
+class GroupSummary(BaseModel):
+    id: str
+    name: str
+    currency: str
+
+
+class GroupOut(GroupSummary):
+    icon: str | None
+
+
+class GroupMemberOut(BaseModel):
+    member_id: int
+    user_id: str | None
+    is_admin: bool
+    joined_at: str
+    name: str | None
+    email: str | None
+    avatar_url: str | None
+    is_ghost: bool
+    payment_methods: list[dict]
+
+
+class GroupDetail(GroupOut):
+    revision: int
+    members: list[GroupMemberOut]
+
+
 router = APIRouter()
 
 
-@router.get("/", response_model=list[dict])
-async def list_groups(current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+@router.get("/", response_model=list[GroupSummary])
+async def list_groups(current_user=Depends(get_read_user), db: AsyncSession = Depends(get_read_db)):
     stmt = (
         select(Group)
         .join(GroupMember, GroupMember.group_id == Group.id)
@@ -28,23 +60,24 @@ async def list_groups(current_user=Depends(get_current_user), db: AsyncSession =
     )
     res = await db.execute(stmt)
     groups = res.scalars().all()
-    return [{"id": g.id, "name": g.name, "currency": g.currency} for g in groups]
+    return [GroupSummary(id=g.id, name=g.name, currency=g.currency) for g in groups]
 
 
-@router.post("/", response_model=dict)
+@router.post("/", response_model=GroupOut)
 async def create_group(payload: GroupCreate, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    group = Group(name=payload.name, currency=payload.currency, icon=payload.icon, created_by=current_user.id)
+    group = Group(name=payload.name, currency=payload.currency.upper(), icon=payload.icon, created_by=current_user.id)
     db.add(group)
     await db.flush()
     member = GroupMember(group_id=group.id, user_id=current_user.id, is_admin=True)
     db.add(member)
+    record_activity(db, group.id, "group_created", current_user.id, name=group.name)
     await db.commit()
     await db.refresh(group)
-    return {"id": group.id, "name": group.name, "currency": group.currency, "icon": group.icon}
+    return GroupOut(id=group.id, name=group.name, currency=group.currency, icon=group.icon)
 
 
-@router.get("/{group_id}", response_model=dict)
-async def get_group(group_id: str, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+@router.get("/{group_id}", response_model=GroupDetail)
+async def get_group(group_id: str, current_user=Depends(get_read_user), db: AsyncSession = Depends(get_read_db)):
     group = await db.get(Group, group_id)
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
@@ -55,20 +88,22 @@ async def get_group(group_id: str, current_user=Depends(get_current_user), db: A
     )
     rows = members_res.all()
     members = [
-        {
-            "member_id": gm.id,
-            "user_id": gm.user_id,
-            "is_admin": gm.is_admin,
-            "joined_at": gm.joined_at.isoformat(),
-            "name": (u.name if u is not None else gm.name),
-            "email": (u.email if u is not None else None),
-            "avatar_url": (u.avatar_url if u is not None else None),
-            "is_ghost": gm.is_ghost,
-            "payment_methods": (u.payment_methods if u is not None else []) or [],
-        }
+        GroupMemberOut(
+            member_id=gm.id,
+            user_id=gm.user_id,
+            is_admin=gm.is_admin,
+            joined_at=gm.joined_at.isoformat(),
+            name=(u.name if u is not None else gm.name),
+            email=(u.email if u is not None else None),
+            avatar_url=(u.avatar_url if u is not None else None),
+            is_ghost=gm.is_ghost,
+            payment_methods=(u.payment_methods if u is not None else []) or [],
+        )
         for gm, u in rows
     ]
-    return {"id": group.id, "name": group.name, "currency": group.currency, "icon": group.icon, "members": members}
+    return GroupDetail(
+        id=group.id, name=group.name, currency=group.currency, icon=group.icon, revision=group.revision, members=members
+    )
 
 
 @router.delete("/{group_id}", status_code=204)
@@ -83,6 +118,7 @@ async def delete_group(group_id: str, current_user=Depends(get_current_user), db
     if not (is_creator or is_admin):
         raise HTTPException(status_code=403, detail="Not allowed to delete group")
     # hard-delete; FKs cascade
+    await queue_group_event(db, group_id, "group.deleted")
     await db.delete(group)
     await db.commit()
     return None
@@ -113,11 +149,33 @@ async def delete_member(
     is_admin = admin_res.scalars().first() is not None
     if not (is_creator or is_admin or gm.user_id == current_user.id):
         raise HTTPException(status_code=403, detail="Not allowed to remove member")
-    await db.delete(gm)
+    await queue_group_event(db, group_id, "member.removed", member_id=member_id, user_id=gm.user_id)
+    record_activity(db, group_id, "member_removed", current_user.id, member_id=member_id, name=gm.name)
+    await pause_member_rules(db, group_id, member_id)
+    if await _has_history(db, member_id):
+        # Deleting the row would cascade to every expense they paid or share in and
+        # every settlement they made, changing everyone's balances. Keep it as a ghost.
+        if gm.user_id is not None and not gm.name:
+            user = await db.get(User, gm.user_id)
+            gm.name = user.name if user else None
+        gm.user_id = None
+        gm.is_ghost = True
+        gm.is_admin = False
+    else:
+        await db.delete(gm)
     await db.commit()
     return None
 
 
+async def _has_history(db: AsyncSession, member_id: int) -> bool:
+    """Whether any expense (live or deleted), split or settlement references the member."""
+    return bool(await db.scalar(select(or_(
+        exists().where(Expense.paid_by_member_id == member_id),
+        exists().where(ExpenseSplit.member_id == member_id),
+        exists().where(or_(Settlement.from_member_id == member_id, Settlement.to_member_id == member_id)),
+    ))))
+
+
 class AddMemberRequest(BaseModel):
     email: EmailStr | None = None
     name: str | None = None
@@ -148,6 +206,9 @@ async def add_member(
             # create ghost member with provided name fallback from email
             gm = GroupMember(group_id=group_id, user_id=None, is_admin=bool(payload.is_admin), name=payload.name or payload.email.split('@')[0], is_ghost=True)
             db.add(gm)
+            await db.flush()
+            await queue_group_event(db, group_id, "member.added", member_id=gm.id)
+            record_activity(db, group_id, "member_added", current_user.id, member_id=gm.id, name=gm.name)
             await db.commit()
             await db.refresh(gm)
             return {"user_id": None, "is_admin": gm.is_admin, "joined_at": gm.joined_at.isoformat(), "name": gm.name, "email": payload.email, "avatar_url": None, "is_ghost": True}
@@ -159,6 +220,9 @@ async def add_member(
             raise HTTPException(status_code=400, detail="Already a member")
         gm = GroupMember(group_id=group_id, user_id=user.id, is_admin=bool(payload.is_admin), name=user.name, is_ghost=False)
         db.add(gm)
+        await db.flush()
+        await queue_group_event(db, group_id, "member.added", member_id=gm.id)
+        record_activity(db, group_id, "member_added", current_user.id, member_id=gm.id, name=gm.name)
         await db.commit()
         await db.refresh(gm)
         return {"user_id": gm.user_id, "is_admin": gm.is_admin, "joined_at": gm.joined_at.isoformat(), "name": user.name, "email": user.email, "avatar_url": user.avatar_url, "is_ghost": False}
@@ -168,6 +232,9 @@ async def add_member(
         raise HTTPException(status_code=400, detail="Name required for ghost member")
     gm = GroupMember(group_id=group_id, user_id=None, is_admin=bool(payload.is_admin), name=payload.name, is_ghost=True)
     db.add(gm)
+    await db.flush()
+    await queue_group_event(db, group_id, "member.added", member_id=gm.id)
+    record_activity(db, group_id, "member_added", current_user.id, member_id=gm.id, name=gm.name)
     await db.commit()
     await db.refresh(gm)
     return {"user_id": None, "is_admin": gm.is_admin, "joined_at": gm.joined_at.isoformat(), "name": gm.name, "email": None, "avatar_url": None, "is_ghost": True}
@@ -1,21 +1,23 @@
 """Recurring rules CRUD + pause/resume endpoints."""
 from __future__ import annotations
 
-import calendar
 from datetime import date
 from decimal import Decimal
+from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1._helpers import require_membership
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_user, get_db, get_read_db, get_read_user
 from app.db.models.group import GroupMember
 from app.db.models.recurring_rule import RecurringRule
 from app.db.models.user import User
-from app.services.recurring_expenses import next_monthly_date
+from app.services.activity import record_activity
+from app.services.group_events import queue_group_event
+from app.services.recurring_expenses import first_occurrence, next_monthly_date
 
 
 router = APIRouter(prefix="/groups", tags=["recurring-rules"])
@@ -33,9 +35,23 @@ class RecurringRuleCreate(BaseModel):
     currency: str = Field(min_length=3, max_length=3)
     note: str | None = None
     splits: list[SplitIn]
-    day_of_month: int = Field(ge=1, le=31)
+    # Every `interval` weeks / months / years, e.g. weekly+2 = bi-weekly.
+    frequency: Literal["weekly", "monthly", "yearly"] = "monthly"
+    interval: int = Field(default=1, ge=1, le=52)
+    day_of_month: int | None = Field(default=None, ge=1, le=31)  # monthly + yearly
+    day_of_week: int | None = Field(default=None, ge=0, le=6)  # weekly; Monday = 0
+    month: int | None = Field(default=None, ge=1, le=12)  # yearly; defaults to the current month
     start_from_next_month: bool = True
 
+    @model_validator(mode="after")
+    def _check_anchor(self) -> "RecurringRuleCreate":
+        if self.frequency == "weekly":
+            if self.day_of_week is None:
+                raise ValueError("day_of_week is required for weekly rules")
+        elif self.day_of_month is None:
+            raise ValueError("day_of_month is required for monthly and yearly rules")
+        return self
+
 
 def _serialize(rule: RecurringRule) -> dict:
     return {
@@ -46,23 +62,48 @@ def _serialize(rule: RecurringRule) -> dict:
         "currency": rule.currency,
         "note": rule.note,
         "splits": rule.splits_json,
+        "frequency": rule.frequency,
+        "interval": rule.interval,
         "day_of_month": rule.day_of_month,
+        "day_of_week": rule.next_run_at.weekday() if rule.frequency == "weekly" else None,
+        "month": rule.next_run_at.month if rule.frequency == "yearly" else None,
         "next_run_at": rule.next_run_at.isoformat(),
         "is_active": rule.is_active,
         "paused_reason": rule.paused_reason,
     }
 
 
-def _first_next_run(day_of_month: int, start_from_next_month: bool, today: date) -> date:
-    """If starting next month, jump ahead; otherwise this month if dom hasn't passed, else next."""
-    if start_from_next_month:
+def _first_next_run(
+    frequency: str,
+    day_of_month: int | None,
+    day_of_week: int | None,
+    month: int | None,
+    start_from_next_month: bool,
+    today: date,
+) -> date:
+    """If starting next month, jump ahead; otherwise this month if dom hasn't passed, else next.
+
+    For weekly and yearly rules `start_from_next_month` means "not today": the first
+    run is the next matching day strictly after today.
+    """
+    if frequency == "monthly" and start_from_next_month:
         return next_monthly_date(today, day_of_month)
-    last = calendar.monthrange(today.year, today.month)[1]
-    dom = min(day_of_month, last)
-    candidate = date(today.year, today.month, dom)
-    if candidate >= today:
-        return candidate
-    return next_monthly_date(today, day_of_month)
+    return first_occurrence(
+        frequency,
+        today=today,
+        day_of_month=day_of_month,
+        day_of_week=day_of_week,
+        month=month or today.month,
+        after_today=start_from_next_month,
+    )
+
+
+async def _record_rule_change(db: AsyncSession, rule: RecurringRule, change: str, user_id: str, **extra) -> None:
+    await queue_group_event(db, rule.group_id, f"recurring_rule.{change}", rule_id=rule.id)
+    record_activity(
+        db, rule.group_id, f"recurring_rule_{change}", user_id,
+        rule_id=rule.id, amount=float(rule.total_amount), currency=rule.currency, note=rule.note, **extra,
+    )
 
 
 @router.post("/{group_id}/recurring-rules", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -90,12 +131,19 @@ async def create_recurring_rule(
         currency=payload.currency.upper(),
         note=payload.note,
         splits_json=[s.model_dump() for s in payload.splits],
-        day_of_month=payload.day_of_month,
-        next_run_at=_first_next_run(payload.day_of_month, payload.start_from_next_month, date.today()),
+        frequency=payload.frequency,
+        interval=payload.interval,
+        day_of_month=None if payload.frequency == "weekly" else payload.day_of_month,
+        next_run_at=_first_next_run(
+            payload.frequency, payload.day_of_month, payload.day_of_week, payload.month,
+            payload.start_from_next_month, date.today(),
+        ),
         is_active=True,
         created_by=current_user.id,
     )
     db.add(rule)
+    await db.flush()
+    await _record_rule_change(db, rule, "created", current_user.id)
     await db.commit()
     await db.refresh(rule)
     return _serialize(rule)
@@ -104,8 +152,8 @@ async def create_recurring_rule(
 @router.get("/{group_id}/recurring-rules", response_model=dict)
 async def list_recurring_rules(
     group_id: str,
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     await require_membership(db, group_id, current_user.id)
     res = await db.execute(
@@ -131,7 +179,20 @@ async def update_recurring_rule(
     rule.currency = payload.currency.upper()
     rule.note = payload.note
     rule.splits_json = [s.model_dump() for s in payload.splits]
-    rule.day_of_month = payload.day_of_month
+    schedule_changed = (
+        (rule.frequency, rule.interval) != (payload.frequency, payload.interval)
+        or (payload.frequency == "weekly" and rule.next_run_at.weekday() != payload.day_of_week)
+        or (payload.frequency == "yearly" and payload.month and rule.next_run_at.month != payload.month)
+    )
+    rule.frequency = payload.frequency
+    rule.interval = payload.interval
+    rule.day_of_month = None if payload.frequency == "weekly" else payload.day_of_month
+    if schedule_changed:
+        rule.next_run_at = _first_next_run(
+            payload.frequency, payload.day_of_month, payload.day_of_week, payload.month,
+            payload.start_from_next_month, date.today(),
+        )
+    await _record_rule_change(db, rule, "updated", current_user.id)
     await db.commit()
     await db.refresh(rule)
     return _serialize(rule)
@@ -149,6 +210,7 @@ async def pause_rule(
     if not rule or rule.group_id != group_id:
         raise HTTPException(status_code=404, detail="Rule not found")
     rule.is_active = False
+    await _record_rule_change(db, rule, "updated", current_user.id, paused=True)
     await db.commit()
     await db.refresh(rule)
     return _serialize(rule)
@@ -165,11 +227,17 @@ async def resume_rule(
     rule = await db.get(RecurringRule, rule_id)
     if not rule or rule.group_id != group_id:
         raise HTTPException(status_code=404, detail="Rule not found")
+    if rule.paid_by_member_id is None:
+        raise HTTPException(status_code=400, detail="The rule's payer left the group; choose a new payer first")
     rule.is_active = True
     rule.paused_reason = None
     today = date.today()
     if rule.next_run_at < today:
-        rule.next_run_at = _first_next_run(rule.day_of_month, True, today)
+        rule.next_run_at = _first_next_run(
+            rule.frequency, rule.day_of_month, rule.next_run_at.weekday(), rule.next_run_at.month,
+            True, today,
+        )
+    await _record_rule_change(db, rule, "updated", current_user.id, paused=False)
     await db.commit()
     await db.refresh(rule)
     return _serialize(rule)
@@ -186,5 +254,6 @@ async def delete_recurring_rule(
     rule = await db.get(RecurringRule, rule_id)
     if not rule or rule.group_id != group_id:
         raise HTTPException(status_code=404, detail="Rule not found")
+    await _record_rule_change(db, rule, "deleted", current_user.id)
     await db.delete(rule)
     await db.commit()
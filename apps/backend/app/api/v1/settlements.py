@@ -1,15 +1,19 @@
+from datetime import date, datetime
 from typing import Literal
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_user, get_db, get_read_db, get_read_user
 from app.db.models.group import Group, GroupMember
 from app.db.models.settlement import Settlement
 from app.services.balances import compute_group_balances
-from app.services.settlements import settlement_suggestions
+from app.services.activity import record_activity
+from app.services.group_events import queue_group_event
+from app.services.settlements import group_settlement_suggestions
 from app.api.v1._helpers import require_membership
 
 
@@ -19,27 +23,96 @@ class SettlementCreate(BaseModel):
     amount: float
     method: str = "manual"
     via_payment_method: Literal["upi", "paypal", "venmo", "cashapp", "iban", "other", "manual"] | None = None
+    # Defaults to the group's currency.
+    currency: str | None = Field(default=None, pattern="^[A-Za-z]{3}$")
+
+
+class FxRateOut(BaseModel):
+    rate: float  # multiplier into the group's currency
+    date: str | None
+
+
+class BalancesOut(BaseModel):
+    group_id: str
+    currency: str
+    # member_id (as a string) -> net balance in `currency`, other currencies converted at `rates`
+    balances: dict[str, float]
+    # currency -> member_id -> net balance in that currency alone
+    by_currency: dict[str, dict[str, float]]
+    rates: dict[str, FxRateOut]
+    # Currencies with no FX rate; not included in `balances`.
+    unconverted: list[str]
+
+
+class Transfer(BaseModel):
+    from_member_id: int
+    to_member_id: int
+    amount: float
+    currency: str
+
+
+class SettlementCreated(BaseModel):
+    id: str
+    currency: str
+
+
+class SettlementOut(BaseModel):
+    id: str
+    from_member_id: int
+    to_member_id: int
+    amount: float
+    currency: str
+    method: str
+    status: str
+    via_payment_method: str | None
+    created_at: str | None
 
 
 router = APIRouter()
 
 
-@router.get("/{group_id}/balances", response_model=dict)
-async def get_balances(group_id: str, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    await require_membership(db, group_id, current_user.id)
-    balances = await compute_group_balances(db, group_id)
+@router.get("/{group_id}/balances", response_model=BalancesOut)
+async def get_balances(
+    group_id: str,
+    on: date | None = None,
+    as_of: datetime | None = None,
+    current_user=Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Balances in the group's currency, converting others at the FX rates of `on` (default today).
+
+    `as_of` gives the balances at that moment: expenses dated up to it and
+    settlements recorded by then, converted at that day's rates by default.
+    """
+    group = await require_membership(db, group_id, current_user.id)
+    result = await compute_group_balances(db, group_id, group.currency, on, as_of)
     # JSON object keys must be strings.
-    return {"group_id": group_id, "balances": {str(k): v for k, v in balances.items()}}
+    return BalancesOut(
+        group_id=group_id,
+        currency=result.currency,
+        balances={str(k): v for k, v in result.balances.items()},
+        by_currency={c: {str(k): v for k, v in members.items()} for c, members in result.by_currency.items()},
+        rates={
+            c: FxRateOut(rate=float(rate), date=day.isoformat() if day else None)
+            for c, (rate, day) in result.rates.items()
+        },
+        unconverted=sorted(result.unconverted),
+    )
 
 
-@router.get("/{group_id}/settlements/suggestions", response_model=list[dict])
-async def get_suggestions(group_id: str, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
-    await require_membership(db, group_id, current_user.id)
-    balances = await compute_group_balances(db, group_id)
-    return settlement_suggestions(balances)
+@router.get("/{group_id}/settlements/suggestions", response_model=list[Transfer])
+async def get_suggestions(
+    group_id: str,
+    on: date | None = None,
+    current_user=Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    group = await require_membership(db, group_id, current_user.id)
+    balances = await compute_group_balances(db, group_id, group.currency, on)
+    return [Transfer(**t) for t in group_settlement_suggestions(balances)]
 
 
-@router.post("/{group_id}/settlements", response_model=dict)
+@router.post("/{group_id}/settlements", response_model=SettlementCreated)
 async def create_settlement(
     group_id: str,
     payload: SettlementCreate,
@@ -64,19 +137,26 @@ async def create_settlement(
         from_member_id=payload.from_member_id,
         to_member_id=payload.to_member_id,
         amount=payload.amount,
-        currency=group.currency,
+        currency=(payload.currency or group.currency).upper(),
         method=payload.method,
         status="success",
         via_payment_method=payload.via_payment_method,
     )
     db.add(st)
+    await db.flush()
+    await queue_group_event(db, group_id, "settlement.created", settlement_id=st.id)
+    record_activity(
+        db, group_id, "settlement_created", current_user.id,
+        settlement_id=st.id, from_member_id=st.from_member_id, to_member_id=st.to_member_id,
+        amount=float(st.amount), currency=st.currency,
+    )
     await db.commit()
     await db.refresh(st)
-    return {"id": st.id, "currency": st.currency}
+    return SettlementCreated(id=st.id, currency=st.currency)
 
 
-@router.get("/{group_id}/settlements", response_model=list[dict])
-async def list_settlements(group_id: str, current_user=Depends(get_current_user), db: AsyncSession = Depends(get_db)):
+@router.get("/{group_id}/settlements", response_model=list[SettlementOut])
+async def list_settlements(group_id: str, current_user=Depends(get_read_user), db: AsyncSession = Depends(get_read_db)):
     """Recorded settlements in this group, newest first."""
     await require_membership(db, group_id, current_user.id)
     res = await db.execute(
@@ -84,7 +164,8 @@ async def list_settlements(group_id: str, current_user=Depends(get_current_user)
         .where(Settlement.group_id == group_id)
         .order_by(Settlement.created_at.desc())
     )
-    return [
+    # Rendered directly, skipping per-row re-validation (see list_expenses).
+    return ORJSONResponse([
         {
             "id": s.id,
             "from_member_id": s.from_member_id,
@@ -97,4 +178,4 @@ async def list_settlements(group_id: str, current_user=Depends(get_current_user)
             "created_at": s.created_at.isoformat() if s.created_at else None,
         }
         for s in res.scalars().all()
-    ]
+    ])
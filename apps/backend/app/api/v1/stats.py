@@ -0,0 +1,63 @@
+from datetime import date, datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1._helpers import require_membership
+from app.core.deps import get_read_db, get_read_user
+from app.services.spending_stats import group_stats
+
+router = APIRouter()
+
+MONTH = r"^\d{4}-\d{2}$"
+
+
+class MonthSpend(BaseModel):
+    month: str  # YYYY-MM
+    currency: str
+    total: float
+    count: int
+
+
+class PayerSpend(BaseModel):
+    member_id: int
+    currency: str
+    paid: float
+    count: int
+
+
+class MemberShare(BaseModel):
+    member_id: int
+    currency: str
+    share: float
+
+
+class GroupStats(BaseModel):
+    group_id: str
+    months: list[MonthSpend]
+    by_payer: list[PayerSpend]
+    by_member: list[MemberShare]
+
+
+def _month_start(value: str | None) -> date | None:
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid month {value!r}")
+
+
+@router.get("/{group_id}/stats", response_model=GroupStats)
+async def get_group_stats(
+    group_id: str,
+    start: str | None = Query(default=None, pattern=MONTH, description="First month, YYYY-MM"),
+    end: str | None = Query(default=None, pattern=MONTH, description="Last month, YYYY-MM"),
+    current_user=Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Spend per month, per payer and per member share of live expenses (months in UTC)."""
+    await require_membership(db, group_id, current_user.id)
+    stats = await group_stats(db, group_id, _month_start(start), _month_start(end))
+    return GroupStats(group_id=group_id, **stats)
@@ -5,9 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, field_validator
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_user, get_db
+from app.core.deps import get_current_user, get_db, get_read_db, get_read_user
 from app.db.models.user import User
 from app.services.people_balances import compute_people_balances
+from app.services.spending_stats import user_spending
 
 UPI_RE = re.compile(r"^[\w.\-+]+@[\w.\-]+$")
 
@@ -46,6 +47,22 @@ class PaymentMethodsResponse(BaseModel):
     payment_methods: list[PaymentMethod]
 
 
+class MonthShare(BaseModel):
+    month: str  # YYYY-MM
+    currency: str
+    share: float
+
+
+class CurrencyTotal(BaseModel):
+    currency: str
+    share: float
+
+
+class SpendingResponse(BaseModel):
+    months: list[MonthShare]
+    totals: list[CurrencyTotal]
+
+
 router = APIRouter()
 
 
@@ -102,8 +119,8 @@ async def update_payment_methods(
 
 @router.get("/me/balances/people", response_model=dict)
 async def my_people_balances(
-    current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Aggregated per-person balances across all the user's groups (read-only).
 
@@ -112,3 +129,12 @@ async def my_people_balances(
     """
     people = await compute_people_balances(db, current_user.id)
     return {"people": people}
+
+
+@router.get("/me/spending", response_model=SpendingResponse)
+async def my_spending(
+    current_user: User = Depends(get_read_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """The user's own share of expenses across all their groups, per month (UTC) and currency."""
+    return SpendingResponse(**await user_spending(db, current_user.id))
@@ -0,0 +1,90 @@
+"""Content-Encoding negotiation and streaming encoders for `CompressionMiddleware`.
+
+gzip (zlib) is always available; brotli (``br``) and zstandard (``zstd``) are
+offered only when the `brotli` / `zstandard` packages are installed. Each
+encoder is a ``(compress, flush, finish)`` triple: `compress` feeds bytes,
+`flush` emits everything fed so far as a decodable block (for streamed
+bodies), and `finish` ends the stream.
+"""
+from __future__ import annotations
+
+import zlib
+from typing import Callable
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+
+Encoder = tuple[Callable[[bytes], bytes], Callable[[], bytes], Callable[[], bytes]]
+
+
+def _gzip() -> Encoder:
+    c = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    return c.compress, lambda: c.flush(zlib.Z_SYNC_FLUSH), c.flush
+
+
+def _brotli() -> Encoder:
+    c = brotli.Compressor(quality=settings.compression_brotli_quality)
+    return c.process, c.flush, c.finish
+
+
+def _zstd() -> Encoder:
+    c = zstandard.ZstdCompressor(level=settings.compression_zstd_level).compressobj()
+    return c.compress, lambda: c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK), c.flush
+
+
+# Server preference on equal client q-values: best ratio per CPU first.
+ENCODERS: dict[str, Callable[[], Encoder]] = {
+    name: factory
+    for name, factory, available in (
+        ("zstd", _zstd, zstandard is not None),
+        ("br", _brotli, brotli is not None),
+        ("gzip", _gzip, True),
+    )
+    if available
+}
+
+# Media types worth compressing; everything else (images, archives, PDFs) is already compressed or binary.
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml", "image/svg+xml")
+# Streams of small, latency-sensitive events gain little and must never be buffered.
+NEVER_COMPRESS = ("text/event-stream",)
+
+
+def compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith(NEVER_COMPRESS):
+        return False
+    media_type = content_type.split(";", 1)[0].strip()
+    return media_type.startswith(COMPRESSIBLE_TYPES) or media_type.endswith(("+json", "+xml"))
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The encoding to use for a request's Accept-Encoding header, or None for identity."""
+    qvalues: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding.strip():
+            qvalues[coding.strip().lower()] = q
+    wildcard = qvalues.get("*", 0.0)
+    best, best_q = None, 0.0
+    for name in ENCODERS:  # preference order breaks ties
+        q = qvalues.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
@@ -6,6 +6,17 @@ import os
 
 class Settings(BaseSettings):
     db_url: str = os.getenv("DB_URL", "sqlite+aiosqlite:///./chillbill.db")
+    # Optional read replica for read-only routes; empty = read from the primary.
+    db_read_url: str = os.getenv("DB_READ_URL", "")
+    # After a user commits a write, their reads stay on the primary this long.
+    read_your_writes_seconds: float = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+    # Connection pool, per engine and per worker process: size it to the worker's
+    # expected concurrent DB work; pool_size + max_overflow caps open connections.
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout_seconds: float = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+    db_pool_recycle_seconds: int = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "false").lower() in ("1", "true", "yes")
     jwt_secret: str = os.getenv("JWT_SECRET", "devsecret")
     jwt_algo: str = os.getenv("JWT_ALGO", "HS256")
     access_token_expire_minutes: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "120"))  # 2 hours
@@ -21,6 +32,68 @@ class Settings(BaseSettings):
     openrouter_api_key: str = os.getenv("OPENROUTER_API_KEY", "")
     openrouter_model: str = os.getenv("OPENROUTER_MODEL", "openai/gpt-oss-120b")
     openrouter_timeout_seconds: float = float(os.getenv("OPENROUTER_TIMEOUT_SECONDS", "8"))
+    # Due recurring rules are materialized and committed in chunks of this size.
+    recurring_batch_size: int = int(os.getenv("RECURRING_BATCH_SIZE", "500"))
+    # Max missed occurrences a single rule may back-fill in one materialization pass.
+    recurring_max_catchup: int = int(os.getenv("RECURRING_MAX_CATCHUP", "24"))
+    # Due rules are split into this many group-hash shards, each guarded by a DB lease
+    # so exactly one worker/replica materializes it; raise it to spread the work.
+    recurring_shards: int = int(os.getenv("RECURRING_SHARDS", "1"))
+    recurring_lease_ttl_seconds: int = int(os.getenv("RECURRING_LEASE_TTL_SECONDS", "300"))
+    # Statements slower than this are logged (with parameter types) by app.db.query_stats.
+    slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+    # Add a Server-Timing header (DB time, statement count, total) to every response.
+    server_timing: bool = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+    # Compress text/JSON responses of at least COMPRESSION_MIN_BYTES for clients that accept it
+    # (gzip; br/zstd too when the brotli/zstandard packages are installed). Smaller bodies fit
+    # in a packet or two, where compression only costs CPU.
+    compression: bool = os.getenv("COMPRESSION", "true").lower() in ("1", "true", "yes")
+    compression_min_bytes: int = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+    # Level 1 keeps ~90% of level 5's savings on JSON at half the CPU (benchmarks/compression.py).
+    compression_gzip_level: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "1"))
+    compression_brotli_quality: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    compression_zstd_level: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    # Transport for group change events between workers: "memory" (single worker) or
+    # "postgres" (LISTEN/NOTIFY on DB_URL, for several workers or replicas).
+    events_broker: str = os.getenv("EVENTS_BROKER", "memory")
+    events_queue_size: int = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+    # Comment lines sent on idle event streams so proxies keep them open.
+    events_heartbeat_seconds: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+    # Lifetime of the ?token= issued for EventSource clients; only checked on connect.
+    events_token_seconds: int = int(os.getenv("EVENTS_TOKEN_SECONDS", "60"))
+    # Per-worker cache of each group's newest activity items (the feed's first page),
+    # for up to ACTIVITY_CACHE_GROUPS groups; 0 disables it.
+    activity_cache_groups: int = int(os.getenv("ACTIVITY_CACHE_GROUPS", "1000"))
+    activity_cache_size: int = int(os.getenv("ACTIVITY_CACHE_SIZE", "50"))
+    # Per-worker cache of GET /me/spending results, kept for this many users; 0 disables it.
+    spending_cache_users: int = int(os.getenv("SPENDING_CACHE_USERS", "1000"))
+    # Groups with at least this many live expenses compute balances from the monthly
+    # expense rollups instead of scanning every split.
+    balances_rollup_min_expenses: int = int(os.getenv("BALANCES_ROLLUP_MIN_EXPENSES", "2000"))
+    # Sum those groups' remaining per-expense scans with NumPy (when installed) instead
+    # of GROUP BY. Off by default: on SQLite it measured about 2x slower than GROUP BY.
+    balances_vectorized: bool = os.getenv("BALANCES_VECTORIZED", "false").lower() in ("1", "true", "yes")
+    # Optional FX rate table for converting balances into the group's currency: a CSV
+    # with a date,currency,rate header, rate = units of currency per FX_BASE_CURRENCY.
+    # Re-read when the file changes; empty = balances in other currencies stay separate.
+    fx_rates_path: str = os.getenv("FX_RATES_PATH", "")
+    fx_base_currency: str = os.getenv("FX_BASE_CURRENCY", "EUR")
+    # If set, GET /metrics requires `Authorization: Bearer <METRICS_TOKEN>`.
+    metrics_token: str = os.getenv("METRICS_TOKEN", "")
+    # Enables the /debug profiling endpoints and X-Profile-Token request profiling
+    # when set; callers must present this value. Empty = profiling disabled.
+    profiling_token: str = os.getenv("PROFILING_TOKEN", "")
+    profiling_max_seconds: float = float(os.getenv("PROFILING_MAX_SECONDS", "60"))
+    # SQLite connection profile, applied on every new connection when DB_URL is SQLite.
+    # WAL lets readers run alongside the single writer instead of queueing behind it.
+    sqlite_tuning: bool = os.getenv("SQLITE_TUNING", "true").lower() in ("1", "true", "yes")
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_cache_size_kib: int = int(os.getenv("SQLITE_CACHE_SIZE_KIB", "65536"))
+    sqlite_mmap_size_bytes: int = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+    sqlite_temp_store: str = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+    sqlite_foreign_keys: bool = os.getenv("SQLITE_FOREIGN_KEYS", "true").lower() in ("1", "true", "yes")
 
 
 @lru_cache
@@ -1,9 +1,14 @@
+import time
 from typing import AsyncGenerator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.security import decode_token
+from app.db import session as db_session
 from app.db.session import get_async_session
 from app.db.models.user import User
 from app.db.crud.user import get_user_by_id
@@ -11,23 +16,89 @@ from app.db.crud.user import get_user_by_id
 
 security = HTTPBearer(auto_error=False)
 
+# user_id -> monotonic deadline until which that user's reads go to the primary.
+# Per process: with several workers, a user's next request may land elsewhere, so
+# keep READ_YOUR_WRITES_SECONDS above the replica's typical lag.
+_recent_writers: dict[str, float] = {}
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session: Session) -> None:
+    user_id = session.info.get("user_id")
+    if not user_id:
+        return
+    now = time.monotonic()
+    if len(_recent_writers) > 10_000:
+        for uid in [u for u, deadline in _recent_writers.items() if deadline < now]:
+            del _recent_writers[uid]
+    _recent_writers[user_id] = now + settings.read_your_writes_seconds
+
+
+def recently_wrote(user_id: str) -> bool:
+    return _recent_writers.get(user_id, 0.0) > time.monotonic()
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with get_async_session() as session:
         yield session
 
 
-async def get_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+def _token_user_id(credentials: Optional[HTTPAuthorizationCredentials]) -> str:
     if not credentials:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
     payload = decode_token(credentials.credentials)
     if not payload or payload.get("type") != "access":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user_id = payload.get("sub")
+    return payload.get("sub")
+
+
+async def get_current_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> User:
+    user = await get_user_by_id(db, _token_user_id(credentials))
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    # Lets commits on this request's session be attributed for read-your-writes.
+    db.info["user_id"] = user.id
+    return user
+
+
+async def get_read_db(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes.
+
+    Uses the read replica when DB_READ_URL is configured, except for users who
+    committed a write in the last READ_YOUR_WRITES_SECONDS, who keep reading
+    from the primary so they see their own changes. Without a replica this is
+    simply the request's primary session. The user is taken from the token, so
+    choosing the session costs no query.
+    """
+    if db_session.ReadSessionLocal is None or recently_wrote(_token_user_id(credentials)):
+        yield db
+        return
+    async with db_session.ReadSessionLocal() as session:
+        yield session
+
+
+async def get_read_user(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_read_db),
+    primary: AsyncSession = Depends(get_db),
+) -> User:
+    """`get_current_user` for read-only routes: the user is loaded through `get_read_db`.
+
+    A replica-routed request thus never checks out a primary connection, unless
+    the user is not on the replica yet (just registered); then the request's
+    primary session, which is only connected on first use, looks them up.
+    """
+    user_id = _token_user_id(credentials)
     user = await get_user_by_id(db, user_id)
+    if not user and db is not primary:
+        user = await get_user_by_id(primary, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    db.info["user_id"] = user.id
     return user
@@ -0,0 +1,194 @@
+"""In-process pub/sub for group change notifications, with a pluggable broker.
+
+`hub` fans events out to the subscribers connected to this worker (one bounded
+queue per open ``/groups/{id}/events`` stream). Events reach the hub through
+`broker`, chosen by EVENTS_BROKER:
+
+* ``memory`` (default): delivers straight to this worker's hub. Correct for a
+  single worker, and the local stand-in for tests.
+* ``postgres``: LISTEN/NOTIFY on the primary database, so a change committed
+  by any worker reaches the streams of every worker.
+
+An event is a small JSON-able dict: ``{"type", "group_id", "revision", ...ids}``.
+It says *what* changed; clients refetch what they display.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.metrics import GROUP_EVENTS, REGISTRY
+
+logger = logging.getLogger("app.events")
+
+
+class EventHub:
+    """Subscriber queues per group for this worker.
+
+    A subscriber that falls `queue_size` events behind has its backlog replaced
+    by a single ``resync`` event rather than blocking publishers.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+
+    def subscribe(self, group_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[group_id].add(queue)
+        return queue
+
+    def unsubscribe(self, group_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(group_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[group_id]
+
+    def deliver(self, event: dict) -> None:
+        for queue in list(self._subscribers.get(event["group_id"], ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                _replace_with_resync(queue, event["group_id"])
+
+    def resync_all(self) -> None:
+        """Tell every subscriber to refetch (events may have been lost)."""
+        for group_id, queues in list(self._subscribers.items()):
+            for queue in list(queues):
+                _replace_with_resync(queue, group_id)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+
+def _replace_with_resync(queue: asyncio.Queue, group_id: str) -> None:
+    while not queue.empty():
+        queue.get_nowait()
+    queue.put_nowait({"type": "resync", "group_id": group_id})
+
+
+class MemoryBroker:
+    """Delivers to this worker's hub only."""
+
+    def __init__(self, hub: EventHub):
+        self.hub = hub
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    def publish(self, event: dict) -> None:
+        self.hub.deliver(event)
+
+
+class PostgresBroker:
+    """Cross-worker delivery over PostgreSQL LISTEN/NOTIFY.
+
+    Uses two dedicated asyncpg connections outside the SQLAlchemy pool: one
+    LISTENs and feeds the local hub (our own notifications included), the other
+    sends NOTIFYs. If the listener connection drops it is re-established and
+    every subscriber is told to resync, since notifications sent meanwhile are lost.
+    """
+
+    CHANNEL = "group_events"
+
+    def __init__(self, hub: EventHub, dsn: str):
+        self.hub = hub
+        self.dsn = dsn
+        self._listener = None
+        self._publisher = None
+        self._publish_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = False
+
+    async def start(self) -> None:
+        import asyncpg
+
+        self._stopping = False
+        self._publisher = await asyncpg.connect(self.dsn)
+        self._listener = await asyncpg.connect(self.dsn)
+        await self._listener.add_listener(self.CHANNEL, self._on_notify)
+        self._listener.add_termination_listener(self._on_listener_lost)
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in list(self._tasks):
+            task.cancel()
+        await self._close_connections()
+
+    def publish(self, event: dict) -> None:
+        # Called from synchronous commit hooks: send on a task.
+        task = asyncio.get_running_loop().create_task(self._notify(json.dumps(event)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _notify(self, payload: str) -> None:
+        try:
+            async with self._publish_lock:
+                await self._publisher.execute("SELECT pg_notify($1, $2)", self.CHANNEL, payload)
+        except Exception:
+            logger.exception("events: NOTIFY failed; delivering locally only")
+            self.hub.deliver(json.loads(payload))
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        self.hub.deliver(json.loads(payload))
+
+    def _on_listener_lost(self, _conn) -> None:
+        if not self._stopping:
+            task = asyncio.get_running_loop().create_task(self._reconnect())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _reconnect(self) -> None:
+        delay = 0.5
+        while not self._stopping:
+            try:
+                await self._close_connections()
+                await self.start()
+                self.hub.resync_all()
+                logger.warning("events: LISTEN connection re-established")
+                return
+            except Exception:
+                logger.exception("events: reconnect failed; retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+    async def _close_connections(self) -> None:
+        for conn in (self._listener, self._publisher):
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+
+
+def _asyncpg_dsn(url: str) -> str:
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+def make_broker(hub: EventHub):
+    if settings.events_broker == "postgres":
+        return PostgresBroker(hub, _asyncpg_dsn(settings.db_url))
+    if settings.events_broker != "memory":
+        raise ValueError(f"Unknown EVENTS_BROKER {settings.events_broker!r} (memory or postgres)")
+    return MemoryBroker(hub)
+
+
+hub = EventHub(queue_size=settings.events_queue_size)
+broker = make_broker(hub)
+
+
+def publish(event: dict) -> None:
+    GROUP_EVENTS.inc(event["type"])
+    broker.publish(event)
+
+
+REGISTRY.register_collector(lambda: [(
+    "group_event_subscribers", "gauge", "Open group event streams on this worker.",
+    [("group_event_subscribers", {}, hub.subscriber_count())],
+)])
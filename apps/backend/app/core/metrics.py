@@ -0,0 +1,186 @@
+"""Minimal in-process metric primitives (no external client library).
+
+`REGISTRY` holds the process-wide counters and histograms and renders them,
+plus anything its collectors report at scrape time, in the Prometheus text
+exposition format. Recording is a dict lookup and an addition under a lock.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Callable, Iterable
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus semantics (cumulative `le` buckets)."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[i] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+        cumulative, running = {}, 0
+        for le, n in zip(self.buckets, counts):
+            running += n
+            cumulative[str(le)] = running
+        running += counts[-1]
+        cumulative["+Inf"] = running
+        return {"count": running, "sum": total, "buckets": cumulative}
+
+
+# Default latency buckets, in seconds.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (sample name, labels, value)
+Sample = tuple[str, dict, float]
+# (metric name, type, help, samples) as returned by collectors
+Family = tuple[str, str, str, list[Sample]]
+
+
+class Counter:
+    """Monotonic counter keyed by label values."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, dict(zip(self.labelnames, k)), v) for k, v in items]
+
+
+class HistogramVec:
+    """One `Histogram` per label-value combination."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labelnames, self.buckets = name, help, labelnames, buckets
+        self._children: dict[tuple, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *labelvalues: str) -> Histogram:
+        child = self._children.get(labelvalues)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(labelvalues, Histogram(self.buckets))
+        return child
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        self.labels(*labelvalues).observe(value)
+
+    def samples(self) -> list[Sample]:
+        with self._lock:
+            items = list(self._children.items())
+        out: list[Sample] = []
+        for key, child in items:
+            out.extend(histogram_samples(self.name, dict(zip(self.labelnames, key)), child.snapshot()))
+        return out
+
+
+def histogram_samples(name: str, labels: dict, snapshot: dict) -> list[Sample]:
+    """Expand a `Histogram.snapshot()` into `_bucket`/`_sum`/`_count` samples."""
+    out = [(f"{name}_bucket", {**labels, "le": le}, n) for le, n in snapshot["buckets"].items()]
+    out.append((f"{name}_sum", labels, snapshot["sum"]))
+    out.append((f"{name}_count", labels, snapshot["count"]))
+    return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: list = []
+        self._collectors: list[Callable[[], Iterable[Family]]] = []
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS) -> HistogramVec:
+        metric = HistogramVec(name, help, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        """Add a callable evaluated at scrape time (for gauges read from elsewhere)."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        families: list[Family] = [(m.name, m.kind, m.help, m.samples()) for m in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        lines: list[str] = []
+        for name, kind, help, samples in families:
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample_name, labels, value in samples:
+                lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by method, route template and status.", ("method", "route", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route")
+)
+LLM_CALLS = REGISTRY.counter("llm_calls_total", "LLM calls by kind and outcome.", ("kind", "outcome"))
+LLM_LATENCY = REGISTRY.histogram(
+    "llm_call_duration_seconds", "LLM call latency by kind.", ("kind",),
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0),
+)
+RECURRING_MATERIALIZED = REGISTRY.counter(
+    "recurring_materialized_expenses_total", "Expenses created from recurring rules."
+)
+RECURRING_PAUSED = REGISTRY.counter(
+    "recurring_rules_paused_total", "Recurring rules auto-paused during materialization, by reason.", ("reason",)
+)
+RECURRING_CAPPED = REGISTRY.counter(
+    "recurring_rules_capped_total", "Recurring rules that hit the per-run catch-up cap and resume on the next run."
+)
+GROUP_EVENTS = REGISTRY.counter("group_events_published_total", "Group change events published, by type.", ("type",))
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total", "Cache lookups by cache name and result (hit/miss).", ("cache", "result")
+)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache, "hit" if hit else "miss")
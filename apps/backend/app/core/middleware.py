@@ -0,0 +1,195 @@
+"""ASGI middleware for per-request timing, request metrics, response compression and opt-in profiling."""
+from __future__ import annotations
+
+import cProfile
+import logging
+import time
+import uuid
+
+import anyio
+
+from app.core.compression import ENCODERS, compressible, negotiate
+from app.core.config import settings
+from app.core.metrics import HTTP_LATENCY, HTTP_REQUESTS
+from app.core.profiling import profile_store, request_profile_lock, token_ok
+from app.db.query_stats import start_request_stats
+
+
+logger = logging.getLogger("app.requests")
+
+# Single bodies at least this large are compressed on a worker thread.
+OFFLOAD_BYTES = 256 * 1024
+
+
+class RequestTimingMiddleware:
+    """Times each HTTP request and the SQL it issues.
+
+    Adds a ``Server-Timing`` header (``db`` with the statement count, and
+    ``app`` for the whole request up to the response start), logs one
+    key=value line per request and records the request count and latency
+    metrics. All of these use the matched route template, never the raw path,
+    so metric label sets stay bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = start_request_stats()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if settings.server_timing:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    value = (
+                        f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries", '
+                        f"app;dur={total_ms:.1f}"
+                    )
+                    message.setdefault("headers", []).append((b"server-timing", value.encode()))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method, route, str(status_code))
+            HTTP_LATENCY.observe(elapsed, method, route)
+            logger.info(
+                "request method=%s route=%s status=%d duration_ms=%.1f db_queries=%d db_ms=%.1f",
+                method,
+                route,
+                status_code,
+                elapsed * 1000,
+                stats.count,
+                stats.seconds * 1000,
+            )
+
+
+class CompressionMiddleware:
+    """Compresses text/JSON responses with the best encoding the client accepts.
+
+    A single-message body is compressed only if it has at least
+    COMPRESSION_MIN_BYTES (on a worker thread from OFFLOAD_BYTES), and gets an
+    exact Content-Length. A streamed body
+    (``more_body``) is compressed chunk by chunk, each chunk flushed so the
+    client can decode it immediately; its Content-Length is dropped. Responses
+    that already have a Content-Encoding, or whose media type is not
+    compressible (images, archives, event streams), pass through untouched.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.compression:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(dict(scope["headers"]).get(b"accept-encoding", b"").decode("latin-1"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        encoder = None  # (compress, flush, finish) once compressing
+
+        async def send_wrapper(message):
+            nonlocal start, encoder
+            if message["type"] == "http.response.start":
+                headers = {k.lower(): v for k, v in message.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1")
+                if b"content-encoding" in headers or not compressible(content_type):
+                    await send(message)
+                else:
+                    start = message  # held until the first body chunk decides
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if encoder is None:
+                if not more_body and len(body) < settings.compression_min_bytes:
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+                encoder = ENCODERS[encoding]()
+                headers = [
+                    (k, v) for k, v in start.get("headers", []) if k.lower() not in (b"content-length", b"vary")
+                ]
+                vary = [v for k, v in start.get("headers", []) if k.lower() == b"vary"]
+                headers.append((b"vary", b", ".join(vary + [b"Accept-Encoding"])))
+                headers.append((b"content-encoding", encoding.encode()))
+                compress, flush, finish = encoder
+                if not more_body:
+                    if len(body) >= OFFLOAD_BYTES:
+                        # zlib/brotli/zstd release the GIL; keep the event loop free meanwhile.
+                        data = await anyio.to_thread.run_sync(lambda: compress(body) + finish())
+                    else:
+                        data = compress(body) + finish()
+                    headers.append((b"content-length", str(len(data)).encode()))
+                    await send({**start, "headers": headers})
+                    await send({"type": "http.response.body", "body": data})
+                    return
+                await send({**start, "headers": headers})
+            compress, flush, finish = encoder
+            data = compress(body) + (flush() if more_body else finish())
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class ProfilingMiddleware:
+    """Captures a cProfile of a request sent with a valid ``X-Profile-Token`` header.
+
+    The response carries ``X-Profile-Id``; fetch the pstats text from
+    ``GET /debug/profiles/{id}``. cProfile hooks the whole thread, so other
+    requests interleaved on the event loop show up in the profile too, and only
+    one request is profiled at a time (``X-Profile-Id: busy`` otherwise).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.profiling_token:
+            await self.app(scope, receive, send)
+            return
+        supplied = dict(scope["headers"]).get(b"x-profile-token")
+        if supplied is None or not token_ok(supplied.decode("latin-1")):
+            await self.app(scope, receive, send)
+            return
+        if not request_profile_lock.acquire(blocking=False):
+            await self.app(scope, receive, _with_header(send, b"x-profile-id", b"busy"))
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, _with_header(send, b"x-profile-id", profile_id.encode()))
+            finally:
+                profiler.disable()
+            profile_store.add(profile_id, profiler, f"{scope['method']} {scope['path']}")
+        finally:
+            request_profile_lock.release()
+
+
+def _with_header(send, name: bytes, value: bytes):
+    async def wrapped(message):
+        if message["type"] == "http.response.start":
+            message.setdefault("headers", []).append((name, value))
+        await send(message)
+    return wrapped
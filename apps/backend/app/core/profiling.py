@@ -0,0 +1,101 @@
+"""Opt-in profiling of a live worker.
+
+Two tools, both enabled only when PROFILING_TOKEN is set:
+
+* `StackSampler` samples every thread's Python stack at a fixed interval and
+  aggregates them as collapsed stacks (``frame;frame;frame count``), the input
+  format of flamegraph.pl and speedscope.
+* `profile_store` keeps the last few per-request cProfile results captured by
+  `ProfilingMiddleware`, rendered as pstats text.
+"""
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import secrets
+import sys
+import threading
+from collections import Counter, OrderedDict
+
+from app.core.config import settings
+
+
+def token_ok(supplied: str | None) -> bool:
+    """True if profiling is enabled and `supplied` matches PROFILING_TOKEN."""
+    return bool(settings.profiling_token) and secrets.compare_digest(supplied or "", settings.profiling_token)
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}"
+
+
+class StackSampler:
+    """Samples all other threads' stacks every `interval` seconds on a daemon thread."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(tid, f"thread-{tid}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        """Collapsed-stack text, heaviest stacks first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+# One sampling session per worker at a time.
+sampling_lock = threading.Lock()
+# cProfile hooks the whole thread, so only one request is profiled at a time.
+request_profile_lock = threading.Lock()
+
+
+class ProfileStore:
+    """The last `size` per-request profiles, keyed by id."""
+
+    def __init__(self, size: int = 20):
+        self.size = size
+        self._items: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile_id: str, profile: cProfile.Profile, label: str) -> None:
+        out = io.StringIO()
+        out.write(f"{label}\n")
+        try:
+            pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(60)
+        except TypeError:  # pstats refuses a profile that recorded nothing
+            out.write("(no profile data)\n")
+        with self._lock:
+            self._items[profile_id] = out.getvalue()
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def get(self, profile_id: str) -> str | None:
+        with self._lock:
+            return self._items.get(profile_id)
+
+
+profile_store = ProfileStore()
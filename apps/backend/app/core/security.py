@@ -13,6 +13,13 @@ def create_token(subject: str, expires_delta_minutes: int, token_type: str) -> s
     return jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algo)
 
 
+def create_stream_token(user_id: str, group_id: str, expires_seconds: int) -> str:
+    """Short-lived token that only opens the event stream of one group."""
+    expire = datetime.now(tz=timezone.utc) + timedelta(seconds=expires_seconds)
+    to_encode: dict[str, Any] = {"sub": user_id, "grp": group_id, "exp": expire, "type": "stream"}
+    return jwt.encode(to_encode, settings.jwt_secret, algorithm=settings.jwt_algo)
+
+
 def verify_password(plain_password: str, password_hash: str) -> bool:
     return argon2.verify(plain_password, password_hash)
 
@@ -6,3 +6,5 @@ from app.db.models.expense import Expense, ExpenseSplit  # noqa: F401
 from app.db.models.settlement import Settlement  # noqa: F401
 from app.db.models.activity import Activity  # noqa: F401
 from app.db.models.recurring_rule import RecurringRule  # noqa: F401
+from app.db.models.scheduler_lease import SchedulerLease  # noqa: F401
+from app.db.models.expense_rollup import ExpenseRollup  # noqa: F401
@@ -1,23 +1,31 @@
 from datetime import datetime
 import uuid
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, ForeignKey, JSON, Enum
+from sqlalchemy import String, DateTime, ForeignKey, Index, JSON, Enum
 
 from app.db.session import Base
 
 
 class Activity(Base):
     __tablename__ = "activity"
+    # Serves the feed's keyset pagination: newest first within a group.
+    __table_args__ = (Index("idx_activity_group_created", "group_id", "created_at", "id"),)
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     group_id: Mapped[str] = mapped_column(String(36), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
-    user_id: Mapped[str] = mapped_column(String(36), ForeignKey("users.id", ondelete="SET NULL"))
+    user_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("users.id", ondelete="SET NULL"))
     type: Mapped[str] = mapped_column(
         Enum(
             "expense_created",
             "expense_updated",
             "settlement_created",
             "member_added",
+            "expense_deleted",
+            "member_removed",
+            "group_created",
+            "recurring_rule_created",
+            "recurring_rule_updated",
+            "recurring_rule_deleted",
             name="activity_type",
         ),
         nullable=False,
@@ -1,13 +1,54 @@
 from datetime import datetime
 import uuid
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, ForeignKey, Numeric, Text, UniqueConstraint
+from sqlalchemy import DDL, String, DateTime, ForeignKey, Index, Numeric, Text, UniqueConstraint, event, text
 
 from app.db.session import Base
 
 
 class Expense(Base):
     __tablename__ = "expenses"
+    # Every read path filters out soft-deleted rows, so the index only covers live
+    # expenses (partial index on both SQLite and PostgreSQL).
+    __table_args__ = (
+        Index(
+            "idx_expenses_group_live",
+            "group_id",
+            "date",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Starting points for the filters of app.services.expense_queries.
+        Index(
+            "idx_expenses_payer_live",
+            "paid_by_member_id",
+            "date",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "idx_expenses_group_amount_live",
+            "group_id",
+            "total_amount",
+            sqlite_where=text("deleted_at IS NULL"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        # Expenses deleted after a past moment still count in balances as of then.
+        Index(
+            "idx_expenses_group_deleted",
+            "group_id",
+            "deleted_at",
+            sqlite_where=text("deleted_at IS NOT NULL"),
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+        Index(
+            "idx_expenses_recurring_rule",
+            "recurring_rule_id",
+            "date",
+            sqlite_where=text("recurring_rule_id IS NOT NULL"),
+            postgresql_where=text("recurring_rule_id IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     group_id: Mapped[str] = mapped_column(String(36), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
@@ -28,10 +69,50 @@ class Expense(Base):
 
 class ExpenseSplit(Base):
     __tablename__ = "expense_splits"
-    __table_args__ = (UniqueConstraint("expense_id", "member_id", name="uq_expense_member"),)
+    __table_args__ = (
+        UniqueConstraint("expense_id", "member_id", name="uq_expense_member"),
+        # A member's splits, for filtering expenses by participant.
+        Index("idx_expense_splits_member", "member_id", "expense_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     expense_id: Mapped[str] = mapped_column(String(36), ForeignKey("expenses.id", ondelete="CASCADE"), nullable=False)
     member_id: Mapped[int] = mapped_column(ForeignKey("group_members.id", ondelete="CASCADE"), nullable=False)
     share_amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
     share_percentage: Mapped[float | None] = mapped_column(Numeric(5, 2), nullable=True)
+
+
+# Full-text search over live expense notes (queried by app.services.expense_search).
+# Created alongside the table so create_all (tests, benchmark datasets) matches the
+# 20261019_0011 migration. SQLite keeps an FTS5 index in step through triggers. Each
+# row carries the expense id (UNINDEXED, so stable across VACUUM, unlike the rowid)
+# and the group as a `grp` token, so a search or a trigger's delete only touches
+# that group's postings. PostgreSQL uses a GIN expression index that needs no upkeep.
+SEARCH_DDL = {
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS expense_fts USING fts5("
+        "expense_id UNINDEXED, grp, note, tokenize = 'unicode61 remove_diacritics 2')",
+        "CREATE TRIGGER IF NOT EXISTS expenses_fts_insert AFTER INSERT ON expenses "
+        "WHEN new.deleted_at IS NULL AND new.note IS NOT NULL BEGIN "
+        "INSERT INTO expense_fts (expense_id, grp, note) "
+        "VALUES (new.id, 'g' || replace(new.group_id, '-', ''), new.note); END",
+        "CREATE TRIGGER IF NOT EXISTS expenses_fts_update AFTER UPDATE OF note, deleted_at, group_id ON expenses "
+        "BEGIN DELETE FROM expense_fts "
+        "WHERE expense_fts MATCH 'grp : \"g' || replace(old.group_id, '-', '') || '\"' AND expense_id = old.id; "
+        "INSERT INTO expense_fts (expense_id, grp, note) "
+        "SELECT new.id, 'g' || replace(new.group_id, '-', ''), new.note "
+        "WHERE new.deleted_at IS NULL AND new.note IS NOT NULL; END",
+        "CREATE TRIGGER IF NOT EXISTS expenses_fts_delete AFTER DELETE ON expenses "
+        "BEGIN DELETE FROM expense_fts "
+        "WHERE expense_fts MATCH 'grp : \"g' || replace(old.group_id, '-', '') || '\"' AND expense_id = old.id; END",
+    ],
+    "postgresql": [
+        "CREATE INDEX IF NOT EXISTS idx_expenses_note_fts ON expenses "
+        "USING gin (to_tsvector('simple', coalesce(note, ''))) WHERE deleted_at IS NULL",
+    ],
+}
+
+for _dialect, _statements in SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Expense.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+event.listen(Expense.__table__, "after_drop", DDL("DROP TABLE IF EXISTS expense_fts").execute_if(dialect="sqlite"))
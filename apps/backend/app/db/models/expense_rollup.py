@@ -0,0 +1,27 @@
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Date, ForeignKey, Integer, Numeric, String
+
+from app.db.session import Base
+
+
+class ExpenseRollup(Base):
+    """Live expense totals per group, calendar month (UTC), member and currency.
+
+    `paid_*` counts the expenses the member paid for; `share_amount` sums the
+    member's splits. Maintained on every expense write by
+    `app.services.spending_stats`, so group statistics read O(months x members)
+    rows instead of every expense.
+    """
+
+    __tablename__ = "expense_rollups"
+
+    group_id: Mapped[str] = mapped_column(String(36), ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)  # first day of the month
+    member_id: Mapped[int] = mapped_column(ForeignKey("group_members.id", ondelete="CASCADE"), primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+    paid_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
+    paid_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    share_amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), nullable=False, default=0)
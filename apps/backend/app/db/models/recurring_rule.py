@@ -1,24 +1,46 @@
+import zlib
 from datetime import date, datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Boolean, DateTime, Date, ForeignKey, Integer, JSON, Numeric, SmallInteger, String, Text
+from sqlalchemy import BigInteger, Boolean, DateTime, Date, ForeignKey, Index, Integer, JSON, Numeric, SmallInteger, String, Text
 
 from app.db.session import Base
 
 
+def group_hash(group_id: str) -> int:
+    """CRC-32 of the group id; a group's scheduler shard is this modulo the shard count."""
+    return zlib.crc32(group_id.encode())
+
+
+def _group_hash_default(context) -> int:
+    return group_hash(context.get_current_parameters()["group_id"])
+
+
 class RecurringRule(Base):
     __tablename__ = "recurring_rules"
+    # The daily job walks this index (next_run_at, then rowid/id), so it only
+    # touches due rules no matter how many rules exist in total.
+    __table_args__ = (Index("idx_recurring_rules_next_run_active", "next_run_at"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     group_id: Mapped[str] = mapped_column(String(36), ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
-    paid_by_member_id: Mapped[int] = mapped_column(ForeignKey("group_members.id"), nullable=False)
+    # group_hash(group_id), stored so a scheduler shard can be selected in SQL.
+    group_hash: Mapped[int] = mapped_column(BigInteger, nullable=False, default=_group_hash_default)
+    # Null once the payer leaves the group; the rule is paused then (see pause_member_rules).
+    paid_by_member_id: Mapped[int | None] = mapped_column(
+        ForeignKey("group_members.id", ondelete="SET NULL"), nullable=True
+    )
     total_amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False)
     currency: Mapped[str] = mapped_column(String(3), nullable=False)
     note: Mapped[str | None] = mapped_column(Text, nullable=True)
     splits_json: Mapped[dict] = mapped_column(JSON, nullable=False)
-    day_of_month: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    # Schedule: every `interval` weeks/months/years. Weekly rules keep their weekday
+    # and yearly rules their month from next_run_at; day_of_month is unused for weekly.
+    frequency: Mapped[str] = mapped_column(String(10), nullable=False, default="monthly", server_default="monthly")
+    interval: Mapped[int] = mapped_column(SmallInteger, nullable=False, default=1, server_default="1")
+    day_of_month: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
     next_run_at: Mapped[date] = mapped_column(Date, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
     paused_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_by: Mapped[str] = mapped_column(String(36), ForeignKey("users.id"), nullable=False)
+    created_by: Mapped[str | None] = mapped_column(String(36), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
@@ -0,0 +1,110 @@
+"""Connection pool configuration and telemetry for the async engines.
+
+`engine_options()` turns the DB_POOL_* settings into `create_async_engine`
+keyword arguments; `MeteredQueuePool` records how long callers wait for a
+connection and how often acquiring one fails, and `pool_status()` reports it.
+"""
+from __future__ import annotations
+
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import Settings
+from app.core.metrics import Histogram, histogram_samples
+
+
+# Checkout wait-time buckets, in seconds.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that times every checkout and counts failed ones.
+
+    The wait covers queueing for a free slot plus opening (or pre-pinging) the
+    connection, i.e. everything a request spends before it can run SQL.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_seconds = Histogram(WAIT_BUCKETS)
+        self.checkouts = 0
+        self.errors = 0
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - started)
+        self.checkouts += 1
+        return conn
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, cfg: Settings) -> dict:
+    """`create_async_engine` kwargs for `url` under the DB_POOL_* settings.
+
+    In-memory SQLite keeps the dialect's single-connection pool; everything else,
+    file-backed SQLite included, gets a sized `MeteredQueuePool` so connections
+    (and their PRAGMA profile) are reused rather than reopened per session.
+    """
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "poolclass": MeteredQueuePool,
+        "pool_size": cfg.db_pool_size,
+        "max_overflow": cfg.db_max_overflow,
+        "pool_timeout": cfg.db_pool_timeout_seconds,
+        "pool_recycle": cfg.db_pool_recycle_seconds,
+        "pool_pre_ping": cfg.db_pool_pre_ping,
+    }
+
+
+def pool_families(engines: dict[str, AsyncEngine]) -> list:
+    """Metric families (see `app.core.metrics.Family`) for the pools of `engines`."""
+    gauges = {
+        "db_pool_size": ("gauge", "Configured pool size.", "size"),
+        "db_pool_checked_out": ("gauge", "Connections currently checked out.", "checked_out"),
+        "db_pool_overflow": ("gauge", "Overflow connections currently open.", "overflow"),
+        "db_pool_checkouts_total": ("counter", "Successful connection checkouts.", "checkouts"),
+        "db_pool_errors_total": ("counter", "Failed connection checkouts (timeouts, connect errors).", "errors"),
+    }
+    statuses = {name: pool_status(engine) for name, engine in engines.items()}
+    # Pools without telemetry (in-memory SQLite) have nothing to export.
+    statuses = {name: s for name, s in statuses.items() if "checkouts" in s}
+    families = [
+        (metric, kind, help, [(metric, {"engine": name}, s[key]) for name, s in statuses.items()])
+        for metric, (kind, help, key) in gauges.items()
+    ]
+    wait_samples = []
+    for name, s in statuses.items():
+        wait_samples.extend(histogram_samples("db_pool_wait_seconds", {"engine": name}, s["wait_seconds"]))
+    families.append(("db_pool_wait_seconds", "histogram", "Time spent acquiring a connection.", wait_samples))
+    return families
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    """JSON-friendly snapshot of `engine`'s pool occupancy and checkout telemetry."""
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, MeteredQueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "checked_in": pool.checkedin(),
+        "checkouts": pool.checkouts,
+        "errors": pool.errors,
+        "wait_seconds": pool.wait_seconds.snapshot(),
+    }
@@ -0,0 +1,82 @@
+"""Per-request SQL statement counting and the slow-query log.
+
+Cursor-execute hooks on every `Engine` add each statement's count and duration
+to the `QueryStats` of the current request (a context variable set by
+`RequestTimingMiddleware`), and log any statement slower than `SLOW_QUERY_MS`
+together with the shape of its bound parameters (types, never values).
+"""
+from __future__ import annotations
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+logger = logging.getLogger("app.db.slow_query")
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def start_request_stats() -> QueryStats:
+    """Begin collecting statements for the current request (context)."""
+    stats = QueryStats()
+    _current.set(stats)
+    return stats
+
+
+def current_stats() -> QueryStats | None:
+    return _current.get()
+
+
+def param_shape(params, executemany: bool = False):
+    """Types of the bound parameters, e.g. ``{"group_id_1": "str"}``; never values."""
+    if executemany and isinstance(params, (list, tuple)):
+        first = param_shape(params[0]) if params else None
+        return f"{len(params)} x {first}"
+    if isinstance(params, dict):
+        return {k: type(v).__name__ for k, v in params.items()}
+    if isinstance(params, (list, tuple)):
+        return [type(v).__name__ for v in params]
+    return type(params).__name__
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start"].pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    if elapsed * 1000 >= settings.slow_query_ms:
+        logger.warning(
+            "slow query: %.1fms %s params=%s",
+            elapsed * 1000,
+            " ".join(statement.split()),
+            param_shape(parameters, executemany),
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _on_error(exception_context):
+    # after_cursor_execute never fires for a failed statement; drop its start time.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
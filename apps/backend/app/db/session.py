@@ -1,17 +1,61 @@
 from contextlib import asynccontextmanager
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
-from app.core.config import settings
+from app.core.config import Settings, settings
+from app.db.pool import engine_options
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(settings.db_url, echo=False, future=True)
+def sqlite_pragmas(cfg: Settings) -> list[str]:
+    """PRAGMA statements making up the SQLite production profile described by `cfg`."""
+    return [
+        f"PRAGMA journal_mode={cfg.sqlite_journal_mode}",
+        f"PRAGMA synchronous={cfg.sqlite_synchronous}",
+        f"PRAGMA busy_timeout={int(cfg.sqlite_busy_timeout_ms)}",
+        # Negative cache_size is in KiB rather than pages.
+        f"PRAGMA cache_size=-{int(cfg.sqlite_cache_size_kib)}",
+        f"PRAGMA mmap_size={int(cfg.sqlite_mmap_size_bytes)}",
+        f"PRAGMA temp_store={cfg.sqlite_temp_store}",
+        f"PRAGMA foreign_keys={'ON' if cfg.sqlite_foreign_keys else 'OFF'}",
+    ]
+
+
+def install_sqlite_profile(engine: AsyncEngine, cfg: Settings = settings) -> None:
+    """Run the SQLite profile on every new DBAPI connection of `engine`."""
+    pragmas = sqlite_pragmas(cfg)
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+engine = create_async_engine(settings.db_url, echo=False, future=True, **engine_options(settings.db_url, settings))
+if engine.dialect.name == "sqlite" and settings.sqlite_tuning:
+    install_sqlite_profile(engine)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+# Read replica (DB_READ_URL). None when not configured: reads then use the primary.
+read_engine = (
+    create_async_engine(
+        settings.db_read_url, echo=False, future=True, **engine_options(settings.db_read_url, settings)
+    )
+    if settings.db_read_url
+    else None
+)
+ReadSessionLocal = (
+    async_sessionmaker(read_engine, expire_on_commit=False, class_=AsyncSession)
+    if read_engine is not None
+    else None
+)
+
 
 @asynccontextmanager
 async def get_async_session() -> AsyncSession:
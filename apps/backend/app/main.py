@@ -1,9 +1,22 @@
-from fastapi import FastAPI
+import secrets
+
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.deps import get_db
+from app.core.metrics import REGISTRY
+from app.core.middleware import CompressionMiddleware, ProfilingMiddleware, RequestTimingMiddleware
+from app.db import session as db_session
+from app.db.pool import pool_families, pool_status
 
-app = FastAPI(title="Halvio API", version="0.1.0", openapi_url="/openapi.json")
+# orjson renders the (typed) route results several times faster than the stdlib encoder.
+app = FastAPI(
+    title="Halvio API", version="0.1.0", openapi_url="/openapi.json", default_response_class=ORJSONResponse
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,21 +24,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-Profile-Id", "X-Next-Cursor"],
 )
+# Innermost of ours, so compression time counts towards Server-Timing and the latency metrics.
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestTimingMiddleware)
 
 # Routers will be included here
 from app.api.v1 import router as api_router  # noqa: E402
 
 app.include_router(api_router, prefix="/api/v1")
 
+from app.api.debug import router as debug_router  # noqa: E402
+
+app.include_router(debug_router)
+
+
+from app.services.recurring_scheduler import (  # noqa: E402
+    catchup_status,
+    shutdown_scheduler,
+    start_scheduler,
+    start_startup_catchup,
+)
+
 
-from app.services.recurring_scheduler import start_scheduler, run_startup_catchup, shutdown_scheduler  # noqa: E402
+from app.core import events  # noqa: E402
+
+
+@app.on_event("startup")
+async def _events_startup():
+    await events.broker.start()
+
+
+@app.on_event("shutdown")
+async def _events_shutdown():
+    await events.broker.stop()
 
 
 @app.on_event("startup")
 async def _recurring_startup():
     start_scheduler()
-    await run_startup_catchup()
+    # Catch-up runs in the background; progress is reported by /readyz.
+    start_startup_catchup()
 
 
 @app.on_event("shutdown")
@@ -33,6 +74,43 @@ async def _recurring_shutdown():
     shutdown_scheduler()
 
 
-@app.get("/healthz", tags=["health"])  # simple healthcheck
+@app.get("/healthz", tags=["health"])  # liveness: the process is up
 async def healthcheck():
     return {"status": "ok"}
+
+
+@app.get("/readyz", tags=["health"])  # readiness: can serve requests (DB reachable)
+async def readiness(db: AsyncSession = Depends(get_db)):
+    """Ready as soon as the database answers; recurring catch-up progress is informational."""
+    try:
+        await db.execute(text("SELECT 1"))
+    except Exception:
+        return JSONResponse(
+            status_code=503,
+            content={"status": "unavailable", "recurring_catchup": catchup_status(), "db_pool": _db_pools()},
+        )
+    return {"status": "ready", "recurring_catchup": catchup_status(), "db_pool": _db_pools()}
+
+
+def _engines() -> dict:
+    engines = {"primary": db_session.engine}
+    if db_session.read_engine is not None:
+        engines["replica"] = db_session.read_engine
+    return engines
+
+
+def _db_pools() -> dict:
+    return {name: pool_status(engine) for name, engine in _engines().items()}
+
+
+REGISTRY.register_collector(lambda: pool_families(_engines()))
+
+
+@app.get("/metrics", tags=["health"], include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus text exposition of this worker's metrics."""
+    if settings.metrics_token:
+        supplied = request.headers.get("authorization", "")
+        if not secrets.compare_digest(supplied, f"Bearer {settings.metrics_token}"):
+            return PlainTextResponse("unauthorized\n", status_code=401)
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
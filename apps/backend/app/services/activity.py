@@ -0,0 +1,139 @@
+"""Group activity feed: an append-only log plus a per-worker cache of its tail.
+
+Mutating endpoints append an `Activity` row in the same transaction as the
+change, next to the group change event (`app.services.group_events`), so a
+feed entry exists exactly when the change committed. The feed is read newest
+first with a keyset cursor over ``(created_at, id)``.
+
+Every activity write also bumps ``groups.revision``, so `ActivityTail` keys
+each group's first page by the revision it was read at: a cached page is
+served only while the group is still at that revision, which holds across
+workers without any invalidation traffic.
+"""
+from __future__ import annotations
+
+import base64
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.db.models.activity import Activity
+from app.db.models.group import Group
+
+
+def record_activity(db: AsyncSession, group_id: str, type: str, user_id: str | None = None, **payload) -> None:
+    """Append a feed entry; it is written when `db` commits."""
+    db.add(Activity(group_id=group_id, user_id=user_id, type=type, payload=payload))
+
+
+def expense_payload(expense_id: str, total_amount, currency: str, note: str | None, **extra) -> dict:
+    return {"expense_id": expense_id, "amount": float(total_amount), "currency": currency, "note": note, **extra}
+
+
+def encode_cursor(created_at: datetime, activity_id: str) -> str:
+    raw = f"{created_at.isoformat()}|{activity_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Inverse of `encode_cursor`; raises ValueError for anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, activity_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), activity_id
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("invalid cursor") from e
+
+
+def _item(a: Activity) -> dict:
+    return {
+        "id": a.id,
+        "type": a.type,
+        "user_id": a.user_id,
+        "payload": a.payload,
+        "created_at": a.created_at.isoformat(),
+    }
+
+
+class ActivityTail:
+    """The newest `size` feed items of up to `groups` groups, least recently used evicted."""
+
+    def __init__(self, groups: int = 1000, size: int = 50):
+        self.groups = groups
+        self.size = size
+        self._pages: OrderedDict[str, tuple[int, list[dict], str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, group_id: str, revision: int) -> tuple[list[dict], str | None] | None:
+        """The cached tail and the cursor after it, if still current at `revision`."""
+        with self._lock:
+            entry = self._pages.get(group_id)
+            if entry is None or entry[0] != revision:
+                return None
+            self._pages.move_to_end(group_id)
+            return entry[1], entry[2]
+
+    def put(self, group_id: str, revision: int, items: list[dict], next_cursor: str | None) -> None:
+        if self.groups <= 0:
+            return
+        with self._lock:
+            current = self._pages.get(group_id)
+            # A lagging read replica can answer with an older revision; keep the newer page.
+            if current is not None and current[0] > revision:
+                return
+            self._pages[group_id] = (revision, items, next_cursor)
+            self._pages.move_to_end(group_id)
+            while len(self._pages) > self.groups:
+                self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+
+tail = ActivityTail(groups=settings.activity_cache_groups, size=settings.activity_cache_size)
+
+
+def _first(items: list[dict], next_cursor: str | None, limit: int) -> tuple[list[dict], str | None]:
+    if limit >= len(items):
+        return items, next_cursor
+    last = items[limit - 1]
+    return items[:limit], encode_cursor(datetime.fromisoformat(last["created_at"]), last["id"])
+
+
+async def list_group_activity(
+    db: AsyncSession, group: Group, limit: int, before: str | None = None
+) -> tuple[list[dict], str | None]:
+    """One page of the group's feed, newest first, and the cursor for the next page.
+
+    `group` must have been loaded in this request (its revision keys the tail
+    cache). Raises ValueError for a malformed `before` cursor.
+    """
+    first_page = before is None and limit <= tail.size
+    if first_page:
+        cached = tail.get(group.id, group.revision)
+        record_cache("activity_tail", cached is not None)
+        if cached is not None:
+            return _first(*cached, limit)
+
+    # A first page is read at full tail length so any smaller first page can be cut from it.
+    fetch = tail.size if first_page else limit
+    stmt = (
+        select(Activity)
+        .where(Activity.group_id == group.id)
+        .order_by(Activity.created_at.desc(), Activity.id.desc())
+        .limit(fetch + 1)
+    )
+    if before is not None:
+        stmt = stmt.where(tuple_(Activity.created_at, Activity.id) < tuple_(*decode_cursor(before)))
+    rows = (await db.execute(stmt)).scalars().all()
+    next_cursor = encode_cursor(rows[fetch - 1].created_at, rows[fetch - 1].id) if len(rows) > fetch else None
+    items = [_item(a) for a in rows[:fetch]]
+    if first_page:
+        tail.put(group.id, group.revision, items, next_cursor)
+    return _first(items, next_cursor, limit)
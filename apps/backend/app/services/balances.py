@@ -1,47 +1,233 @@
 from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from itertools import chain
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import BigInteger, cast, func, select
 
+from app.core.config import settings
 from app.db.models.expense import Expense, ExpenseSplit
+from app.db.models.expense_rollup import ExpenseRollup
 from app.db.models.settlement import Settlement
+from app.services.fx import fx_table
+
+try:
+    import numpy as np
+except ImportError:  # optional: large groups then scan with GROUP BY in the database
+    np = None
+
+
+@dataclass
+class GroupBalances:
+    """A group's balances, member_id -> amount (positive = owed money)."""
+
+    currency: str
+    # In `currency`: its own amounts plus every other currency converted at `rates`.
+    balances: dict[int, float]
+    # Each currency on its own, unconverted.
+    by_currency: dict[str, dict[int, float]]
+    # Currency -> (multiplier into `currency`, date of the rate) for the converted ones.
+    rates: dict[str, tuple[Decimal, date | None]] = field(default_factory=dict)
+    # Currencies with no rate available; left out of `balances`.
+    unconverted: dict[str, dict[int, float]] = field(default_factory=dict)
+
+
+async def compute_currency_balances(
+    db: AsyncSession,
+    group_id: str,
+    use_rollups: bool | None = None,
+    as_of: datetime | None = None,
+    vectorized: bool | None = None,
+) -> dict[str, dict[int, Decimal]]:
+    """Net balance per group member, separately for each currency.
+
+    Returns ``{currency: {member_id: balance}}`` where positive = the member is
+    owed money, negative = the member owes money. Works uniformly for
+    registered and ghost members (both have a ``group_members.id``). Codes are
+    upper-cased, so rows stored as e.g. "inr" count towards "INR".
 
+    Settlements reduce balances in their own currency: when ``from`` pays
+    ``to`` an amount, the payer's debt shrinks (balance moves toward 0 from
+    below) and the creditor's credit shrinks (balance moves toward 0 from above).
 
-async def compute_group_balances(db: AsyncSession, group_id: str) -> dict[int, float]:
-    """Net balance per group member.
+    Sums run in the database (NUMERIC on PostgreSQL) as grouped queries
+    regardless of how many expenses the group has, and stay Decimals. The
+    expense side still reads every live expense and split of the group, so
+    groups with at least BALANCES_ROLLUP_MIN_EXPENSES expenses (or any group,
+    with `use_rollups=True`) read it from `expense_rollups` instead: one row
+    per month, member and currency, kept exact by every expense write.
 
-    Returns ``{member_id: balance}`` where positive = the member is owed
-    money, negative = the member owes money. Works uniformly for registered
-    and ghost members (both have a ``group_members.id``).
+    With `as_of`, only expenses dated up to and including it and settlements
+    recorded by then count, including expenses deleted after `as_of` (edits
+    are not versioned). The rollups of the months before act as checkpoints
+    and only the expenses of `as_of`'s own month are replayed, so a date years
+    back costs no more than today; expenses deleted since are added back from
+    `idx_expenses_group_deleted`.
 
-    Settlements reduce balances: when ``from`` pays ``to`` an amount, the
-    payer's debt shrinks (balance moves toward 0 from below) and the
-    creditor's credit shrinks (balance moves toward 0 from above).
+    Whatever expenses are still scanned one by one (the replayed month, or
+    every expense with `use_rollups=False`) are summed with NumPy when
+    `vectorized` is set and NumPy is installed; by default it is set for
+    groups over the same threshold only when BALANCES_VECTORIZED is on. The
+    (member, cents) rows are still fetched one by one like any result, then
+    packed into int64 arrays and reduced with `bincount` over a dense member
+    index; only that reduction is vectorized.
     """
-    balances: dict[int, float] = defaultdict(float)
+    balances: dict[str, dict[int, Decimal]] = defaultdict(lambda: defaultdict(Decimal))
+    since = None
+    if as_of is not None:
+        # Expense dates are stored as naive UTC, and rollup months are UTC months.
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None) if as_of.tzinfo else as_of
+        since = as_of.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if use_rollups is not False:
+        # Small either way (months x members x currencies), and it tells us the group's size.
+        stmt = (
+            select(
+                ExpenseRollup.currency, ExpenseRollup.member_id,
+                func.sum(ExpenseRollup.paid_amount - ExpenseRollup.share_amount), func.sum(ExpenseRollup.paid_count),
+            )
+            .where(ExpenseRollup.group_id == group_id)
+            .group_by(ExpenseRollup.currency, ExpenseRollup.member_id)
+        )
+        if since is not None:
+            stmt = stmt.where(ExpenseRollup.month < since.date())
+        rows = (await db.execute(stmt)).all()
+        large = sum(count or 0 for *_, count in rows) >= settings.balances_rollup_min_expenses
+        if use_rollups is None:
+            use_rollups = large
+        if vectorized is None:
+            vectorized = large and settings.balances_vectorized
+        if use_rollups:
+            for currency, member_id, net, count in rows:
+                if net or count:  # all-zero rows are left behind by deleted expenses
+                    balances[currency.upper()][member_id] += Decimal(net or 0)
+    add_expenses = _add_expenses_vectorized if vectorized and np is not None else _add_expenses
+    if not use_rollups:
+        await add_expenses(db, balances, _live_expenses(group_id, until=as_of))
+    elif as_of is not None:
+        await add_expenses(db, balances, _live_expenses(group_id, since=since, until=as_of))
+    if as_of is not None:
+        # Still there at `as_of`; neither the live scan nor the rollups include them.
+        await add_expenses(db, balances, [
+            Expense.group_id == group_id, Expense.deleted_at > as_of, Expense.date <= as_of,
+        ])
+    await _add_settlements(db, group_id, balances, until=as_of)
+    return {currency: dict(members) for currency, members in balances.items()}
+
+
+def _live_expenses(group_id: str, since: datetime | None = None, until: datetime | None = None) -> list:
+    live = [Expense.group_id == group_id, Expense.deleted_at.is_(None)]
+    if since is not None:
+        live.append(Expense.date >= since)
+    if until is not None:
+        live.append(Expense.date <= until)
+    return live
+
 
+async def _add_expenses(db: AsyncSession, balances: dict[str, dict[int, Decimal]], where: list) -> None:
     # Expenses: payer is credited, each split debits the participant.
     res = await db.execute(
-        select(Expense).where(Expense.group_id == group_id, Expense.deleted_at.is_(None))
+        select(Expense.currency, Expense.paid_by_member_id, func.sum(Expense.total_amount))
+        .where(*where)
+        .group_by(Expense.currency, Expense.paid_by_member_id)
     )
-    expenses = res.scalars().all()
-    for e in expenses:
-        balances[e.paid_by_member_id] += float(e.total_amount)
-        splits_res = await db.execute(
-            select(ExpenseSplit).where(ExpenseSplit.expense_id == e.id)
-        )
-        for s in splits_res.scalars().all():
-            balances[s.member_id] -= float(s.share_amount)
+    for currency, member_id, total in res.all():
+        balances[currency.upper()][member_id] += Decimal(total or 0)
+
+    res = await db.execute(
+        select(Expense.currency, ExpenseSplit.member_id, func.sum(ExpenseSplit.share_amount))
+        .join(Expense, Expense.id == ExpenseSplit.expense_id)
+        .where(*where)
+        .group_by(Expense.currency, ExpenseSplit.member_id)
+    )
+    for currency, member_id, total in res.all():
+        balances[currency.upper()][member_id] -= Decimal(total or 0)
 
+
+def _cents(amount, sign: int = 1):
+    # NUMERIC(12, 2) as a whole number of cents (SQLite stores it as REAL, hence the round).
+    return cast(func.round(amount * (100 * sign)), BigInteger).label("cents")
+
+
+async def _add_expenses_vectorized(db: AsyncSession, balances: dict[str, dict[int, Decimal]], where: list) -> None:
+    codes = (await db.execute(select(Expense.currency).where(*where).distinct())).scalars().all()
+    for code in codes:
+        paid = (await db.execute(
+            select(Expense.paid_by_member_id, _cents(Expense.total_amount)).where(*where, Expense.currency == code)
+        )).all()
+        shares = (await db.execute(
+            select(ExpenseSplit.member_id, _cents(ExpenseSplit.share_amount, -1))
+            .join(Expense, Expense.id == ExpenseSplit.expense_id)
+            .where(*where, Expense.currency == code)
+        )).all()
+        rows = np.fromiter(chain.from_iterable(paid + shares), dtype=np.int64).reshape(-1, 2)
+        members, dense = np.unique(rows[:, 0], return_inverse=True)
+        # Cents are whole numbers, so the float64 sums are exact while they stay below 2**53.
+        totals = np.bincount(dense, weights=rows[:, 1], minlength=len(members))
+        for member_id, total in zip(members.tolist(), totals.tolist()):
+            balances[code.upper()][member_id] += Decimal(int(total)) / 100
+
+
+async def _add_settlements(
+    db: AsyncSession, group_id: str, balances: dict[str, dict[int, Decimal]], until: datetime | None = None
+) -> None:
     # Settlements: money moved from `from_member` to `to_member`.
+    settled = [Settlement.group_id == group_id, Settlement.status == "success"]
+    if until is not None:
+        settled.append(Settlement.created_at <= until)
     res = await db.execute(
-        select(Settlement).where(
-            Settlement.group_id == group_id,
-            Settlement.status == "success",
-        )
+        select(Settlement.currency, Settlement.from_member_id, func.sum(Settlement.amount))
+        .where(*settled)
+        .group_by(Settlement.currency, Settlement.from_member_id)
+    )
+    for currency, member_id, total in res.all():
+        balances[currency.upper()][member_id] += Decimal(total or 0)  # debtor paid → owes less
+    res = await db.execute(
+        select(Settlement.currency, Settlement.to_member_id, func.sum(Settlement.amount))
+        .where(*settled)
+        .group_by(Settlement.currency, Settlement.to_member_id)
     )
-    for st in res.scalars().all():
-        amt = float(st.amount)
-        balances[st.from_member_id] += amt  # debtor paid → owes less
-        balances[st.to_member_id] -= amt    # creditor received → owed less
+    for currency, member_id, total in res.all():
+        balances[currency.upper()][member_id] -= Decimal(total or 0)  # creditor received → owed less
 
-    return dict(balances)
+
+def convert_balances(
+    by_currency: dict[str, dict[int, Decimal]], currency: str, on: date | None = None
+) -> GroupBalances:
+    """Fold per-currency balances into `currency` using the FX table's rates on `on` (default today).
+
+    Each currency's vector is converted as a whole, one multiplication per
+    member and currency, never per expense. Currencies the table has no rate
+    for (or all foreign ones, without a table) stay in `unconverted`.
+    """
+    on = on or datetime.utcnow().date()
+    currency = currency.upper()
+    table = fx_table()
+    # Members with only unconverted balances still appear, at 0.
+    total = {member_id: Decimal(0) for members in by_currency.values() for member_id in members}
+    result = GroupBalances(currency=currency, balances={}, by_currency={})
+    for cur, members in sorted(by_currency.items()):
+        result.by_currency[cur] = {member_id: float(bal) for member_id, bal in members.items()}
+        rate = (Decimal(1), None) if cur == currency else table.rate(cur, currency, on) if table else None
+        if rate is None:
+            result.unconverted[cur] = result.by_currency[cur]
+            continue
+        if cur != currency:
+            result.rates[cur] = rate
+        for member_id, bal in members.items():
+            total[member_id] += bal * rate[0]
+    result.balances = {member_id: float(bal) for member_id, bal in total.items()}
+    return result
+
+
+async def compute_group_balances(
+    db: AsyncSession, group_id: str, currency: str, on: date | None = None, as_of: datetime | None = None
+) -> GroupBalances:
+    """The group's balances in `currency` (the group's), converting other currencies where rates allow.
+
+    With `as_of`, the balances at that moment, converted at that day's rates unless `on` says otherwise.
+    """
+    if on is None and as_of is not None:
+        on = as_of.date()
+    return convert_balances(await compute_currency_balances(db, group_id, as_of=as_of), currency, on)
@@ -0,0 +1,88 @@
+"""Filtered, keyset-paginated listing of a group's live expenses.
+
+Every filter is evaluated in SQL, and each has an index to start from: the
+group's live expenses by date (`idx_expenses_group_live`), by payer
+(`idx_expenses_payer_live`), by amount (`idx_expenses_group_amount_live`), by
+recurring rule (`idx_expenses_recurring_rule`), and a member's splits
+(`idx_expense_splits_member`). Pages are ordered newest first by (date, id)
+and continue from an opaque cursor, so a deep page costs the same as the first.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from sqlalchemy import exists, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.expense import Expense, ExpenseSplit
+from app.services.activity import decode_cursor, encode_cursor
+
+
+@dataclass
+class ExpenseFilters:
+    # Half-open window: start <= date < end.
+    start: datetime | None = None
+    end: datetime | None = None
+    paid_by_member_id: int | None = None
+    # Expenses this member has a split in.
+    member_id: int | None = None
+    min_amount: Decimal | None = None
+    max_amount: Decimal | None = None
+    # True: only expenses materialized from a recurring rule; False: only manual ones.
+    recurring: bool | None = None
+    recurring_rule_id: int | None = None
+
+
+def _utc(value: datetime) -> datetime:
+    # Dates are stored as naive UTC; SQLite compares them as text.
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _conditions(f: ExpenseFilters) -> list:
+    where = []
+    if f.start is not None:
+        where.append(Expense.date >= _utc(f.start))
+    if f.end is not None:
+        where.append(Expense.date < _utc(f.end))
+    if f.paid_by_member_id is not None:
+        where.append(Expense.paid_by_member_id == f.paid_by_member_id)
+    if f.member_id is not None:
+        where.append(exists().where(ExpenseSplit.expense_id == Expense.id, ExpenseSplit.member_id == f.member_id))
+    if f.min_amount is not None:
+        where.append(Expense.total_amount >= f.min_amount)
+    if f.max_amount is not None:
+        where.append(Expense.total_amount <= f.max_amount)
+    if f.recurring is not None:
+        where.append(Expense.recurring_rule_id.is_not(None) if f.recurring else Expense.recurring_rule_id.is_(None))
+    if f.recurring_rule_id is not None:
+        where.append(Expense.recurring_rule_id == f.recurring_rule_id)
+    return where
+
+
+async def list_group_expenses(
+    db: AsyncSession,
+    group_id: str,
+    filters: ExpenseFilters | None = None,
+    limit: int | None = None,
+    before: str | None = None,
+) -> tuple[list[Expense], str | None]:
+    """Live expenses of the group matching `filters`, newest first, and the cursor for the next page.
+
+    With no `limit` every match is returned and the cursor is None. Raises
+    ValueError for a malformed `before` cursor.
+    """
+    stmt = (
+        select(Expense)
+        .where(Expense.group_id == group_id, Expense.deleted_at.is_(None), *_conditions(filters or ExpenseFilters()))
+        .order_by(Expense.date.desc(), Expense.id.desc())
+    )
+    if before is not None:
+        stmt = stmt.where(tuple_(Expense.date, Expense.id) < tuple_(*decode_cursor(before)))
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    rows = list((await db.execute(stmt)).scalars().all())
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    return rows[:limit], encode_cursor(rows[limit - 1].date, rows[limit - 1].id)
@@ -0,0 +1,79 @@
+"""Ranked full-text search over a group's live expense notes.
+
+The indexes are defined in `app.db.models.expense.SEARCH_DDL`. A query is
+split into words, and each word matches as a prefix ("goa hot" finds "Goa
+hotel"), all words required. Notes are tokenized without stemming, which
+suits short, multilingual notes.
+
+SQLite ranks with FTS5 bm25 and PostgreSQL with ts_rank. Ties go to the
+newest expense.
+"""
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import func, literal_column, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.expense import Expense
+
+MAX_TERMS = 8
+_WORD = re.compile(r"[^\W_]+")
+
+
+def search_terms(q: str) -> list[str]:
+    return [w.lower() for w in _WORD.findall(q)][:MAX_TERMS]
+
+
+async def search_expenses(db: AsyncSession, group_id: str, q: str, limit: int, offset: int = 0) -> list[Expense]:
+    """Up to `limit` live expenses of the group whose notes match `q`, best match first."""
+    terms = search_terms(q)
+    if not terms:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return await _search_postgresql(db, group_id, terms, limit, offset)
+    return await _search_sqlite(db, group_id, terms, limit, offset)
+
+
+async def _search_sqlite(db: AsyncSession, group_id: str, terms: list[str], limit: int, offset: int) -> list[Expense]:
+    grp = "g" + group_id.replace("-", "").lower()
+    match = f'grp : "{grp}" AND note : (' + " AND ".join(f'"{t}" *' for t in terms) + ")"
+    stmt = text(
+        "SELECT expenses.* FROM expense_fts JOIN expenses ON expenses.id = expense_fts.expense_id "
+        "WHERE expense_fts MATCH :match "
+        "ORDER BY bm25(expense_fts, 0.0, 1.0), expenses.date DESC, expenses.id "
+        "LIMIT :limit OFFSET :offset"
+    ).bindparams(match=match, limit=limit, offset=offset)
+    res = await db.execute(select(Expense).from_statement(stmt))
+    return list(res.scalars().all())
+
+
+async def _search_postgresql(db: AsyncSession, group_id: str, terms: list[str], limit: int, offset: int) -> list[Expense]:
+    # Spelled exactly as in idx_expenses_note_fts (literals, not bind parameters) so the planner uses it.
+    document = func.to_tsvector(literal_column("'simple'"), func.coalesce(Expense.note, literal_column("''")))
+    query = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{t}:*" for t in terms))
+    res = await db.execute(
+        select(Expense)
+        .where(Expense.group_id == group_id, Expense.deleted_at.is_(None), document.op("@@")(query))
+        # Normalization 1 divides by 1 + log(length): shorter notes win, as with bm25.
+        .order_by(func.ts_rank(document, query, 1).desc(), Expense.date.desc(), Expense.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    return list(res.scalars().all())
+
+
+async def rebuild_search_index(db: AsyncSession) -> None:
+    """Repopulate SQLite's FTS index from `expenses`; PostgreSQL's index needs no rebuild.
+
+    Only needed on SQLite if `expenses` was written with the triggers absent,
+    e.g. a bulk load into a table recreated by hand.
+    """
+    if db.get_bind().dialect.name != "sqlite":
+        return
+    await db.execute(text("DELETE FROM expense_fts"))
+    await db.execute(text(
+        "INSERT INTO expense_fts (expense_id, grp, note) "
+        "SELECT id, 'g' || replace(group_id, '-', ''), note FROM expenses "
+        "WHERE deleted_at IS NULL AND note IS NOT NULL"
+    ))
@@ -0,0 +1,107 @@
+"""Foreign-exchange rates for converting balances into a group's currency.
+
+Rates come from a local CSV file (FX_RATES_PATH) with a ``date,currency,rate``
+header and one row per currency and day, where ``rate`` is units of that
+currency per one FX_BASE_CURRENCY (the layout of the ECB's daily reference
+rates). The file is parsed once into date-sorted arrays per currency and kept
+in memory; it is re-read only when its mtime changes. A conversion on a given
+day uses each currency's latest rate on or before that day.
+"""
+from __future__ import annotations
+
+import bisect
+import csv
+import logging
+import os
+import threading
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class FxTable:
+    """Dated rates per currency, each as units of that currency per one unit of `base`."""
+
+    def __init__(self, base: str, rows: list[tuple[date, str, Decimal]]):
+        self.base = base.upper()
+        series: dict[str, dict[date, Decimal]] = {}
+        for day, currency, rate in rows:
+            series.setdefault(currency.upper(), {})[day] = rate
+        self._dates: dict[str, list[date]] = {}
+        self._rates: dict[str, list[Decimal]] = {}
+        for currency, by_day in series.items():
+            days = sorted(by_day)
+            self._dates[currency] = days
+            self._rates[currency] = [by_day[d] for d in days]
+
+    @classmethod
+    def from_csv(cls, path: str, base: str) -> "FxTable":
+        rows = []
+        with open(path, newline="") as f:
+            reader = csv.DictReader(f)
+            if not {"date", "currency", "rate"} <= set(reader.fieldnames or ()):
+                raise ValueError(f"{path}: expected a date,currency,rate header")
+            for n, row in enumerate(reader, start=2):
+                try:
+                    rate = Decimal(row["rate"])
+                    if rate <= 0:
+                        raise InvalidOperation
+                    rows.append((date.fromisoformat(row["date"].strip()), row["currency"].strip(), rate))
+                except (KeyError, ValueError, InvalidOperation, AttributeError):
+                    raise ValueError(f"{path}:{n}: expected date,currency,rate with a positive rate")
+        return cls(base, rows)
+
+    def _rate(self, currency: str, on: date) -> tuple[Decimal, date | None] | None:
+        if currency == self.base:
+            return Decimal(1), None
+        days = self._dates.get(currency)
+        i = bisect.bisect_right(days, on) if days else 0
+        if i == 0:
+            return None
+        return self._rates[currency][i - 1], days[i - 1]
+
+    def rate(self, source: str, target: str, on: date) -> tuple[Decimal, date | None] | None:
+        """Multiplier taking `source` amounts to `target` on `on`, and the newest rate date it used.
+
+        None when either currency has no rate on or before `on`. The date is
+        None only when no rate was needed (same currency, or both the base).
+        """
+        source, target = source.upper(), target.upper()
+        if source == target:
+            return Decimal(1), None
+        src, dst = self._rate(source, on), self._rate(target, on)
+        if src is None or dst is None:
+            return None
+        used = [d for d in (src[1], dst[1]) if d is not None]
+        return dst[0] / src[0], max(used) if used else None
+
+
+_lock = threading.Lock()
+_loaded: tuple[str, float, FxTable] | None = None
+
+
+def fx_table() -> FxTable | None:
+    """The configured rate table, or None when FX_RATES_PATH is unset or unreadable."""
+    global _loaded
+    path = settings.fx_rates_path
+    if not path:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        logger.warning("fx: rates file %s not found", path)
+        return None
+    loaded = _loaded
+    if loaded is not None and loaded[:2] == (path, mtime):
+        return loaded[2]
+    with _lock:
+        if _loaded is None or _loaded[:2] != (path, mtime):
+            try:
+                _loaded = (path, mtime, FxTable.from_csv(path, settings.fx_base_currency))
+            except (OSError, ValueError) as e:
+                logger.warning("fx: cannot load rates: %s", e)
+                return _loaded[2] if _loaded is not None and _loaded[0] == path else None
+        return _loaded[2]
@@ -0,0 +1,60 @@
+"""Group revisions and change events.
+
+Every change to a group's expenses, settlements or members bumps
+``groups.revision`` in the same transaction and queues an event on the
+session; the events are published (see `app.core.events`) only once that
+transaction commits, and dropped if it rolls back. Subscribers therefore
+never hear about changes they cannot read yet, and the revision in an event
+is the one the group has after the change.
+"""
+from __future__ import annotations
+
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import events
+from app.db.models.group import Group
+
+
+async def bump_revisions(db: AsyncSession, group_ids) -> dict[str, int]:
+    """Increment the revision of each group; returns ``{group_id: new revision}``."""
+    group_ids = list(group_ids)
+    if not group_ids:
+        return {}
+    res = await db.execute(
+        update(Group)
+        .where(Group.id.in_(group_ids))
+        .values(revision=Group.revision + 1)
+        .returning(Group.id, Group.revision)
+    )
+    return dict(res.all())
+
+
+async def queue_group_event(db: AsyncSession, group_id: str, type: str, **data) -> int:
+    """Bump the group's revision and publish `type` when `db` commits. Returns the new revision."""
+    revisions = await bump_revisions(db, [group_id])
+    revision = revisions.get(group_id, 0)
+    db.info.setdefault("group_events", []).append(
+        {"type": type, "group_id": group_id, "revision": revision, **data}
+    )
+    return revision
+
+
+def queue_group_events(db: AsyncSession, revisions: dict[str, int], type: str, **data) -> None:
+    """Queue one `type` event per group of an earlier `bump_revisions` call."""
+    db.info.setdefault("group_events", []).extend(
+        {"type": type, "group_id": group_id, "revision": revision, **data}
+        for group_id, revision in revisions.items()
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_queued(session: Session) -> None:
+    for group_event in session.info.pop("group_events", ()):
+        events.publish(group_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_queued(session: Session) -> None:
+    session.info.pop("group_events", None)
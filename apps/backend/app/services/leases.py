@@ -0,0 +1,54 @@
+"""Expiring DB-backed leases for coordinating work across workers and replicas.
+
+A lease is a row in `scheduler_leases`. Acquiring is a single conditional
+UPDATE (take it if expired or already ours), falling back to an INSERT for a
+lease that has never existed; the primary key makes concurrent inserts safe.
+Every call commits, so pass a session that is not carrying other work.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.scheduler_lease import SchedulerLease
+
+
+async def try_acquire_lease(
+    db: AsyncSession, name: str, holder: str, ttl_seconds: int, *, now: datetime | None = None
+) -> bool:
+    """Acquire or renew lease `name` for `holder`. Returns False if someone else holds it."""
+    now = now or datetime.utcnow()
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    res = await db.execute(
+        update(SchedulerLease)
+        .where(
+            SchedulerLease.name == name,
+            or_(SchedulerLease.holder == holder, SchedulerLease.expires_at < now),
+        )
+        .values(holder=holder, expires_at=expires_at)
+        .execution_options(synchronize_session=False)
+    )
+    if res.rowcount == 1:
+        await db.commit()
+        return True
+    try:
+        await db.execute(insert(SchedulerLease).values(name=name, holder=holder, expires_at=expires_at))
+        await db.commit()
+    except IntegrityError:
+        # Row exists and is held by someone else (or a peer inserted it first).
+        await db.rollback()
+        return False
+    return True
+
+
+async def release_lease(db: AsyncSession, name: str, holder: str) -> None:
+    """Drop lease `name` if `holder` still owns it; a no-op otherwise."""
+    await db.execute(
+        delete(SchedulerLease)
+        .where(SchedulerLease.name == name, SchedulerLease.holder == holder)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
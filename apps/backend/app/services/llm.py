@@ -1,8 +1,12 @@
 """Thin async wrapper around OpenRouter's OpenAI-compatible chat/completions API."""
+import functools
 import json
+import time
+
 import httpx
 
 from app.core.config import settings
+from app.core.metrics import LLM_CALLS, LLM_LATENCY
 
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
 
@@ -11,6 +15,25 @@ class LLMError(Exception):
     """Raised on any failure to obtain a valid LLM response."""
 
 
+def _metered(kind: str):
+    """Record latency and ok/error outcome of an LLM call in the metrics registry."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                result = await fn(*args, **kwargs)
+                outcome = "ok"
+                return result
+            finally:
+                LLM_LATENCY.observe(time.perf_counter() - started, kind)
+                LLM_CALLS.inc(kind, outcome)
+        return wrapper
+    return decorator
+
+
+@_metered("text")
 async def parse_with_llm(*, system: str, user: str, schema: dict, model: str | None = None) -> dict:
     """Send (system, user) to OpenRouter; ask for JSON matching `schema`; return parsed dict.
 
@@ -57,6 +80,7 @@ async def parse_with_llm(*, system: str, user: str, schema: dict, model: str | N
         raise LLMError(f"openrouter returned malformed response: {e}") from e
 
 
+@_metered("vision")
 async def parse_with_llm_vision(
     *,
     system: str,
@@ -1,6 +1,6 @@
 """Aggregate per-person balances across all groups the current user is in.
 
-Pairwise debts are derived from `settlement_suggestions(...)` for each group,
+Pairwise debts are derived from `group_settlement_suggestions(...)` for each group,
 NOT from each member's group-level balance directly. Group balances only tell
 you how each member stands vs. the group collectively — they do not encode
 who-owes-whom. The settlement suggestions output the minimum-transaction
@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.models.group import Group, GroupMember
 from app.db.models.user import User
 from app.services.balances import compute_group_balances
-from app.services.settlements import settlement_suggestions
+from app.services.settlements import group_settlement_suggestions
 
 
 _TOLERANCE = 0.01
@@ -61,8 +61,8 @@ async def compute_people_balances(db: AsyncSession, current_user_id: str) -> lis
                 break
         if my_member_id is None:
             continue
-        balances = await compute_group_balances(db, gid)
-        for t in settlement_suggestions(balances):
+        balances = await compute_group_balances(db, gid, group.currency)
+        for t in group_settlement_suggestions(balances):
             from_mid = t["from_member_id"]
             to_mid = t["to_member_id"]
             amount = float(t["amount"])
@@ -82,7 +82,7 @@ async def compute_people_balances(db: AsyncSession, current_user_id: str) -> lis
                 continue
             if abs(signed) < _TOLERANCE:
                 continue
-            contributions[other.user_id].append((gid, group.name, group.currency, signed))
+            contributions[other.user_id].append((gid, group.name, t["currency"], signed))
 
     if not contributions:
         return []
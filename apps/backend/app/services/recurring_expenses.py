@@ -1,27 +1,51 @@
 """Recurring expense rule materialization.
 
 Contains:
-- next_monthly_date: pure function advancing a date by one month, clamping day-of-month.
-Additional helpers (create_rule_from_payload, materialize_due_rules) added in later tasks.
+- next_monthly_date / add_months: pure functions advancing a date by months, clamping day-of-month.
+- next_occurrence / first_occurrence: the occurrence generator for weekly, monthly and
+  yearly schedules repeating every `interval` periods.
+- create_expense_from_rule: ORM path materializing a single rule instance.
+- materialize_due_rules: chunked, set-based materializer run by the scheduler.
 """
 from __future__ import annotations
 
 import calendar
 import logging
-from datetime import date, datetime
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
 from decimal import Decimal
 
-from sqlalchemy import select
+from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
+from app.core.metrics import RECURRING_CAPPED, RECURRING_MATERIALIZED, RECURRING_PAUSED
+from app.db.models.activity import Activity
 from app.db.models.expense import Expense, ExpenseSplit
 from app.db.models.group import GroupMember
-from app.db.models.recurring_rule import RecurringRule
+from app.db.models.recurring_rule import RecurringRule, group_hash
+from app.services.activity import expense_payload, record_activity
+from app.services.group_events import bump_revisions, queue_group_event, queue_group_events
+from app.services.spending_stats import apply_expenses
 
 
 logger = logging.getLogger(__name__)
 
 
+FREQUENCIES = ("weekly", "monthly", "yearly")
+
+
+def _clamped(year: int, month: int, day_of_month: int) -> date:
+    return date(year, month, min(day_of_month, calendar.monthrange(year, month)[1]))
+
+
+def add_months(prev: date, months: int, day_of_month: int) -> date:
+    """Advance `prev` by `months` calendar months, landing on `day_of_month` (clamped)."""
+    y, m0 = divmod(prev.month - 1 + months, 12)
+    return _clamped(prev.year + y, m0 + 1, day_of_month)
+
+
 def next_monthly_date(prev: date, day_of_month: int) -> date:
     """Advance `prev` by one calendar month; clamp `day_of_month` to the new month's length.
 
@@ -29,12 +53,48 @@ def next_monthly_date(prev: date, day_of_month: int) -> date:
     returns the correct next run date. So dom=31 in Feb yields Feb 28/29, but the rule
     still targets 31, restoring in March.
     """
-    if prev.month < 12:
-        y, m = prev.year, prev.month + 1
+    return add_months(prev, 1, day_of_month)
+
+
+def next_occurrence(prev: date, frequency: str, interval: int, day_of_month: int | None) -> date:
+    """The run date after `prev` for a schedule repeating every `interval` periods.
+
+    Weekly schedules keep `prev`'s weekday. Yearly schedules keep `prev`'s month and,
+    like monthly ones, target `day_of_month` with clamping (Feb 29 -> Feb 28 -> Feb 29).
+    """
+    if frequency == "weekly":
+        return prev + timedelta(weeks=interval)
+    if frequency == "yearly":
+        return add_months(prev, 12 * interval, day_of_month)
+    return add_months(prev, interval, day_of_month)
+
+
+def first_occurrence(
+    frequency: str,
+    *,
+    today: date,
+    day_of_month: int | None = None,
+    day_of_week: int | None = None,
+    month: int | None = None,
+    after_today: bool = False,
+) -> date:
+    """First run date on or after `today` (strictly after if `after_today`).
+
+    Weekly schedules anchor on `day_of_week` (Mon=0), monthly on `day_of_month`,
+    yearly on `month` + `day_of_month`.
+    """
+    if frequency == "weekly":
+        candidate = today + timedelta(days=(day_of_week - today.weekday()) % 7)
+        step = lambda d: d + timedelta(weeks=1)  # noqa: E731
+    elif frequency == "yearly":
+        candidate = _clamped(today.year, month, day_of_month)
+        step = lambda d: add_months(d, 12, day_of_month)  # noqa: E731
     else:
-        y, m = prev.year + 1, 1
-    last_day = calendar.monthrange(y, m)[1]
-    return date(y, m, min(day_of_month, last_day))
+        candidate = _clamped(today.year, today.month, day_of_month)
+        step = lambda d: add_months(d, 1, day_of_month)  # noqa: E731
+    while candidate < today or (after_today and candidate == today):
+        candidate = step(candidate)
+    return candidate
 
 
 async def create_expense_from_rule(
@@ -86,34 +146,273 @@ async def _members_present(
     return (True, None)
 
 
-async def materialize_due_rules(db: AsyncSession, today: date) -> int:
+def shard_of_group(group_id: str, shard_count: int) -> int:
+    """Stable shard index for a group, identical across processes (unlike `hash`)."""
+    return group_hash(group_id) % shard_count
+
+
+def due_occurrences(rule: RecurringRule, today: date, limit: int) -> tuple[list[date], date]:
+    """Every missed run date of `rule` up to `today`, oldest first, capped at `limit`.
+
+    Returns `(dates, next_run_at)` where `next_run_at` is the first date not
+    materialized. When the cap is hit it is still <= today, so the next run
+    resumes the catch-up where this one stopped.
+    """
+    dates: list[date] = []
+    nxt = rule.next_run_at
+    while nxt <= today and len(dates) < limit:
+        dates.append(nxt)
+        nxt = next_occurrence(nxt, rule.frequency, rule.interval, rule.day_of_month)
+    return dates, nxt
+
+
+def _is_capped(rule: RecurringRule, today: date, limit: int) -> bool:
+    """True (and logged) if `rule` is still due after materializing up to `limit` occurrences."""
+    if rule.next_run_at > today:
+        return False
+    logger.warning(
+        "recurring: rule %s hit the catch-up cap (%d occurrences); resuming from %s next run",
+        rule.id, limit, rule.next_run_at,
+    )
+    return True
+
+
+async def pause_member_rules(db: AsyncSession, group_id: str, member_id: int) -> None:
+    """Pause the group's active rules that pay or split with `member_id`, before the member is removed.
+
+    Removing the member then clears `paid_by_member_id` (ON DELETE SET NULL),
+    so the rule cannot run until it is edited.
+    """
+    res = await db.execute(
+        select(RecurringRule).where(RecurringRule.group_id == group_id, RecurringRule.is_active.is_(True))
+    )
+    for rule in res.scalars():
+        if member_id in _required_member_ids(rule):
+            rule.is_active = False
+            rule.paused_reason = f"Member no longer in group (id={member_id})"
+            RECURRING_PAUSED.inc("member_removed")
+
+
+def _required_member_ids(rule: RecurringRule) -> list[int]:
+    """Member ids a rule needs to still be in its group: every split plus the payer."""
+    return [s["member_id"] for s in rule.splits_json] + [rule.paid_by_member_id]
+
+
+def _expense_rows(rule: RecurringRule, *, event_date: date) -> tuple[dict, list[dict]]:
+    """Bulk-insert equivalent of `create_expense_from_rule`: one expense row + its split rows.
+
+    The expense id is generated here so split rows can reference it without a flush.
+    """
+    expense_id = str(uuid.uuid4())
+    expense = {
+        "id": expense_id,
+        "group_id": rule.group_id,
+        "created_by": rule.created_by,
+        "paid_by_member_id": rule.paid_by_member_id,
+        "total_amount": rule.total_amount,
+        "currency": rule.currency,
+        "note": rule.note,
+        "date": datetime.combine(event_date, datetime.min.time()),
+        "recurring_rule_id": rule.id,
+    }
+    splits = [
+        {
+            "expense_id": expense_id,
+            "member_id": s["member_id"],
+            "share_amount": Decimal(str(s["share_amount"])),
+            "share_percentage": s.get("share_percentage"),
+        }
+        for s in rule.splits_json
+    ]
+    return expense, splits
+
+
+async def _materialize_chunk(
+    db: AsyncSession, rules: list[RecurringRule], today: date, max_occurrences: int
+) -> tuple[int, int]:
+    """Materialize a chunk of due rules with one membership query and two bulk inserts.
+
+    Does not commit; the caller owns the chunk's transaction. Returns
+    `(expenses_created, rules_capped)`.
+    """
+    required = {rule.id: _required_member_ids(rule) for rule in rules}
+    all_ids = {mid for ids in required.values() for mid in ids}
+    res = await db.execute(
+        select(GroupMember.id, GroupMember.group_id).where(GroupMember.id.in_(all_ids))
+    )
+    group_of_member = {mid: gid for mid, gid in res.all()}
+
+    expense_rows: list[dict] = []
+    split_rows: list[dict] = []
+    capped = 0
+    for rule in rules:
+        # A None payer (cleared when the payer left) counts as missing too.
+        missing = [mid for mid in required[rule.id] if mid is None or group_of_member.get(mid) != rule.group_id]
+        if missing:
+            rule.is_active = False
+            rule.paused_reason = f"Member no longer in group (id={missing[0]})"
+            RECURRING_PAUSED.inc("member_removed")
+            continue
+        dates, rule.next_run_at = due_occurrences(rule, today, max_occurrences)
+        for event_date in dates:
+            expense, splits = _expense_rows(rule, event_date=event_date)
+            expense_rows.append(expense)
+            split_rows.extend(splits)
+        capped += _is_capped(rule, today, max_occurrences)
+
+    if expense_rows:
+        await db.execute(insert(Expense), expense_rows)
+    if split_rows:
+        await db.execute(insert(ExpenseSplit), split_rows)
+    if expense_rows:
+        await apply_expenses(db, [row["id"] for row in expense_rows])
+        await db.execute(insert(Activity), [
+            {
+                "group_id": row["group_id"],
+                "type": "expense_created",
+                "payload": expense_payload(
+                    row["id"], row["total_amount"], row["currency"], row["note"],
+                    recurring_rule_id=row["recurring_rule_id"],
+                ),
+            }
+            for row in expense_rows
+        ])
+    revisions = await bump_revisions(db, {row["group_id"] for row in expense_rows})
+    queue_group_events(db, revisions, "expense.created", recurring=True)
+    return len(expense_rows), capped
+
+
+async def _materialize_one(
+    db: AsyncSession, rule_id: int, today: date, max_occurrences: int
+) -> tuple[int, int]:
+    """Per-rule fallback used to isolate the failing rule(s) of a rolled-back chunk.
+
+    Commits its own work. A rule that still fails is auto-paused with the error type.
+    Returns `(expenses_created, rules_capped)` like `_materialize_chunk`.
+    """
+    rule = await db.get(RecurringRule, rule_id)
+    if rule is None or not rule.is_active or rule.next_run_at > today:
+        return 0, 0
+    try:
+        ok, missing = await _members_present(db, rule.group_id, _required_member_ids(rule))
+        if not ok:
+            rule.is_active = False
+            rule.paused_reason = f"Member no longer in group (id={missing})"
+            RECURRING_PAUSED.inc("member_removed")
+            await db.commit()
+            return 0, 0
+        dates, next_run_at = due_occurrences(rule, today, max_occurrences)
+        created = []
+        for event_date in dates:
+            e = await create_expense_from_rule(db, rule, event_date=event_date)
+            created.append(e.id)
+            record_activity(
+                db, rule.group_id, "expense_created",
+                **expense_payload(e.id, e.total_amount, e.currency, e.note, recurring_rule_id=rule.id),
+            )
+        if dates:
+            await apply_expenses(db, created)
+            await queue_group_event(db, rule.group_id, "expense.created", recurring=True)
+        rule.next_run_at = next_run_at
+        await db.commit()
+        return len(dates), int(_is_capped(rule, today, max_occurrences))
+    except Exception as e:
+        logger.exception("materialize failed for rule %s", rule_id)
+        await db.rollback()
+        rule = await db.get(RecurringRule, rule_id)
+        rule.is_active = False
+        rule.paused_reason = f"Materialization error: {type(e).__name__}"
+        RECURRING_PAUSED.inc("error")
+        await db.commit()
+        return 0, 0
+
+
+async def materialize_due_rules(
+    db: AsyncSession,
+    today: date,
+    *,
+    batch_size: int | None = None,
+    max_occurrences: int | None = None,
+    shard: tuple[int, int] | None = None,
+    heartbeat: Callable[[], Awaitable[bool]] | None = None,
+    stats: dict | None = None,
+) -> int:
     """Materialize all active rules with next_run_at <= today.
 
+    A rule that fell behind (e.g. after downtime) gets one expense per missed
+    run date, each dated on its own occurrence, up to `max_occurrences` per rule
+    per pass (default `settings.recurring_max_catchup`). Capped rules are logged,
+    counted in `recurring_rules_capped_total` and, if `stats` is given, added to
+    `stats["capped"]`; they finish catching up on the following run.
+
+    Due rules are walked in (next_run_at, id) order through
+    `idx_recurring_rules_next_run_active`, `batch_size` at a time (default
+    `settings.recurring_batch_size`), so the scan only touches due rules. Each chunk is validated, bulk-inserted and
+    committed on its own, so a failure only rolls back that chunk, which is then
+    retried rule by rule to pause just the offending rule(s).
+
+    `shard=(index, count)` restricts the pass (in the WHERE clause, via the stored
+    `group_hash`) to groups whose `shard_of_group` equals `index`, so several workers can split the backlog. `heartbeat` is
+    awaited before every chunk; returning False (e.g. a lost lease) stops the pass.
+    On backends that support it the chunk's rows are locked with
+    `FOR UPDATE SKIP LOCKED`, so concurrent passes never pick the same rule.
+
     Rules whose splits reference removed members are auto-paused with a reason.
     Returns the count of expenses actually created.
     """
-    res = await db.execute(
-        select(RecurringRule).where(
+    batch_size = batch_size or settings.recurring_batch_size
+    max_occurrences = max_occurrences or settings.recurring_max_catchup
+    created = capped = 0
+    # Keyset cursor over (next_run_at, id). Capped rules move forward but stay due,
+    # so `seen` keeps them from being picked up twice in one pass.
+    cursor: tuple[date, int] | None = None
+    seen: set[int] = set()
+    while True:
+        if heartbeat is not None and not await heartbeat():
+            logger.warning("recurring: heartbeat lost, stopping after %s", cursor)
+            break
+        stmt = select(RecurringRule).where(
             RecurringRule.is_active.is_(True),
             RecurringRule.next_run_at <= today,
         )
-    )
-    rules = list(res.scalars().all())
-    created = 0
-    for rule in rules:
+        if shard is not None:
+            # In SQL, so other shards' rules are never locked by this pass.
+            index, count = shard
+            stmt = stmt.where(RecurringRule.group_hash % count == index)
+        if cursor is not None:
+            stmt = stmt.where(tuple_(RecurringRule.next_run_at, RecurringRule.id) > tuple_(*cursor))
+        res = await db.execute(
+            stmt.order_by(RecurringRule.next_run_at, RecurringRule.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rules = list(res.scalars().all())
+        if not rules:
+            break
+        cursor = (rules[-1].next_run_at, rules[-1].id)
+        rules = [rule for rule in rules if rule.id not in seen]
+        seen.update(rule.id for rule in rules)
+        if not rules:
+            await db.commit()
+            continue
+        rule_ids = [rule.id for rule in rules]
         try:
-            required_ids = [s["member_id"] for s in rule.splits_json] + [rule.paid_by_member_id]
-            ok, missing = await _members_present(db, rule.group_id, required_ids)
-            if not ok:
-                rule.is_active = False
-                rule.paused_reason = f"Member no longer in group (id={missing})"
-                continue
-            await create_expense_from_rule(db, rule, event_date=today)
-            rule.next_run_at = next_monthly_date(rule.next_run_at, rule.day_of_month)
-            created += 1
-        except Exception as e:
-            logger.exception("materialize failed for rule %s", rule.id)
-            rule.is_active = False
-            rule.paused_reason = f"Materialization error: {type(e).__name__}"
-    await db.commit()
+            chunk_created, chunk_capped = await _materialize_chunk(db, rules, today, max_occurrences)
+            await db.commit()
+            created += chunk_created
+            capped += chunk_capped
+        except Exception:
+            logger.exception(
+                "materialize chunk failed (rules %s..%s); retrying rule by rule",
+                rule_ids[0], rule_ids[-1],
+            )
+            await db.rollback()
+            for rid in rule_ids:
+                rule_created, rule_capped = await _materialize_one(db, rid, today, max_occurrences)
+                created += rule_created
+                capped += rule_capped
+    RECURRING_MATERIALIZED.inc(amount=created)
+    RECURRING_CAPPED.inc(amount=capped)
+    if stats is not None:
+        stats["capped"] = stats.get("capped", 0) + capped
     return created
@@ -2,32 +2,122 @@
 
 Uses APScheduler AsyncIOScheduler. Runs once at startup (catchup) and daily at
 05:00 UTC (~10:30 IST). Idempotent — materialize_due_rules skips rules already
-advanced past today.
+advanced past today, and back-fills every occurrence missed while we were down.
+
+Every uvicorn worker (and every replica) runs this scheduler, so the due rules
+are split into `settings.recurring_shards` group-hash shards, each guarded by a
+`scheduler_leases` row. A worker only materializes shards whose lease it holds,
+renews the lease between chunks, and releases everything when the pass ends.
+
+The startup catch-up runs as a background task so a large backlog never delays
+the app from serving traffic; its progress is exposed via `catchup_status()`.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import date
+import os
+import socket
+import uuid
+import zlib
+from datetime import date, datetime
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from app.core.config import settings
 from app.db.session import SessionLocal
+from app.services.leases import release_lease, try_acquire_lease
 from app.services.recurring_expenses import materialize_due_rules
 
 
 logger = logging.getLogger(__name__)
 
 _scheduler: AsyncIOScheduler | None = None
+_catchup_task: asyncio.Task | None = None
+_catchup: dict = {
+    "status": "pending",  # pending | running | done | failed
+    "started_at": None,
+    "finished_at": None,
+    "shards_total": 0,
+    "shards_done": 0,
+    "shards_skipped": 0,  # leased by another worker
+    "shards_failed": 0,  # materialization raised; retried on the next run
+    "materialized": 0,
+    # Rules still behind after their per-run cap (RECURRING_MAX_CATCHUP); they resume next run.
+    "capped": 0,
+}
+
+# Identifies this process as a lease holder.
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
 
+def _lease_name(shard: int) -> str:
+    return f"recurring:{shard}/{settings.recurring_shards}"
 
-async def _run_once() -> None:
+
+async def _acquire(shard: int) -> bool:
     async with SessionLocal() as db:
-        try:
-            n = await materialize_due_rules(db, today=date.today())
-            logger.info("recurring: materialized %d expense(s)", n)
-        except Exception:
-            logger.exception("recurring: materialization failed")
+        return await try_acquire_lease(
+            db, _lease_name(shard), WORKER_ID, settings.recurring_lease_ttl_seconds
+        )
+
+
+async def _run_once(progress: dict | None = None) -> int:
+    """One materialization pass over every shard this worker can lease.
+
+    `progress`, if given, is updated in place after each shard: a shard counts as
+    done once materialized, as skipped if another worker holds its lease, and as
+    failed if materialization raised.
+    """
+    count = max(1, settings.recurring_shards)
+    if progress is not None:
+        progress["shards_total"] = count
+    # Start at a worker-specific offset so concurrent workers fan out over the shards.
+    start = zlib.crc32(WORKER_ID.encode()) % count
+    held: list[int] = []
+    total = 0
+    stats = {"capped": 0}
+    try:
+        for i in range(count):
+            shard = (start + i) % count
+            if not await _acquire(shard):
+                if progress is not None:
+                    progress["shards_skipped"] += 1
+                continue
+            held.append(shard)
+            outcome = "shards_done"
+            async with SessionLocal() as db:
+                try:
+                    total += await materialize_due_rules(
+                        db,
+                        today=date.today(),
+                        shard=(shard, count) if count > 1 else None,
+                        heartbeat=lambda shard=shard: _acquire(shard),
+                        stats=stats,
+                    )
+                except Exception:
+                    logger.exception("recurring: materialization failed (shard %d)", shard)
+                    outcome = "shards_failed"
+            if progress is not None:
+                progress[outcome] += 1
+                progress["materialized"] = total
+                progress["capped"] = stats["capped"]
+    finally:
+        for shard in held:
+            try:
+                async with SessionLocal() as db:
+                    await release_lease(db, _lease_name(shard), WORKER_ID)
+            except Exception:
+                logger.exception("recurring: failed to release lease for shard %d", shard)
+    if held:
+        logger.info(
+            "recurring: materialized %d expense(s) in shard(s) %s; %d rule(s) capped",
+            total, sorted(held), stats["capped"],
+        )
+    else:
+        logger.info("recurring: all shards leased by other workers; nothing to do")
+    return total
 
 
 def start_scheduler() -> None:
@@ -45,16 +135,48 @@ def start_scheduler() -> None:
     )
     sched.start()
     _scheduler = sched
-    logger.info("recurring: scheduler started (daily @ 05:00 UTC)")
+    logger.info("recurring: scheduler started (daily @ 05:00 UTC, worker %s)", WORKER_ID)
 
 
 async def run_startup_catchup() -> None:
-    """Awaited from FastAPI startup event to cover any missed days."""
-    await _run_once()
+    """Cover any missed days, recording progress in the state behind `catchup_status()`."""
+    _catchup.update(
+        status="running", started_at=datetime.utcnow(), finished_at=None,
+        shards_total=0, shards_done=0, shards_skipped=0, shards_failed=0, materialized=0, capped=0,
+    )
+    try:
+        await _run_once(progress=_catchup)
+    except Exception:
+        logger.exception("recurring: startup catch-up failed")
+        _catchup["status"] = "failed"
+    else:
+        _catchup["status"] = "done"
+    finally:
+        _catchup["finished_at"] = datetime.utcnow()
+
+
+def start_startup_catchup() -> asyncio.Task:
+    """Schedule `run_startup_catchup` on the running loop without waiting for it."""
+    global _catchup_task
+    if _catchup_task is None or _catchup_task.done():
+        _catchup_task = asyncio.get_running_loop().create_task(run_startup_catchup())
+    return _catchup_task
+
+
+def catchup_status() -> dict:
+    """JSON-friendly snapshot of the startup catch-up progress."""
+    return {
+        **_catchup,
+        "started_at": _catchup["started_at"].isoformat() if _catchup["started_at"] else None,
+        "finished_at": _catchup["finished_at"].isoformat() if _catchup["finished_at"] else None,
+    }
 
 
 def shutdown_scheduler() -> None:
-    global _scheduler
+    global _scheduler, _catchup_task
+    if _catchup_task is not None and not _catchup_task.done():
+        _catchup_task.cancel()
+    _catchup_task = None
     if _scheduler is not None:
         _scheduler.shutdown(wait=False)
         _scheduler = None
@@ -1,5 +1,7 @@
 from typing import Dict, List
 
+from app.services.balances import GroupBalances
+
 
 def settlement_suggestions(balances: Dict[int, float]) -> List[dict]:
     """Greedy min-transactions suggestion. Pairs largest creditor with
@@ -38,3 +40,15 @@ def settlement_suggestions(balances: Dict[int, float]) -> List[dict]:
         else:
             debtors[j][1] = d_amt
     return transfers
+
+
+def group_settlement_suggestions(balances: GroupBalances) -> List[dict]:
+    """Suggestions for a group, each transfer tagged with its ``currency``.
+
+    Transfers in the group's currency settle the converted balances; each
+    currency without an FX rate is settled separately in that currency.
+    """
+    transfers = [t | {"currency": balances.currency} for t in settlement_suggestions(balances.balances)]
+    for currency, members in balances.unconverted.items():
+        transfers += [t | {"currency": currency} for t in settlement_suggestions(members)]
+    return transfers
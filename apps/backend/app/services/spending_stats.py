@@ -0,0 +1,205 @@
+"""Group spending statistics backed by the `expense_rollups` table.
+
+Each expense write adds (or, before an edit or delete, subtracts) the expense's
+contribution to its month's rows with one ``INSERT ... SELECT ... ON CONFLICT
+DO UPDATE``. The month is computed in SQL from the stored date, exactly as a
+full rebuild computes it, so incremental upkeep and `rebuild_group_stats`
+always agree. Reads then sum rollup rows instead of scanning expenses.
+
+`user_spending` sums one user's shares across all their groups. Every rollup
+change bumps its group's revision, so each user's result is cached against the
+revisions of their groups and recomputed only when one of them moves.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, cast, delete, func, literal, select, union_all
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.metrics import record_cache
+from app.db.models.expense import Expense, ExpenseSplit
+from app.db.models.expense_rollup import ExpenseRollup
+from app.db.models.group import Group, GroupMember
+
+_KEY = ("group_id", "month", "member_id", "currency")
+
+
+def _month(column, dialect: str):
+    if dialect == "postgresql":
+        return cast(func.date_trunc("month", func.timezone("UTC", column)), Date)
+    return func.date(column, "start of month")
+
+
+def _contributions(dialect: str, *where, sign: int = 1):
+    """Per-key sums of the matching expenses: (group, month, member, currency, paid, count, share)."""
+    month = _month(Expense.date, dialect)
+    paid = select(
+        Expense.group_id, month.label("month"), Expense.paid_by_member_id.label("member_id"), Expense.currency,
+        Expense.total_amount.label("paid"), literal(1).label("n"), literal(0).label("share"),
+    ).where(*where)
+    shares = select(
+        Expense.group_id, month.label("month"), ExpenseSplit.member_id, Expense.currency,
+        literal(0), literal(0), ExpenseSplit.share_amount,
+    ).join(ExpenseSplit, ExpenseSplit.expense_id == Expense.id).where(*where)
+    rows = union_all(paid, shares).subquery()
+    return select(
+        *(rows.c[k] for k in _KEY),
+        func.sum(rows.c.paid) * sign, func.sum(rows.c.n) * sign, func.sum(rows.c.share) * sign,
+    ).group_by(*(rows.c[k] for k in _KEY))
+
+
+def _dialect(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+async def apply_expenses(db: AsyncSession, expense_ids, sign: int = 1) -> None:
+    """Add (`sign=1`) or subtract (`sign=-1`) the expenses' current rows to their group's rollups.
+
+    Call with -1 before changing or soft-deleting an expense, and with 1 once
+    its new splits are added (pending ORM changes are flushed first).
+    """
+    expense_ids = list(expense_ids)
+    if not expense_ids:
+        return
+    dialect = _dialect(db)
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    columns = [*_KEY, "paid_amount", "paid_count", "share_amount"]
+    stmt = insert(ExpenseRollup).from_select(columns, _contributions(dialect, Expense.id.in_(expense_ids), sign=sign))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(_KEY),
+        set_={
+            "paid_amount": ExpenseRollup.paid_amount + stmt.excluded.paid_amount,
+            "paid_count": ExpenseRollup.paid_count + stmt.excluded.paid_count,
+            "share_amount": ExpenseRollup.share_amount + stmt.excluded.share_amount,
+        },
+    )
+    await db.execute(stmt)
+
+
+async def rebuild_group_stats(db: AsyncSession, group_id: str | None = None) -> None:
+    """Recompute a group's rollups (every group's if `group_id` is None) from its live expenses.
+
+    Used after a member's expenses cascade away, and to fill rollups for rows
+    written outside the API.
+    """
+    rollups, live = delete(ExpenseRollup), [Expense.deleted_at.is_(None)]
+    if group_id is not None:
+        rollups = rollups.where(ExpenseRollup.group_id == group_id)
+        live.append(Expense.group_id == group_id)
+    await db.execute(rollups)
+    await db.execute(
+        ExpenseRollup.__table__.insert().from_select(
+            [*_KEY, "paid_amount", "paid_count", "share_amount"], _contributions(_dialect(db), *live)
+        )
+    )
+
+
+async def group_stats(db: AsyncSession, group_id: str, start: date | None = None, end: date | None = None) -> dict:
+    """Spend per month, per payer and per member share, each split by currency.
+
+    `start` / `end` select whole months (inclusive) by their first day.
+    """
+    stmt = select(ExpenseRollup).where(ExpenseRollup.group_id == group_id)
+    if start is not None:
+        stmt = stmt.where(ExpenseRollup.month >= start)
+    if end is not None:
+        stmt = stmt.where(ExpenseRollup.month <= end)
+    months: dict[tuple[date, str], list] = defaultdict(lambda: [Decimal(0), 0])
+    payers: dict[tuple[int, str], list] = defaultdict(lambda: [Decimal(0), 0])
+    shares: dict[tuple[int, str], Decimal] = defaultdict(Decimal)
+    for r in (await db.execute(stmt)).scalars():
+        if r.paid_count:
+            months[r.month, r.currency][0] += Decimal(r.paid_amount)
+            months[r.month, r.currency][1] += r.paid_count
+            payers[r.member_id, r.currency][0] += Decimal(r.paid_amount)
+            payers[r.member_id, r.currency][1] += r.paid_count
+        if r.share_amount:
+            shares[r.member_id, r.currency] += Decimal(r.share_amount)
+    return {
+        "months": [
+            {"month": m.strftime("%Y-%m"), "currency": c, "total": float(t), "count": n}
+            for (m, c), (t, n) in sorted(months.items())
+        ],
+        "by_payer": [
+            {"member_id": mid, "currency": c, "paid": float(t), "count": n}
+            for (mid, c), (t, n) in sorted(payers.items(), key=lambda kv: -kv[1][0])
+        ],
+        "by_member": [
+            {"member_id": mid, "currency": c, "share": float(t)}
+            for (mid, c), t in sorted(shares.items(), key=lambda kv: -kv[1])
+        ],
+    }
+
+
+class SpendingCache:
+    """Per-user spending results for up to `users` users, valid while their groups' revisions are unchanged."""
+
+    def __init__(self, users: int = 1000):
+        self.users = users
+        self._items: OrderedDict[str, tuple[tuple, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, revisions: tuple) -> dict | None:
+        with self._lock:
+            entry = self._items.get(user_id)
+            if entry is None or entry[0] != revisions:
+                return None
+            self._items.move_to_end(user_id)
+            return entry[1]
+
+    def put(self, user_id: str, revisions: tuple, result: dict) -> None:
+        if self.users <= 0:
+            return
+        with self._lock:
+            self._items[user_id] = (revisions, result)
+            self._items.move_to_end(user_id)
+            while len(self._items) > self.users:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+spending_cache = SpendingCache(users=settings.spending_cache_users)
+
+
+async def user_spending(db: AsyncSession, user_id: str) -> dict:
+    """The user's own share of live expenses across all their groups, per month and currency."""
+    res = await db.execute(
+        select(GroupMember.id, Group.id, Group.revision)
+        .join(Group, Group.id == GroupMember.group_id)
+        .where(GroupMember.user_id == user_id)
+    )
+    memberships = res.all()
+    revisions = tuple(sorted((group_id, revision) for _, group_id, revision in memberships))
+    cached = spending_cache.get(user_id, revisions)
+    record_cache("user_spending", cached is not None)
+    if cached is not None:
+        return cached
+
+    months, totals = [], defaultdict(Decimal)
+    if memberships:
+        res = await db.execute(
+            select(ExpenseRollup.month, ExpenseRollup.currency, func.sum(ExpenseRollup.share_amount))
+            .where(ExpenseRollup.member_id.in_([member_id for member_id, _, _ in memberships]))
+            .group_by(ExpenseRollup.month, ExpenseRollup.currency)
+            .order_by(ExpenseRollup.month, ExpenseRollup.currency)
+        )
+        for month, currency, share in res.all():
+            if not share:
+                continue
+            months.append({"month": month.strftime("%Y-%m"), "currency": currency, "share": float(share)})
+            totals[currency] += Decimal(share)
+    result = {
+        "months": months,
+        "totals": [{"currency": c, "share": float(t)} for c, t in sorted(totals.items())],
+    }
+    spending_cache.put(user_id, revisions, result)
+    return result
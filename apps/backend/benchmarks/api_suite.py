@@ -0,0 +1,183 @@
+"""Benchmark: latency and queries per request for the read endpoints.
+
+Drives the app in-process through httpx's ASGITransport against a database
+filled by `benchmarks.dataset` (generated into a temporary SQLite file unless
+--db points at an existing one), authenticated as bench@example.com. Each
+endpoint is requested `--requests` times for the bench user's largest group
+and for a typical (median-sized) one; p50/p95/p99 latency and the number of SQL
+statements per request (from the Server-Timing header) are reported.
+
+--json writes the results; --baseline compares against a previous --json file,
+so runs on the same dataset and machine are comparable over time.
+
+Usage (from apps/backend):
+    python -m benchmarks.api_suite --scale small --json bench.json
+    python -m benchmarks.api_suite --db sqlite+aiosqlite:////tmp/bench.db --baseline bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import statistics
+import tempfile
+import time
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.deps import get_db
+from app.core.security import create_token
+from app.db.models.group import GroupMember
+from app.db.models.user import User
+from app.main import app
+from benchmarks.dataset import BENCH_EMAIL, SCALES, generate
+
+
+ENDPOINTS = [
+    "/api/v1/me",
+    "/api/v1/me/balances/people",
+    "/api/v1/me/spending",
+    "/api/v1/groups/",
+    "/api/v1/groups/{group_id}",
+    "/api/v1/groups/{group_id}/expenses",
+    "/api/v1/groups/{group_id}/expenses/search?q=din",
+    "/api/v1/groups/{group_id}/balances",
+    "/api/v1/groups/{group_id}/settlements/suggestions",
+    "/api/v1/groups/{group_id}/settlements",
+    "/api/v1/groups/{group_id}/activity",
+    "/api/v1/groups/{group_id}/stats",
+    "/api/v1/groups/{group_id}/recurring-rules",
+]
+_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+
+def percentile(values: list[float], p: float) -> float:
+    """Nearest-rank percentile of `values` (p in 0..100)."""
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered) + 0.5) - 1))
+    return ordered[k]
+
+
+async def _bench_groups(sessionmaker) -> tuple[str, dict[str, str]]:
+    """The bench user's id and {"largest": id, "typical": id} of its groups."""
+    async with sessionmaker() as db:
+        user_id = (await db.execute(select(User.id).where(User.email == BENCH_EMAIL))).scalar_one()
+        mine = select(GroupMember.group_id).where(GroupMember.user_id == user_id)
+        sizes = (
+            await db.execute(
+                select(GroupMember.group_id, func.count())
+                .where(GroupMember.group_id.in_(mine))
+                .group_by(GroupMember.group_id)
+                .order_by(func.count().desc(), GroupMember.group_id)
+            )
+        ).all()
+    return user_id, {"largest": sizes[0][0], "typical": sizes[len(sizes) // 2][0]}
+
+
+async def run(db_url: str, requests: int) -> dict:
+    engine = create_async_engine(db_url)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def override_get_db():
+        async with sessionmaker() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        user_id, groups = await _bench_groups(sessionmaker)
+        headers = {"Authorization": f"Bearer {create_token(user_id, 60, 'access')}"}
+        results: dict[str, dict] = {}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", headers=headers) as client:
+            for template in ENDPOINTS:
+                variants = groups.items() if "{group_id}" in template else [("", None)]
+                for label, group_id in variants:
+                    path = template.format(group_id=group_id)
+                    name = f"{template} [{label}]" if label else template
+                    results[name] = await _measure(client, path, requests)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+    return results
+
+
+async def _measure(client: AsyncClient, path: str, n: int) -> dict:
+    resp = await client.get(path)  # warm-up, and fail loudly on a broken endpoint
+    resp.raise_for_status()
+    latencies, queries = [], []
+    for _ in range(n):
+        started = time.perf_counter()
+        resp = await client.get(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+        m = _QUERIES.search(resp.headers.get("server-timing", ""))
+        queries.append(int(m.group(1)) if m else 0)
+    return {
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries": round(statistics.mean(queries), 1),
+        "bytes": len(resp.content),
+    }
+
+
+def report(results: dict, baseline: dict | None) -> None:
+    width = max(len(name) for name in results)
+    print(f"{'endpoint':<{width}}  {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7} {'bytes':>9}")
+    for name, r in results.items():
+        line = (
+            f"{name:<{width}}  {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['p99_ms']:8.2f}"
+            f" {r['queries']:7.1f} {r['bytes']:9d}"
+        )
+        prev = (baseline or {}).get(name)
+        if prev:
+            change = (r["p50_ms"] - prev["p50_ms"]) / prev["p50_ms"] * 100 if prev["p50_ms"] else 0.0
+            line += f"  p50 {change:+.0f}%"
+            if r["queries"] != prev["queries"]:
+                line += f", queries {prev['queries']:g} -> {r['queries']:g}"
+        print(line)
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    if args.db:
+        return await run(args.db, args.requests)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_async_engine(db_url)
+        started = time.perf_counter()
+        try:
+            counts = await generate(engine, SCALES[args.scale], seed=args.seed)
+        finally:
+            await engine.dispose()
+        print(f"dataset {args.scale} in {time.perf_counter() - started:.1f}s: "
+              + " ".join(f"{k}={v}" for k, v in counts.items()))
+        return await run(db_url, args.requests)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="async URL of a database filled by benchmarks.dataset")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="tiny", help="dataset to generate when --db is not given")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--requests", type=int, default=50, help="timed requests per endpoint")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="compare against results written earlier with --json")
+    args = parser.parse_args()
+    logging.getLogger("app.requests").setLevel(logging.WARNING)
+
+    results = asyncio.run(_main(args))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    report(results, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"requests": args.requests, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
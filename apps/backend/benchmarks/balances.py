@@ -0,0 +1,184 @@
+"""Benchmark: balances of one huge group, by aggregation strategy.
+
+Builds a throwaway SQLite database holding a single event group with
+`--members` members and, for each size in `--splits`, that many expense splits
+(`--per-expense` per expense, spread over a year), then times:
+
+  python-loop   fetch every (member_id, amount) row, sum into a defaultdict(float)
+  numpy         compute_currency_balances(use_rollups=False, vectorized=True):
+                (member, cents) columns reduced with np.bincount (only when
+                numpy is installed)
+  sql           compute_currency_balances(use_rollups=False): GROUP BY in the database
+  rollups       compute_currency_balances(use_rollups=True): sum the monthly rollups
+  sql-as-of     balances as of mid-June, scanning every split up to then
+  rollups-as-of the same from the rollups before June plus a replay of June
+
+and checks that every strategy agrees with the exact SQL result to the cent.
+
+Usage (from apps/backend):
+    python -m benchmarks.balances --splits 10000 100000 1000000
+    python -m benchmarks.balances --splits 10000000 --repeat 1
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db import base as _models  # noqa: F401  (register all tables)
+from app.db.models.expense import Expense, ExpenseSplit
+from app.db.models.group import Group, GroupMember
+from app.db.models.user import User
+from app.db.session import Base
+from app.services.balances import compute_currency_balances, np
+from app.services.spending_stats import rebuild_group_stats
+
+GROUP_ID = "event"
+CHUNK = 20_000
+
+
+async def _populate(db: AsyncSession, members: int, splits: int, per_expense: int, seed: int) -> None:
+    rng = random.Random(seed)
+    await db.execute(insert(User), [{"id": "bench-user", "email": "bench@example.com", "name": "Bench"}])
+    await db.execute(insert(Group), [{"id": GROUP_ID, "name": "Event", "currency": "INR", "created_by": "bench-user"}])
+    await db.execute(
+        insert(GroupMember),
+        [{"id": m + 1, "group_id": GROUP_ID, "name": f"m{m}", "is_ghost": True} for m in range(members)],
+    )
+    start = datetime(2026, 1, 1)
+    expenses, rows = [], []
+    for e in range(splits // per_expense):
+        share = rng.randint(100, 100_000)  # paise
+        expenses.append({
+            "id": f"e{e}", "group_id": GROUP_ID, "paid_by_member_id": rng.randint(1, members),
+            "total_amount": share * per_expense / 100, "currency": "INR",
+            "date": start + timedelta(minutes=rng.randrange(365 * 24 * 60)),
+        })
+        for m in rng.sample(range(1, members + 1), per_expense):
+            rows.append({"expense_id": f"e{e}", "member_id": m, "share_amount": share / 100})
+        if len(rows) >= CHUNK:
+            await db.execute(insert(Expense), expenses)
+            await db.execute(insert(ExpenseSplit), rows)
+            expenses, rows = [], []
+    if expenses:
+        await db.execute(insert(Expense), expenses)
+        await db.execute(insert(ExpenseSplit), rows)
+    await rebuild_group_stats(db, GROUP_ID)
+    await db.commit()
+
+
+async def _rows(db: AsyncSession) -> tuple[list, list]:
+    live = (Expense.group_id == GROUP_ID, Expense.deleted_at.is_(None))
+    paid = (await db.execute(select(Expense.paid_by_member_id, Expense.total_amount).where(*live))).all()
+    shares = (await db.execute(
+        select(ExpenseSplit.member_id, ExpenseSplit.share_amount)
+        .join(Expense, Expense.id == ExpenseSplit.expense_id)
+        .where(*live)
+    )).all()
+    return paid, shares
+
+
+async def python_loop(db: AsyncSession) -> dict[int, float]:
+    paid, shares = await _rows(db)
+    balances: dict[int, float] = defaultdict(float)
+    for member_id, amount in paid:
+        balances[member_id] += float(amount)
+    for member_id, amount in shares:
+        balances[member_id] -= float(amount)
+    return dict(balances)
+
+
+async def numpy_bincount(db: AsyncSession) -> dict[int, float]:
+    by_currency = await compute_currency_balances(db, GROUP_ID, use_rollups=False, vectorized=True)
+    return {m: float(b) for m, b in by_currency.get("INR", {}).items()}
+
+
+async def sql(db: AsyncSession) -> dict[int, float]:
+    by_currency = await compute_currency_balances(db, GROUP_ID, use_rollups=False)
+    return {m: float(b) for m, b in by_currency.get("INR", {}).items()}
+
+
+async def rollups(db: AsyncSession) -> dict[int, float]:
+    by_currency = await compute_currency_balances(db, GROUP_ID, use_rollups=True)
+    return {m: float(b) for m, b in by_currency.get("INR", {}).items()}
+
+
+AS_OF = datetime(2026, 6, 15, 12)
+
+
+async def sql_as_of(db: AsyncSession) -> dict[int, float]:
+    by_currency = await compute_currency_balances(db, GROUP_ID, use_rollups=False, as_of=AS_OF)
+    return {m: float(b) for m, b in by_currency.get("INR", {}).items()}
+
+
+async def rollups_as_of(db: AsyncSession) -> dict[int, float]:
+    by_currency = await compute_currency_balances(db, GROUP_ID, use_rollups=True, as_of=AS_OF)
+    return {m: float(b) for m, b in by_currency.get("INR", {}).items()}
+
+
+# name -> (strategy, the exact strategy it must agree with)
+STRATEGIES = {
+    "python-loop": (python_loop, sql),
+    "numpy": (numpy_bincount, sql),
+    "sql": (sql, sql),
+    "rollups": (rollups, sql),
+    "sql-as-of": (sql_as_of, sql_as_of),
+    "rollups-as-of": (rollups_as_of, sql_as_of),
+}
+
+
+async def run(sizes: list[int], members: int, per_expense: int, repeat: int, seed: int) -> None:
+    print(f"{'splits':>10} {'strategy':<13} {'median ms':>10} {'max |diff|':>11}")
+    for splits in sizes:
+        path = tempfile.mktemp(suffix=".db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+            async with Session() as db:
+                await _populate(db, members, splits, per_expense, seed)
+            exact = {}
+            for reference in (sql, sql_as_of):
+                async with Session() as db:
+                    exact[reference] = await reference(db)
+            for name, (strategy, reference) in STRATEGIES.items():
+                if name == "numpy" and np is None:
+                    print(f"{splits:>10} {name:<13} skipped (numpy not installed)")
+                    continue
+                timings = []
+                for _ in range(repeat):
+                    async with Session() as db:
+                        t0 = time.perf_counter()
+                        result = await strategy(db)
+                        timings.append((time.perf_counter() - t0) * 1000)
+                diff = max(abs(result.get(m, 0.0) - b) for m, b in exact[reference].items())
+                print(f"{splits:>10} {name:<13} {statistics.median(timings):>10.1f} {diff:>11.2g}")
+        finally:
+            await engine.dispose()
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--splits", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--members", type=int, default=2_000)
+    parser.add_argument("--per-expense", type=int, default=10, help="splits per expense")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(run(args.splits, args.members, args.per_expense, args.repeat, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Benchmark: bandwidth saved vs CPU spent compressing typical API payloads.
+
+For expense lists of several lengths, a 500-member group and a balances map,
+reports the compressed size and the time per response of every available
+encoder (gzip always; brotli/zstd when their packages are installed) at a few
+levels, plus gzip flushed per 4 KiB chunk as a streamed body would be.
+
+Usage (from apps/backend):
+    python -m benchmarks.compression
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import zlib
+
+import orjson
+
+from app.core.compression import brotli, zstandard
+from benchmarks.serialization import rows
+
+
+def payloads() -> dict[str, bytes]:
+    members = [
+        {
+            "member_id": i, "user_id": f"{i:08d}-0000-4000-8000-000000000000", "is_admin": i == 1,
+            "joined_at": "2026-01-01T12:00:00", "name": f"User {i}", "email": f"user{i}@example.com",
+            "avatar_url": None, "is_ghost": False, "payment_methods": [],
+        }
+        for i in range(1, 501)
+    ]
+    return {
+        "expenses x10": orjson.dumps(rows(10)),
+        "expenses x100": orjson.dumps(rows(100)),
+        "expenses x1000": orjson.dumps(rows(1000)),
+        "expenses x10000": orjson.dumps(rows(10_000)),
+        "group 500 members": orjson.dumps({"id": "g", "name": "Trip", "currency": "INR", "icon": None,
+                                           "members": members}),
+        "balances 500": orjson.dumps({"group_id": "g", "balances": {str(i): i * 1.25 - 300 for i in range(500)}}),
+    }
+
+
+def codecs() -> dict:
+    out = {
+        f"gzip-{level}": (lambda data, level=level: zlib.compress(data, level, wbits=31))
+        for level in (1, 5, 9)
+    }
+
+    def gzip_streamed(data: bytes, chunk: int = 4096) -> bytes:
+        c = zlib.compressobj(5, zlib.DEFLATED, 31)
+        parts = [c.compress(data[i:i + chunk]) + c.flush(zlib.Z_SYNC_FLUSH) for i in range(0, len(data), chunk)]
+        return b"".join(parts) + c.flush()
+
+    out["gzip-5 streamed"] = gzip_streamed
+    if brotli is not None:
+        for quality in (4, 11):
+            out[f"br-{quality}"] = lambda data, quality=quality: brotli.compress(data, quality=quality)
+    if zstandard is not None:
+        for level in (3, 10):
+            out[f"zstd-{level}"] = zstandard.ZstdCompressor(level=level).compress
+    return out
+
+
+def best_ms(fn, data: bytes, budget: float = 0.3) -> float:
+    best, spent = float("inf"), 0.0
+    while spent < budget or best == float("inf"):
+        started = time.perf_counter()
+        fn(data)
+        elapsed = time.perf_counter() - started
+        best, spent = min(best, elapsed), spent + elapsed
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.parse_args()
+    encoders = codecs()
+    missing = [name for name, mod in (("brotli", brotli), ("zstandard", zstandard)) if mod is None]
+    if missing:
+        print(f"(not installed, skipped: {', '.join(missing)})")
+    print(f"{'payload':<18} {'bytes':>9}  {'encoder':<16} {'bytes':>9} {'ratio':>6} {'ms':>8} {'MB/s':>7}")
+    for name, data in payloads().items():
+        print(f"{name:<18} {len(data):9d}")
+        for enc, fn in encoders.items():
+            size = len(fn(data))
+            ms = best_ms(fn, data)
+            print(f"{'':<18} {'':>9}  {enc:<16} {size:9d} {len(data) / size:6.1f} {ms:8.3f} {len(data) / ms / 1000:7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Synthetic dataset generator for benchmarks.
+
+Fills a fresh database with deterministic (seeded), roughly realistic data:
+
+* group sizes are heavy-tailed: most groups have 2-4 members, a few have
+  hundreds, and one always has `max_group_size` members;
+* about 15% of non-creator members are ghosts (no user account);
+* expenses are spread over groups by size and a log-normal "activity" factor,
+  with log-normal amounts, dates over the past year, 2-8 way equal splits, and
+  about 2% soft-deleted;
+* about one settlement per 20 expenses, an activity row per expense, and
+  recurring rules in roughly a third of the groups.
+
+A dedicated user, bench@example.com, belongs to the largest group and to
+`bench_groups` ordinary groups, so per-user endpoints have realistic fan-out.
+All users share the password `PASSWORD`.
+
+Usage (from apps/backend):
+    python -m benchmarks.dataset --db sqlite+aiosqlite:////tmp/bench.db --scale small
+    python -m benchmarks.dataset --db postgresql+asyncpg://... --scale medium
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+
+from app.core.security import hash_password
+from app.db import base as _models  # noqa: F401  (register all tables)
+from app.db.models.activity import Activity
+from app.db.models.expense import Expense, ExpenseSplit
+from app.db.models.group import Group, GroupMember
+from app.db.models.recurring_rule import RecurringRule
+from app.db.models.settlement import Settlement
+from app.db.models.user import User
+from app.db.session import Base
+from app.services.spending_stats import rebuild_group_stats
+
+
+BENCH_EMAIL = "bench@example.com"
+# Every generated user can log in with this password.
+PASSWORD = "bench-password"
+CHUNK = 5_000
+
+
+@dataclass
+class Scale:
+    users: int
+    groups: int
+    expenses: int
+    max_group_size: int
+    bench_groups: int = 20
+
+
+SCALES = {
+    "tiny": Scale(users=200, groups=40, expenses=2_000, max_group_size=50, bench_groups=5),
+    "small": Scale(users=2_000, groups=500, expenses=50_000, max_group_size=500),
+    "medium": Scale(users=20_000, groups=5_000, expenses=1_000_000, max_group_size=5_000),
+    "large": Scale(users=100_000, groups=20_000, expenses=5_000_000, max_group_size=5_000, bench_groups=50),
+}
+
+
+def _group_size(rng: random.Random, max_size: int) -> int:
+    r = rng.random()
+    if r < 0.70:
+        size = rng.randint(2, 4)
+    elif r < 0.90:
+        size = rng.randint(5, 10)
+    elif r < 0.98:
+        size = rng.randint(11, 50)
+    else:  # log-uniform tail
+        size = int(math.exp(rng.uniform(math.log(51), math.log(max(max_size, 52)))))
+    return min(size, max_size)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+async def _insert(engine: AsyncEngine, table, rows: list[dict]) -> None:
+    for i in range(0, len(rows), CHUNK):
+        async with engine.begin() as conn:
+            await conn.execute(insert(table), rows[i:i + CHUNK])
+
+
+async def generate(engine: AsyncEngine, scale: Scale, seed: int = 42, today: date | None = None) -> dict:
+    """Create the schema on `engine` and fill it. Returns row counts."""
+    rng = random.Random(seed)
+    today = today or date.today()
+    now = datetime.combine(today, datetime.min.time())
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    # One shared hash: hashing thousands of passwords would dominate setup.
+    pw = hash_password(PASSWORD)
+    users = [{"id": _uuid(rng), "email": BENCH_EMAIL, "name": "Bench", "password_hash": pw, "created_at": now}]
+    users += [
+        {"id": _uuid(rng), "email": f"user{i}@example.com", "name": f"User {i}", "password_hash": pw, "created_at": now}
+        for i in range(1, scale.users)
+    ]
+    await _insert(engine, User, users)
+    bench_id = users[0]["id"]
+    user_ids = [u["id"] for u in users[1:]]
+
+    sizes = [_group_size(rng, scale.max_group_size) for _ in range(scale.groups)]
+    sizes[0] = scale.max_group_size
+    bench_group_idx = {0, *rng.sample(range(1, scale.groups), min(scale.bench_groups, scale.groups - 1))}
+
+    groups, members = [], []
+    members_of: list[list[int]] = []
+    member_id = 0
+    for gi, size in enumerate(sizes):
+        gid = _uuid(rng)
+        regulars = rng.sample(user_ids, min(size, len(user_ids)))
+        creator = bench_id if gi in bench_group_idx else regulars[0]
+        groups.append({"id": gid, "name": f"Group {gi}", "currency": "INR", "created_by": creator, "created_at": now})
+        ids = []
+        for k in range(size):
+            member_id += 1
+            ids.append(member_id)
+            if k == 0:
+                row = {"user_id": creator, "is_admin": True, "is_ghost": False, "name": None}
+            elif rng.random() < 0.15:
+                row = {"user_id": None, "is_admin": False, "is_ghost": True, "name": f"Ghost {member_id}"}
+            else:
+                row = {"user_id": regulars[k % len(regulars)], "is_admin": False, "is_ghost": False, "name": None}
+            members.append({"id": member_id, "group_id": gid, "joined_at": now, **row})
+        members_of.append(ids)
+    # A user may appear once per group; drop accidental duplicates.
+    seen: set[tuple] = set()
+    unique = []
+    for m in members:
+        key = (m["group_id"], m["user_id"])
+        if m["user_id"] is not None and key in seen:
+            continue
+        seen.add(key)
+        unique.append(m)
+    members = unique
+    valid_members = {m["id"] for m in members}
+    members_of = [[mid for mid in ids if mid in valid_members] for ids in members_of]
+    await _insert(engine, Group, groups)
+    await _insert(engine, GroupMember, members)
+
+    weights = [len(ids) ** 0.8 * rng.lognormvariate(0, 1) for ids in members_of]
+    counts = {"users": len(users), "groups": len(groups), "members": len(members),
+              "expenses": 0, "splits": 0, "settlements": 0, "activity": 0, "recurring_rules": 0}
+    expenses, splits, activity, settlements = [], [], [], []
+
+    async def flush() -> None:
+        await _insert(engine, Expense, expenses)
+        await _insert(engine, ExpenseSplit, splits)
+        await _insert(engine, Activity, activity)
+        await _insert(engine, Settlement, settlements)
+        counts["expenses"] += len(expenses)
+        counts["splits"] += len(splits)
+        counts["activity"] += len(activity)
+        counts["settlements"] += len(settlements)
+        for rows in (expenses, splits, activity, settlements):
+            rows.clear()
+
+    group_choices = rng.choices(range(len(groups)), weights=weights, k=scale.expenses)
+    for gi in group_choices:
+        ids = members_of[gi]
+        gid = groups[gi]["id"]
+        k = min(len(ids), 2 + min(int(rng.expovariate(0.6)), 6))
+        participants = rng.sample(ids, k)
+        total = round(rng.lognormvariate(math.log(600), 1.0), 2)
+        share = round(total / k, 2)
+        when = now - timedelta(days=rng.uniform(0, 365))
+        eid = _uuid(rng)
+        expenses.append({
+            "id": eid, "group_id": gid, "created_by": groups[gi]["created_by"],
+            "paid_by_member_id": rng.choice(participants), "total_amount": total, "currency": "INR",
+            "note": rng.choice(("Groceries", "Dinner", "Cab", "Rent", "Electricity", "Movie", "Coffee", "Trip")),
+            "date": when, "deleted_at": now if rng.random() < 0.02 else None,
+            "created_at": when, "updated_at": when,
+        })
+        for j, mid in enumerate(participants):
+            amount = share if j < k - 1 else round(total - share * (k - 1), 2)
+            splits.append({"expense_id": eid, "member_id": mid, "share_amount": amount})
+        activity.append({
+            "id": _uuid(rng), "group_id": gid, "user_id": groups[gi]["created_by"], "type": "expense_created",
+            "payload": {"expense_id": eid, "amount": total}, "created_at": when,
+        })
+        if rng.random() < 0.05 and len(ids) >= 2:
+            a, b = rng.sample(ids, 2)
+            settlements.append({
+                "id": _uuid(rng), "group_id": gid, "from_member_id": a, "to_member_id": b,
+                "amount": round(total / 2, 2), "currency": "INR",
+                "method": "manual", "status": "success" if rng.random() < 0.9 else "pending", "created_at": when,
+            })
+        if len(expenses) >= CHUNK:
+            await flush()
+    await flush()
+    async with AsyncSession(engine) as db:
+        await rebuild_group_stats(db)
+        await db.commit()
+
+    rules = []
+    for gi, ids in enumerate(members_of):
+        if rng.random() >= 0.33 or len(ids) < 2:
+            continue
+        for _ in range(rng.randint(1, 3)):
+            participants = rng.sample(ids, min(len(ids), rng.randint(2, 4)))
+            total = round(rng.choice((999, 1499, 15000, 25000)), 2)
+            rules.append({
+                "group_id": groups[gi]["id"], "paid_by_member_id": participants[0], "total_amount": total,
+                "currency": "INR", "note": "Recurring",
+                "splits_json": [
+                    {"member_id": mid, "share_amount": round(total / len(participants), 2), "share_percentage": None}
+                    for mid in participants
+                ],
+                "frequency": "monthly", "interval": 1, "day_of_month": rng.randint(1, 28),
+                "next_run_at": today + timedelta(days=rng.randint(1, 30)), "is_active": True,
+                "created_by": groups[gi]["created_by"],
+            })
+    await _insert(engine, RecurringRule, rules)
+    counts["recurring_rules"] = len(rules)
+    return counts
+
+
+async def _main(args: argparse.Namespace) -> None:
+    scale = SCALES[args.scale]
+    engine = create_async_engine(args.db)
+    started = time.perf_counter()
+    try:
+        counts = await generate(engine, scale, seed=args.seed)
+    finally:
+        await engine.dispose()
+    print(f"generated in {time.perf_counter() - started:.1f}s: " + " ".join(f"{k}={v}" for k, v in counts.items()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", required=True, help="SQLAlchemy async URL of an empty database")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Load test: concurrent user sessions against a real uvicorn server.
+
+Starts uvicorn on a generated dataset (or targets --url) and runs `--users`
+virtual users for `--duration` seconds. Each one repeatedly plays a session
+like a phone client does:
+
+    login -> list groups -> open a group -> list expenses -> balances
+    -> sometimes add an expense (30%) -> sometimes settle up (15%)
+    -> sometimes the people balances screen (50%)
+
+with `--think-ms` of think time between requests. Reported: throughput,
+error rate, and p50/p95/p99 latency per step. Raise --users until throughput
+stops growing to find the ceiling of a given DB backend and worker count.
+
+Usage (from apps/backend):
+    python -m benchmarks.loadtest --scale small --users 50 --duration 60
+    python -m benchmarks.loadtest --db postgresql+asyncpg://... --generate --scale small --workers 4
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --db sqlite+aiosqlite:////tmp/bench.db
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.models.group import GroupMember
+from app.db.models.user import User
+from benchmarks.api_suite import percentile
+from benchmarks.dataset import PASSWORD, SCALES, generate
+
+
+class Stats:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+        self.sessions = 0
+
+    def record(self, step: str, seconds: float, ok: bool) -> None:
+        self.latencies[step].append(seconds * 1000)
+        if not ok:
+            self.errors[step] += 1
+
+    def summary(self, elapsed: float) -> dict:
+        total = sum(len(v) for v in self.latencies.values())
+        errors = sum(self.errors.values())
+        steps = {
+            step: {
+                "count": len(values),
+                "errors": self.errors[step],
+                "p50_ms": round(percentile(values, 50), 2),
+                "p95_ms": round(percentile(values, 95), 2),
+                "p99_ms": round(percentile(values, 99), 2),
+            }
+            for step, values in self.latencies.items()
+        }
+        return {
+            "seconds": round(elapsed, 1),
+            "requests": total,
+            "sessions": self.sessions,
+            "rps": round(total / elapsed, 1),
+            "error_rate": round(errors / total, 4) if total else 0.0,
+            "steps": steps,
+        }
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, email: str, stats: Stats, rng: random.Random, think: float):
+        self.client, self.email, self.stats, self.rng, self.think = client, email, stats, rng, think
+        self.headers: dict[str, str] = {}
+
+    async def call(self, step: str, method: str, path: str, **kwargs) -> httpx.Response | None:
+        started = time.perf_counter()
+        try:
+            resp = await self.client.request(method, path, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(step, time.perf_counter() - started, ok=False)
+            return None
+        self.stats.record(step, time.perf_counter() - started, ok=resp.status_code < 400)
+        if self.think:
+            await asyncio.sleep(self.rng.uniform(0.5, 1.5) * self.think)
+        return resp if resp.status_code < 400 else None
+
+    async def session(self) -> None:
+        self.headers = {}
+        resp = await self.call("login", "POST", "/api/v1/auth/login", json={"email": self.email, "password": PASSWORD})
+        if resp is None:
+            return
+        self.headers = {"Authorization": f"Bearer {resp.json()['tokens']['access_token']}"}
+        resp = await self.call("list_groups", "GET", "/api/v1/groups/")
+        if resp is None or not resp.json():
+            return
+        group_id = self.rng.choice(resp.json())["id"]
+        resp = await self.call("open_group", "GET", f"/api/v1/groups/{group_id}")
+        if resp is None:
+            return
+        member_ids = [m["member_id"] for m in resp.json()["members"]]
+        await self.call("list_expenses", "GET", f"/api/v1/groups/{group_id}/expenses")
+        await self.call("balances", "GET", f"/api/v1/groups/{group_id}/balances")
+        if self.rng.random() < 0.30 and len(member_ids) >= 2:
+            participants = self.rng.sample(member_ids, min(len(member_ids), 3))
+            total = round(self.rng.uniform(50, 3000), 2)
+            shares = [round(total / len(participants), 2)] * len(participants)
+            shares[-1] = round(total - sum(shares[:-1]), 2)
+            await self.call("add_expense", "POST", f"/api/v1/groups/{group_id}/expenses", json={
+                "total_amount": total, "currency": "INR", "note": "Load test",
+                "paid_by_member_id": participants[0],
+                "splits": [{"member_id": m, "share_amount": s} for m, s in zip(participants, shares)],
+            })
+        if self.rng.random() < 0.15:
+            resp = await self.call("suggestions", "GET", f"/api/v1/groups/{group_id}/settlements/suggestions")
+            if resp is not None and resp.json():
+                transfer = resp.json()[0]
+                await self.call("settle_up", "POST", f"/api/v1/groups/{group_id}/settlements", json=transfer)
+        if self.rng.random() < 0.50:
+            await self.call("people_balances", "GET", "/api/v1/me/balances/people")
+        self.stats.sessions += 1
+
+    async def run(self, deadline: float) -> None:
+        while time.monotonic() < deadline:
+            await self.session()
+
+
+async def member_emails(db_url: str) -> list[str]:
+    """Emails of users that belong to at least one group."""
+    engine = create_async_engine(db_url)
+    try:
+        async with engine.connect() as conn:
+            res = await conn.execute(
+                select(User.email).where(User.id.in_(select(GroupMember.user_id))).order_by(User.email)
+            )
+            return list(res.scalars())
+    finally:
+        await engine.dispose()
+
+
+async def run_load(url: str, emails: list[str], users: int, duration: float, think_ms: float, seed: int) -> dict:
+    rng = random.Random(seed)
+    stats = Stats()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30.0) as client:
+        vus = [
+            VirtualUser(client, rng.choice(emails), stats, random.Random(rng.random()), think_ms / 1000)
+            for _ in range(users)
+        ]
+        started = time.monotonic()
+        await asyncio.gather(*(vu.run(started + duration) for vu in vus))
+        elapsed = time.monotonic() - started
+    return stats.summary(elapsed)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def uvicorn_server(db_url: str, workers: int):
+    """Run the app under uvicorn on a free local port; yields its base URL."""
+    port = _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        env={**os.environ, "DB_URL": db_url},
+    )
+    url = f"http://127.0.0.1:{port}"
+    try:
+        for _ in range(300):
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with {proc.returncode}")
+            try:
+                if httpx.get(f"{url}/healthz", timeout=1.0).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.1)
+        else:
+            raise RuntimeError("uvicorn did not become healthy in 30s")
+        yield url
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+async def _generate(db_url: str, scale: str, seed: int) -> None:
+    engine = create_async_engine(db_url)
+    started = time.perf_counter()
+    try:
+        counts = await generate(engine, SCALES[scale], seed=seed)
+    finally:
+        await engine.dispose()
+    print(f"dataset {scale} in {time.perf_counter() - started:.1f}s: " + " ".join(f"{k}={v}" for k, v in counts.items()))
+
+
+def report(summary: dict) -> None:
+    print(
+        f"{summary['seconds']}s  requests={summary['requests']} sessions={summary['sessions']}"
+        f"  throughput={summary['rps']} req/s  errors={summary['error_rate']:.2%}"
+    )
+    print(f"{'step':<16} {'count':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for step, s in summary["steps"].items():
+        print(f"{step:<16} {s['count']:7d} {s['errors']:6d} {s['p50_ms']:8.1f} {s['p95_ms']:8.1f} {s['p99_ms']:8.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--db", help="async URL of a database filled by benchmarks.dataset (default: generate a temporary SQLite one)")
+    parser.add_argument("--generate", action="store_true", help="fill --db with a fresh dataset first")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="tiny")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", help="target an already running server (using --db) instead of starting uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--think-ms", type=float, default=100.0, help="mean pause between a user's requests")
+    parser.add_argument("--json", help="write the summary to this file")
+    args = parser.parse_args()
+    if args.url and not args.db:
+        parser.error("--url needs --db (to pick users to log in as)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = args.db or f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        if args.generate or not args.db:
+            asyncio.run(_generate(db_url, args.scale, args.seed))
+        emails = asyncio.run(member_emails(db_url))
+        if args.url:
+            summary = asyncio.run(run_load(args.url, emails, args.users, args.duration, args.think_ms, args.seed))
+        else:
+            with uvicorn_server(db_url, args.workers) as url:
+                summary = asyncio.run(run_load(url, emails, args.users, args.duration, args.think_ms, args.seed))
+
+    report(summary)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
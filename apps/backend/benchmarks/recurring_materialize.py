@@ -0,0 +1,109 @@
+"""Benchmark: materialize_due_rules over a large backlog of due recurring rules.
+
+Builds a throwaway SQLite database with N due rules (spread over groups of
+4 members, 2-way splits), then times one full materialization pass.
+
+Usage (from apps/backend):
+    python -m benchmarks.recurring_materialize --rules 100000 --batch-size 500
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.db import base as _models  # noqa: F401  (register all tables)
+from app.db.models.expense import Expense
+from app.db.models.group import Group, GroupMember
+from app.db.models.recurring_rule import RecurringRule
+from app.db.models.user import User
+from app.db.session import Base
+from app.services.recurring_expenses import materialize_due_rules
+
+
+RULES_PER_GROUP = 10
+MEMBERS_PER_GROUP = 4
+
+
+async def _populate(db: AsyncSession, n_rules: int, today: date) -> None:
+    await db.execute(insert(User), [{"id": "bench-user", "email": "bench@example.com", "name": "Bench"}])
+    n_groups = max(1, n_rules // RULES_PER_GROUP)
+    await db.execute(
+        insert(Group),
+        [{"id": f"g{i}", "name": f"Group {i}", "currency": "INR", "created_by": "bench-user"} for i in range(n_groups)],
+    )
+    await db.execute(
+        insert(GroupMember),
+        [
+            {"id": i * MEMBERS_PER_GROUP + k + 1, "group_id": f"g{i}", "name": f"m{k}", "is_ghost": True}
+            for i in range(n_groups)
+            for k in range(MEMBERS_PER_GROUP)
+        ],
+    )
+    rows = []
+    for r in range(n_rules):
+        g = r % n_groups
+        a, b = g * MEMBERS_PER_GROUP + 1, g * MEMBERS_PER_GROUP + 2
+        rows.append({
+            "group_id": f"g{g}",
+            "paid_by_member_id": a,
+            "total_amount": 1000,
+            "currency": "INR",
+            "note": "Rent",
+            "splits_json": [
+                {"member_id": a, "share_amount": 500.0, "share_percentage": None},
+                {"member_id": b, "share_amount": 500.0, "share_percentage": None},
+            ],
+            "day_of_month": 1,
+            "next_run_at": today,
+            "is_active": True,
+            "created_by": "bench-user",
+        })
+    for i in range(0, len(rows), 10_000):
+        await db.execute(insert(RecurringRule), rows[i:i + 10_000])
+    await db.commit()
+
+
+async def run(n_rules: int, batch_size: int) -> None:
+    path = tempfile.mktemp(suffix=".db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        today = date(2026, 3, 1)
+
+        async with Session() as db:
+            await _populate(db, n_rules, today)
+
+        async with Session() as db:
+            t0 = time.perf_counter()
+            created = await materialize_due_rules(db, today=today, batch_size=batch_size)
+            elapsed = time.perf_counter() - t0
+            n_expenses = (await db.execute(select(func.count()).select_from(Expense))).scalar_one()
+
+        print(f"rules={n_rules} batch_size={batch_size}")
+        print(f"created={created} expenses_in_db={n_expenses}")
+        print(f"elapsed={elapsed:.2f}s  ({n_rules / elapsed:,.0f} rules/s)")
+    finally:
+        await engine.dispose()
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.rules, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark: response serialization of a large expense list.
+
+Times building and rendering the response body for a list of `--rows`
+expenses three ways:
+
+* before: ``response_model=list[dict]`` rendered by ``JSONResponse`` (the old route)
+* typed:  ``response_model=list[ExpenseListItem]`` with model instances, rendered
+  by ``ORJSONResponse`` through FastAPI's response-model validation
+* after:  the typed route returning ``ORJSONResponse(dicts)`` directly, which
+  skips re-validation (what list_expenses does now)
+
+No database or HTTP is involved, so only serialization is measured.
+
+Usage (from apps/backend):
+    python -m benchmarks.serialization --rows 10000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.api.v1.expenses import ExpenseListItem
+
+
+def rows(n: int) -> list[dict]:
+    start = datetime(2026, 1, 1, 12, 30, 15, 123456)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "total_amount": 1234.5 + i % 100,
+            "currency": "INR",
+            "note": "Dinner at the usual place",
+            "date": (start - timedelta(hours=i)).isoformat(),
+            "created_by": str(uuid.uuid4()),
+            "participant_member_ids": [1, 2, 3, 4],
+            "recurring_rule_id": None,
+        }
+        for i in range(n)
+    ]
+
+
+async def best_ms(build, repeat: int) -> tuple[float, int]:
+    best, size = float("inf"), 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = await build()
+        best = min(best, time.perf_counter() - started)
+        size = len(body)
+    return best * 1000, size
+
+
+async def _main(n: int, repeat: int) -> None:
+    data = rows(n)
+    untyped = create_model_field("response", list[dict])
+    typed = create_model_field("response", list[ExpenseListItem])
+
+    async def before() -> bytes:
+        content = [dict(r) for r in data]
+        return JSONResponse(await serialize_response(field=untyped, response_content=content)).body
+
+    async def typed_models() -> bytes:
+        content = [ExpenseListItem(**r) for r in data]
+        return ORJSONResponse(await serialize_response(field=typed, response_content=content)).body
+
+    async def after() -> bytes:
+        return ORJSONResponse([dict(r) for r in data]).body
+
+    print(f"rows={n} (best of {repeat}, including building the rows)")
+    results = {}
+    for name, build in (("before", before), ("typed", typed_models), ("after", after)):
+        results[name] = ms, size = await best_ms(build, repeat)
+        print(f"  {name:<7} {ms:8.1f} ms  {size} bytes")
+    print(f"  speedup {results['before'][0] / results['after'][0]:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(_main(args.rows, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
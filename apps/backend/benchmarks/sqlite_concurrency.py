@@ -0,0 +1,133 @@
+"""Benchmark: concurrent reads + writes on SQLite, default settings vs the tuned profile.
+
+Seeds a group with a few thousand expenses, then for `--seconds` runs
+`--readers` tasks aggregating the group's split totals alongside `--writers`
+tasks each inserting an expense (+ splits) per transaction. Each mode gets a
+fresh database file because journal_mode=WAL persists in the file.
+
+Usage (from apps/backend):
+    python -m benchmarks.sqlite_concurrency --readers 8 --writers 2 --seconds 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.db import base as _models  # noqa: F401  (register all tables)
+from app.db.models.expense import Expense, ExpenseSplit
+from app.db.models.group import Group, GroupMember
+from app.db.models.user import User
+from app.db.session import Base, install_sqlite_profile
+
+
+MEMBERS = 5
+
+
+def _expense_rows(n: int) -> tuple[list[dict], list[dict]]:
+    expenses, splits = [], []
+    for _ in range(n):
+        eid = str(uuid.uuid4())
+        expenses.append({
+            "id": eid, "group_id": "g", "paid_by_member_id": 1,
+            "total_amount": 100, "currency": "INR", "note": "bench",
+        })
+        splits.extend(
+            {"expense_id": eid, "member_id": m, "share_amount": 20} for m in range(1, MEMBERS + 1)
+        )
+    return expenses, splits
+
+
+async def _seed(Session: async_sessionmaker, n_expenses: int) -> None:
+    async with Session() as db:
+        await db.execute(insert(User), [{"id": "u", "email": "u@example.com", "name": "U"}])
+        await db.execute(insert(Group), [{"id": "g", "name": "G", "currency": "INR", "created_by": "u"}])
+        await db.execute(
+            insert(GroupMember),
+            [{"id": m, "group_id": "g", "name": f"m{m}", "is_ghost": True} for m in range(1, MEMBERS + 1)],
+        )
+        expenses, splits = _expense_rows(n_expenses)
+        await db.execute(insert(Expense), expenses)
+        await db.execute(insert(ExpenseSplit), splits)
+        await db.commit()
+
+
+async def _reader(Session: async_sessionmaker, deadline: float, stats: dict) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            async with Session() as db:
+                await db.execute(
+                    select(ExpenseSplit.member_id, func.sum(ExpenseSplit.share_amount))
+                    .join(Expense, Expense.id == ExpenseSplit.expense_id)
+                    .where(Expense.group_id == "g", Expense.deleted_at.is_(None))
+                    .group_by(ExpenseSplit.member_id)
+                )
+            stats["reads"] += 1
+        except Exception:
+            stats["errors"] += 1
+
+
+async def _writer(Session: async_sessionmaker, deadline: float, stats: dict) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            async with Session() as db:
+                expenses, splits = _expense_rows(1)
+                await db.execute(insert(Expense), expenses)
+                await db.execute(insert(ExpenseSplit), splits)
+                await db.commit()
+            stats["writes"] += 1
+        except Exception:
+            stats["errors"] += 1
+
+
+async def run_mode(tuned: bool, args: argparse.Namespace) -> dict:
+    path = tempfile.mktemp(suffix=".db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=AsyncAdaptedQueuePool, pool_size=args.readers + args.writers)
+    if tuned:
+        install_sqlite_profile(engine)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        await _seed(Session, args.expenses)
+
+        stats = {"reads": 0, "writes": 0, "errors": 0}
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *(_reader(Session, deadline, stats) for _ in range(args.readers)),
+            *(_writer(Session, deadline, stats) for _ in range(args.writers)),
+        )
+        return stats
+    finally:
+        await engine.dispose()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--expenses", type=int, default=5_000)
+    args = parser.parse_args()
+
+    print(f"readers={args.readers} writers={args.writers} seconds={args.seconds} expenses={args.expenses}")
+    for label, tuned in (("default", False), ("tuned", True)):
+        stats = asyncio.run(run_mode(tuned, args))
+        print(
+            f"{label:>8}: reads/s={stats['reads'] / args.seconds:8.1f} "
+            f"writes/s={stats['writes'] / args.seconds:8.1f} errors={stats['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
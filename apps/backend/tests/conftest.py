@@ -12,13 +12,14 @@ from sqlalchemy.pool import NullPool
 
 from app.main import app
 from app.core.deps import get_db
-from app.db.session import Base
+from app.db.session import Base, install_sqlite_profile
 from app.db.models.user import User
 from app.db.models.group import Group, GroupMember
 from app.db.models.expense import Expense, ExpenseSplit
 from app.db.models.activity import Activity
 from app.db.models.settlement import Settlement
 from app.db.models.recurring_rule import RecurringRule
+from app.db.models.scheduler_lease import SchedulerLease
 from app.core.security import hash_password
 
 
@@ -28,7 +29,9 @@ import os
 
 # Create a unique temp file for each test run
 TEST_DB_FILE = tempfile.mktemp(suffix=".db")
-TEST_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DB_FILE}"
+# Set TEST_DB_URL (e.g. postgresql+asyncpg://postgres@localhost/chillbill_test) to run
+# the suite against another backend; the database must exist and may be wiped.
+TEST_DATABASE_URL = os.getenv("TEST_DB_URL") or f"sqlite+aiosqlite:///{TEST_DB_FILE}"
 
 
 @pytest.fixture(scope="session")
@@ -47,15 +50,18 @@ def event_loop():
 async def db_session() -> AsyncGenerator[AsyncSession, None]:
     """Create a test database session with fresh schema for each test."""
     # Import all models to ensure they're registered with Base.metadata
-    _ = (User, Group, GroupMember, Expense, ExpenseSplit, Activity, Settlement, RecurringRule)
+    _ = (User, Group, GroupMember, Expense, ExpenseSplit, Activity, Settlement, RecurringRule, SchedulerLease)
     
     # Create engine for this test
     engine = create_async_engine(
         TEST_DATABASE_URL,
-        connect_args={"check_same_thread": False},
+        connect_args={"check_same_thread": False} if TEST_DATABASE_URL.startswith("sqlite") else {},
         poolclass=NullPool,
         echo=False,
     )
+    if engine.dialect.name == "sqlite":
+        # The production connection profile, so foreign keys are enforced as deployed.
+        install_sqlite_profile(engine)
     
     # Create all tables
     async with engine.begin() as conn:
@@ -0,0 +1,133 @@
+"""Tests for the group activity feed: writes, keyset pagination and the tail cache."""
+from datetime import datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.activity import Activity
+from app.db.models.group import Group, GroupMember
+from app.services.activity import ActivityTail, tail
+
+
+@pytest.fixture(autouse=True)
+def empty_tail():
+    # Test databases reuse group ids and revisions; never serve a page cached by another test.
+    tail.clear()
+    yield
+    tail.clear()
+
+
+async def add_expense(client: AsyncClient, token: str, group_id: str, members: list[GroupMember], note: str) -> str:
+    resp = await client.post(f"/api/v1/groups/{group_id}/expenses", headers={"Authorization": f"Bearer {token}"}, json={
+        "total_amount": 20, "currency": "INR", "note": note, "paid_by_member_id": members[0].id,
+        "splits": [{"member_id": members[0].id, "share_amount": 10},
+                   {"member_id": members[1].id, "share_amount": 10}],
+    })
+    assert resp.status_code == 200
+    return resp.json()["id"]
+
+
+class TestActivityWrites:
+    async def test_changes_append_entries_newest_first(
+        self, client: AsyncClient, auth_token: str, test_group_with_members: tuple[Group, list[GroupMember]]
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        expense_id = await add_expense(client, auth_token, group.id, members, "Dinner")
+        await client.post(f"/api/v1/groups/{group.id}/settlements", headers=headers, json={
+            "from_member_id": members[1].id, "to_member_id": members[0].id, "amount": 10,
+        })
+        await client.post(f"/api/v1/groups/{group.id}/members", headers=headers, json={"name": "Sam"})
+        await client.delete(f"/api/v1/groups/expenses/{expense_id}", headers=headers)
+
+        resp = await client.get(f"/api/v1/groups/{group.id}/activity", headers=headers)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert [i["type"] for i in page["items"]] == [
+            "expense_deleted", "member_added", "settlement_created", "expense_created",
+        ]
+        assert page["next_cursor"] is None
+        created = page["items"][-1]
+        assert created["payload"] == {"expense_id": expense_id, "amount": 20.0, "currency": "INR", "note": "Dinner"}
+        assert page["items"][1]["payload"]["name"] == "Sam"
+
+    async def test_members_only(self, client: AsyncClient, auth_token2: str, test_group: Group):
+        resp = await client.get(
+            f"/api/v1/groups/{test_group.id}/activity", headers={"Authorization": f"Bearer {auth_token2}"}
+        )
+        assert resp.status_code == 403
+
+
+class TestActivityPagination:
+    async def test_cursor_walks_every_entry_once(
+        self, client: AsyncClient, auth_token: str, db_session: AsyncSession, test_group: Group
+    ):
+        base = datetime(2026, 10, 1, 12, 0, 0)
+        # Pairs share a timestamp, so the id tiebreak decides their order.
+        db_session.add_all(
+            Activity(group_id=test_group.id, type="expense_created", payload={"n": i}, created_at=base + timedelta(minutes=i // 2))
+            for i in range(7)
+        )
+        await db_session.commit()
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 3} | ({"before": cursor} if cursor else {})
+            page = (await client.get(f"/api/v1/groups/{test_group.id}/activity", headers=headers, params=params)).json()
+            assert len(page["items"]) <= 3
+            seen.extend(page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert len({i["id"] for i in seen}) == len(seen) == 7
+        keys = [(i["created_at"], i["id"]) for i in seen]
+        assert keys == sorted(keys, reverse=True)
+
+    async def test_invalid_cursor(self, client: AsyncClient, auth_token: str, test_group: Group):
+        resp = await client.get(
+            f"/api/v1/groups/{test_group.id}/activity",
+            headers={"Authorization": f"Bearer {auth_token}"},
+            params={"before": "not-a-cursor"},
+        )
+        assert resp.status_code == 400
+
+
+class TestActivityTail:
+    async def test_first_page_cached_until_revision_moves(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        url = f"/api/v1/groups/{group.id}/activity"
+        await add_expense(client, auth_token, group.id, members, "First")
+        assert len((await client.get(url, headers=headers)).json()["items"]) == 1
+
+        # Written behind the API's back (no revision bump): the cached page is still served.
+        db_session.add(Activity(group_id=group.id, type="expense_created", payload={}))
+        await db_session.commit()
+        resp = await client.get(url, headers=headers, params={"limit": 1})
+        assert len(resp.json()["items"]) == 1
+        assert resp.json()["next_cursor"] is None
+
+        await add_expense(client, auth_token, group.id, members, "Second")
+        items = (await client.get(url, headers=headers)).json()["items"]
+        assert len(items) == 3
+        assert items[0]["payload"]["note"] == "Second"
+
+    def test_keeps_newest_revision_and_evicts_least_recent(self):
+        t = ActivityTail(groups=2, size=5)
+        t.put("g1", 2, [{"id": "new"}], None)
+        t.put("g1", 1, [{"id": "stale"}], None)  # e.g. a lagging replica
+        assert t.get("g1", 2) == ([{"id": "new"}], None)
+        assert t.get("g1", 1) is None
+        t.put("g2", 0, [], None)
+        t.get("g1", 2)
+        t.put("g3", 0, [], None)
+        assert t.get("g2", 0) is None
+        assert t.get("g1", 2) is not None
@@ -4,13 +4,18 @@ Integration tests for balances and settlements.
 Balance keys are always ``str(group_members.id)``. Both registered and
 ghost members are addressed the same way.
 """
+from datetime import datetime
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.db.models.group import Group, GroupMember
 from app.db.models.expense import Expense, ExpenseSplit
 from app.db.models.settlement import Settlement
+from app.services import balances as balances_service
+from app.services.balances import compute_currency_balances
 
 
 class TestBalances:
@@ -260,6 +265,316 @@ class TestBalances:
         assert abs(balances[str(members[0].id)] - 0.00) < 0.01
         assert abs(balances[str(ghost.id)] - 20.00) < 0.01  # still owed by member 1
 
+    async def test_balances_skip_deleted_and_sum_exact_cents(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        """Soft-deleted expenses are ignored; cent amounts add up without drift."""
+        group, members = test_group_with_members
+
+        for i in range(10):
+            expense = Expense(
+                group_id=group.id,
+                created_by=members[0].user_id,
+                paid_by_member_id=members[0].id,
+                total_amount=0.10,
+                currency=group.currency,
+                note=f"Tea {i}",
+            )
+            db_session.add(expense)
+            await db_session.flush()
+            db_session.add(ExpenseSplit(expense_id=expense.id, member_id=members[1].id, share_amount=0.10))
+
+        deleted = Expense(
+            group_id=group.id,
+            created_by=members[0].user_id,
+            paid_by_member_id=members[2].id,
+            total_amount=500.00,
+            currency=group.currency,
+            note="Deleted",
+            deleted_at=datetime.utcnow(),
+        )
+        db_session.add(deleted)
+        await db_session.flush()
+        db_session.add(ExpenseSplit(expense_id=deleted.id, member_id=members[0].id, share_amount=500.00))
+        await db_session.commit()
+
+        response = await client.get(
+            f"/api/v1/groups/{group.id}/balances",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == 200
+        balances = response.json()["balances"]
+        assert balances[str(members[0].id)] == 1.0
+        assert balances[str(members[1].id)] == -1.0
+        assert str(members[2].id) not in balances
+
+
+class TestMultiCurrencyBalances:
+    """Each currency balances on its own; FX rates fold them into the group's currency."""
+
+    @pytest.fixture
+    async def mixed(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        for currency, payer, total in (("INR", 0, 100), ("EUR", 1, 10)):
+            expense = Expense(
+                group_id=group.id, paid_by_member_id=members[payer].id, total_amount=total,
+                currency=currency, date=datetime(2026, 8, 2),
+            )
+            db_session.add(expense)
+            await db_session.flush()
+            for m in members[:2]:
+                db_session.add(ExpenseSplit(expense_id=expense.id, member_id=m.id, share_amount=total / 2))
+        await db_session.commit()
+        resp = await client.post(
+            f"/api/v1/groups/{group.id}/settlements",
+            headers={"Authorization": f"Bearer {auth_token}"},
+            json={"from_member_id": members[0].id, "to_member_id": members[1].id, "amount": 2, "currency": "eur"},
+        )
+        assert resp.json()["currency"] == "EUR"
+        return group, members
+
+    async def test_without_rates_currencies_stay_separate(self, client: AsyncClient, auth_token: str, mixed):
+        group, members = mixed
+        a, b = str(members[0].id), str(members[1].id)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        body = (await client.get(f"/api/v1/groups/{group.id}/balances", headers=headers)).json()
+        assert body["currency"] == "INR"
+        assert body["by_currency"] == {"EUR": {a: -3.0, b: 3.0}, "INR": {a: 50.0, b: -50.0}}
+        assert body["balances"] == {a: 50.0, b: -50.0}
+        assert body["unconverted"] == ["EUR"] and body["rates"] == {}
+
+        resp = await client.get(f"/api/v1/groups/{group.id}/settlements/suggestions", headers=headers)
+        assert resp.json() == [
+            {"from_member_id": members[1].id, "to_member_id": members[0].id, "amount": 50.0, "currency": "INR"},
+            {"from_member_id": members[0].id, "to_member_id": members[1].id, "amount": 3.0, "currency": "EUR"},
+        ]
+
+    async def test_currency_codes_are_case_insensitive(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        a, b = str(members[0].id), str(members[1].id)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        resp = await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers, json={
+            "total_amount": 10, "currency": "inr", "paid_by_member_id": members[0].id,
+            "splits": [{"member_id": members[0].id, "share_amount": 5}, {"member_id": members[1].id, "share_amount": 5}],
+        })
+        assert (await db_session.get(Expense, resp.json()["id"])).currency == "INR"
+        # A row stored lowercase before codes were normalized on write.
+        legacy = Expense(
+            group_id=group.id, paid_by_member_id=members[1].id, total_amount=4, currency="inr",
+            date=datetime(2026, 8, 2),
+        )
+        db_session.add(legacy)
+        await db_session.flush()
+        db_session.add(ExpenseSplit(expense_id=legacy.id, member_id=members[0].id, share_amount=4))
+        await db_session.commit()
+
+        body = (await client.get(f"/api/v1/groups/{group.id}/balances", headers=headers)).json()
+        assert body["by_currency"] == {"INR": {a: 1.0, b: -1.0}}
+        assert body["balances"] == {a: 1.0, b: -1.0}
+        assert body["unconverted"] == [] and body["rates"] == {}
+
+    async def test_converted_at_the_rate_of_the_day(
+        self, client: AsyncClient, auth_token: str, mixed, tmp_path, monkeypatch
+    ):
+        group, members = mixed
+        a, b = str(members[0].id), str(members[1].id)
+        rates = tmp_path / "rates.csv"
+        rates.write_text("date,currency,rate\n2026-08-01,INR,90\n")
+        monkeypatch.setattr(settings, "fx_rates_path", str(rates))
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        body = (await client.get(f"/api/v1/groups/{group.id}/balances", headers=headers)).json()
+        assert body["balances"] == {a: -220.0, b: 220.0}
+        assert body["rates"] == {"EUR": {"rate": 90.0, "date": "2026-08-01"}}
+        assert body["unconverted"] == []
+        resp = await client.get(f"/api/v1/groups/{group.id}/settlements/suggestions", headers=headers)
+        assert resp.json() == [
+            {"from_member_id": members[0].id, "to_member_id": members[1].id, "amount": 220.0, "currency": "INR"},
+        ]
+
+        # No rate yet on an earlier day.
+        body = (await client.get(f"/api/v1/groups/{group.id}/balances", headers=headers, params={"on": "2026-07-31"})).json()
+        assert body["unconverted"] == ["EUR"]
+
+
+class TestRollupBalances:
+    """Large groups read the expense side of balances from the monthly rollups."""
+
+    async def test_same_result_as_scanning_splits(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+        monkeypatch,
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        ids = []
+        for i, (payer, total) in enumerate(((0, 90.30), (1, 45.00), (2, 12.10), (0, 300.00))):
+            resp = await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers, json={
+                "total_amount": total, "currency": "USD" if i == 3 else "INR", "paid_by_member_id": members[payer].id,
+                "date": f"2026-0{i + 1}-15T10:00:00",
+                "splits": [{"member_id": m.id, "share_amount": round(total / 3, 2)} for m in members[:2]]
+                + [{"member_id": members[2].id, "share_amount": round(total - 2 * round(total / 3, 2), 2)}],
+            })
+            ids.append(resp.json()["id"])
+        await client.delete(f"/api/v1/groups/expenses/{ids[2]}", headers=headers)
+        await client.post(f"/api/v1/groups/{group.id}/settlements", headers=headers, json={
+            "from_member_id": members[1].id, "to_member_id": members[0].id, "amount": 20,
+        })
+
+        exact = await compute_currency_balances(db_session, group.id, use_rollups=False)
+        assert await compute_currency_balances(db_session, group.id, use_rollups=True) == exact
+
+        url = f"/api/v1/groups/{group.id}/balances"
+        scanned = (await client.get(url, headers=headers)).json()
+        monkeypatch.setattr(settings, "balances_rollup_min_expenses", 3)
+        assert (await client.get(url, headers=headers)).json() == scanned
+
+    async def test_vectorized_sums_are_exact(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        pytest.importorskip("numpy")
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        for i, total in enumerate((0.10, 0.20, 33.33, 1234567.89, 0.70)):
+            resp = await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers, json={
+                "total_amount": total, "currency": "USD" if i == 3 else "INR",
+                "paid_by_member_id": members[i % 3].id, "date": f"2026-0{i + 1}-15T10:00:00",
+                "splits": [{"member_id": members[0].id, "share_amount": round(total - round(total / 2, 2), 2)},
+                           {"member_id": members[1].id, "share_amount": round(total / 2, 2)}],
+            })
+            assert resp.status_code == 200, resp.text
+
+        for use_rollups, as_of in ((False, None), (False, datetime(2026, 3, 20)), (True, datetime(2026, 3, 20))):
+            exact = await compute_currency_balances(db_session, group.id, use_rollups, as_of, vectorized=False)
+            assert await compute_currency_balances(db_session, group.id, use_rollups, as_of, vectorized=True) == exact
+        # A member whose splits cancel their payments still appears, at 0, as with GROUP BY.
+        assert members[2].id in exact["INR"]
+
+    async def test_vectorized_only_when_enabled(
+        self, db_session: AsyncSession, test_group_with_members: tuple[Group, list[GroupMember]], monkeypatch
+    ):
+        pytest.importorskip("numpy")
+        group, _ = test_group_with_members
+        calls = []
+
+        async def spy(db, balances, where):
+            calls.append(where)
+
+        monkeypatch.setattr(balances_service, "_add_expenses_vectorized", spy)
+        monkeypatch.setattr(settings, "balances_rollup_min_expenses", 0)
+        await compute_currency_balances(db_session, group.id, as_of=datetime(2026, 3, 20))
+        assert calls == []
+        monkeypatch.setattr(settings, "balances_vectorized", True)
+        await compute_currency_balances(db_session, group.id, as_of=datetime(2026, 3, 20))
+        assert len(calls) == 2  # the replayed month, and expenses deleted since
+
+
+class TestBalancesAsOf:
+    """GET /balances?as_of= replays history up to a moment."""
+
+    @pytest.mark.parametrize("rollup_min_expenses", [1, 1_000_000])
+    async def test_balances_at_past_moments(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+        monkeypatch,
+        rollup_min_expenses: int,
+    ):
+        """Same answers whether earlier months come from rollup checkpoints or a full scan."""
+        monkeypatch.setattr(settings, "balances_rollup_min_expenses", rollup_min_expenses)
+        group, members = test_group_with_members
+        a, b = str(members[0].id), str(members[1].id)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        for day, payer, total in (("01-10", 0, 100), ("02-20", 0, 100), ("03-05", 0, 100), ("03-20", 1, 40)):
+            await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers, json={
+                "total_amount": total, "currency": "INR", "paid_by_member_id": members[payer].id,
+                "date": f"2026-{day}T10:00:00",
+                "splits": [{"member_id": m.id, "share_amount": total / 2} for m in members[:2]],
+            })
+        # Recorded now, i.e. after every as_of below except the last.
+        await client.post(f"/api/v1/groups/{group.id}/settlements", headers=headers, json={
+            "from_member_id": members[1].id, "to_member_id": members[0].id, "amount": 30,
+        })
+
+        async def balances(as_of: str) -> dict:
+            resp = await client.get(f"/api/v1/groups/{group.id}/balances", headers=headers, params={"as_of": as_of})
+            assert resp.status_code == 200
+            return resp.json()["balances"]
+
+        assert await balances("2025-12-31T00:00:00") == {}
+        assert await balances("2026-02-28T23:59:59") == {a: 100.0, b: -100.0}
+        assert await balances("2026-03-05T10:00:00") == {a: 150.0, b: -150.0}
+        # 09:30 UTC, before that morning's expense.
+        assert await balances("2026-03-05T15:00:00+05:30") == {a: 100.0, b: -100.0}
+        assert await balances("2026-03-31T00:00:00") == {a: 130.0, b: -130.0}
+        now = (await client.get(f"/api/v1/groups/{group.id}/balances", headers=headers)).json()["balances"]
+        assert await balances("2100-01-01T00:00:00") == now == {a: 100.0, b: -100.0}
+
+    @pytest.mark.parametrize("rollup_min_expenses", [1, 1_000_000])
+    async def test_expenses_deleted_later_still_count(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+        monkeypatch,
+        rollup_min_expenses: int,
+    ):
+        """An expense counts in every answer between its date and its deletion."""
+        monkeypatch.setattr(settings, "balances_rollup_min_expenses", rollup_min_expenses)
+        group, members = test_group_with_members
+        a, b = str(members[0].id), str(members[1].id)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        ids = []
+        for day, total in (("01-10", 100), ("03-01", 40), ("03-02", 20)):
+            resp = await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers, json={
+                "total_amount": total, "currency": "INR", "paid_by_member_id": members[0].id,
+                "date": f"2026-{day}T10:00:00",
+                "splits": [{"member_id": m.id, "share_amount": total / 2} for m in members[:2]],
+            })
+            ids.append(resp.json()["id"])
+        # Deleted now (January's, a rollup month, and March's, the replayed one)...
+        for expense_id in ids[:2]:
+            await client.delete(f"/api/v1/groups/expenses/{expense_id}", headers=headers)
+        # ...and one deleted back on March 10th.
+        await client.delete(f"/api/v1/groups/expenses/{ids[2]}", headers=headers)
+        (await db_session.get(Expense, ids[2])).deleted_at = datetime(2026, 3, 10)
+        await db_session.commit()
+
+        async def balances(as_of: str) -> dict:
+            resp = await client.get(f"/api/v1/groups/{group.id}/balances", headers=headers, params={"as_of": as_of})
+            return resp.json()["balances"]
+
+        assert await balances("2026-02-01T00:00:00") == {a: 50.0, b: -50.0}
+        assert await balances("2026-03-05T00:00:00") == {a: 80.0, b: -80.0}
+        assert await balances("2026-03-20T00:00:00") == {a: 70.0, b: -70.0}
+        assert (await client.get(f"/api/v1/groups/{group.id}/balances", headers=headers)).json()["balances"] == {}
+
 
 class TestSettlements:
     """Settlement suggestions and validation."""
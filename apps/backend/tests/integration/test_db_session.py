@@ -0,0 +1,103 @@
+"""Tests for engine/session configuration in app.db.session."""
+import asyncio
+import os
+import tempfile
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import Settings
+from app.db.pool import MeteredQueuePool, engine_options, pool_status
+from app.db.session import install_sqlite_profile, sqlite_pragmas
+
+
+class TestSqliteProfile:
+    def test_pragmas_follow_settings(self):
+        cfg = Settings(sqlite_journal_mode="WAL", sqlite_cache_size_kib=1024, sqlite_foreign_keys=False)
+        pragmas = sqlite_pragmas(cfg)
+        assert "PRAGMA journal_mode=WAL" in pragmas
+        assert "PRAGMA cache_size=-1024" in pragmas
+        assert "PRAGMA foreign_keys=OFF" in pragmas
+
+    async def test_profile_applied_on_connect(self):
+        path = tempfile.mktemp(suffix=".db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+        install_sqlite_profile(engine, Settings(sqlite_busy_timeout_ms=1234))
+        try:
+            async with engine.connect() as conn:
+                assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+                assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+                assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 1234
+                assert (await conn.execute(text("PRAGMA foreign_keys"))).scalar() == 1
+                assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2  # MEMORY
+        finally:
+            await engine.dispose()
+            for suffix in ("", "-wal", "-shm"):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+
+class TestPoolTelemetry:
+    def test_engine_options_follow_settings(self):
+        cfg = Settings(db_pool_size=3, db_max_overflow=0, db_pool_pre_ping=True)
+        opts = engine_options("sqlite+aiosqlite:///./x.db", cfg)
+        assert opts["poolclass"] is MeteredQueuePool
+        assert opts["pool_size"] == 3
+        assert opts["max_overflow"] == 0
+        assert opts["pool_pre_ping"] is True
+        assert engine_options("sqlite+aiosqlite://", cfg) == {}
+        assert engine_options("sqlite+aiosqlite:///:memory:", cfg) == {}
+
+    async def test_checkouts_waits_and_timeouts_are_recorded(self):
+        path = tempfile.mktemp(suffix=".db")
+        cfg = Settings(db_pool_size=1, db_max_overflow=0, db_pool_timeout_seconds=0.05)
+        url = f"sqlite+aiosqlite:///{path}"
+        engine = create_async_engine(url, **engine_options(url, cfg))
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                assert pool_status(engine)["checked_out"] == 1
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+            status = pool_status(engine)
+            assert status["size"] == 1
+            assert status["checked_out"] == 0
+            assert status["checkouts"] == 1
+            assert status["errors"] == 1
+            # Both attempts are timed; the failed one waited out the pool timeout.
+            assert status["wait_seconds"]["count"] == 2
+            assert status["wait_seconds"]["sum"] >= 0.05
+            assert status["wait_seconds"]["buckets"]["+Inf"] == 2
+        finally:
+            await engine.dispose()
+            if os.path.exists(path):
+                os.remove(path)
+
+    async def test_pool_status_reports_concurrent_checkouts(self):
+        path = tempfile.mktemp(suffix=".db")
+        url = f"sqlite+aiosqlite:///{path}"
+        engine = create_async_engine(url, **engine_options(url, Settings(db_pool_size=2)))
+        gate = asyncio.Event()
+        seen = []
+
+        async def hold():
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                seen.append(pool_status(engine)["checked_out"])
+                await gate.wait()
+
+        try:
+            tasks = [asyncio.create_task(hold()) for _ in range(2)]
+            while len(seen) < 2:
+                await asyncio.sleep(0.01)
+            assert pool_status(engine)["checked_out"] == 2
+            gate.set()
+            await asyncio.gather(*tasks)
+            assert pool_status(engine)["checked_out"] == 0
+        finally:
+            await engine.dispose()
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,126 @@
+"""Tests for full-text search over expense notes."""
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.expense import Expense
+from app.db.models.group import Group, GroupMember
+from app.services.expense_search import rebuild_search_index, search_expenses, search_terms
+from tests.conftest import TEST_DATABASE_URL
+
+
+async def add(client: AsyncClient, headers: dict, group_id: str, members: list[GroupMember], note: str) -> str:
+    resp = await client.post(f"/api/v1/groups/{group_id}/expenses", headers=headers, json={
+        "total_amount": 10, "currency": "INR", "note": note, "paid_by_member_id": members[0].id,
+        "splits": [{"member_id": members[0].id, "share_amount": 5}, {"member_id": members[1].id, "share_amount": 5}],
+    })
+    assert resp.status_code == 200
+    return resp.json()["id"]
+
+
+class TestExpenseSearch:
+    async def test_prefix_words_ranked_and_kept_in_sync(
+        self, client: AsyncClient, auth_token: str, test_group_with_members: tuple[Group, list[GroupMember]]
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        url = f"/api/v1/groups/{group.id}/expenses/search"
+        hotel = await add(client, headers, group.id, members, "Goa hotel booking")
+        shack = await add(client, headers, group.id, members, "Dinner at a Goa beach shack")
+        await add(client, headers, group.id, members, "Hotel in Mumbai")
+        await add(client, headers, group.id, members, "Taxi")
+
+        resp = await client.get(url, headers=headers, params={"q": "goa hot"})
+        assert resp.status_code == 200
+        assert [i["id"] for i in resp.json()["items"]] == [hotel]
+        assert resp.json()["items"][0]["participant_member_ids"] == [members[0].id, members[1].id]
+        # Shorter notes rank higher for the same term.
+        ids = [i["id"] for i in (await client.get(url, headers=headers, params={"q": "GOA"})).json()["items"]]
+        assert ids == [hotel, shack]
+
+        # Edits and deletes are reflected.
+        await client.put(f"/api/v1/groups/expenses/{shack}", headers=headers, json={
+            "total_amount": 10, "currency": "INR", "note": "Beach shack, Gokarna", "paid_by_member_id": members[0].id,
+            "splits": [{"member_id": members[0].id, "share_amount": 10}],
+        })
+        await client.delete(f"/api/v1/groups/expenses/{hotel}", headers=headers)
+        assert (await client.get(url, headers=headers, params={"q": "goa"})).json()["items"] == []
+        items = (await client.get(url, headers=headers, params={"q": "gokarna"})).json()["items"]
+        assert [i["id"] for i in items] == [shack]
+
+    async def test_paginates(
+        self, client: AsyncClient, auth_token: str, test_group_with_members: tuple[Group, list[GroupMember]]
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        for i in range(3):
+            await add(client, headers, group.id, members, f"Cab ride {i}")
+        url = f"/api/v1/groups/{group.id}/expenses/search"
+        first = (await client.get(url, headers=headers, params={"q": "cab", "limit": 2})).json()
+        assert len(first["items"]) == 2 and first["next_offset"] == 2
+        second = (await client.get(url, headers=headers, params={"q": "cab", "limit": 2, "offset": 2})).json()
+        assert len(second["items"]) == 1 and second["next_offset"] is None
+        assert not {i["id"] for i in first["items"]} & {i["id"] for i in second["items"]}
+
+    async def test_scoped_to_group_and_members(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        auth_token2: str,
+        db_session: AsyncSession,
+        test_group: Group,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        await add(client, {"Authorization": f"Bearer {auth_token}"}, group.id, members, "Groceries")
+        assert await search_expenses(db_session, test_group.id, "groceries", 10) == []
+        resp = await client.get(
+            f"/api/v1/groups/{test_group.id}/expenses/search",
+            headers={"Authorization": f"Bearer {auth_token2}"}, params={"q": "groceries"},
+        )
+        assert resp.status_code == 403
+
+    async def test_bulk_inserts_are_indexed_and_rebuild_is_idempotent(
+        self, db_session: AsyncSession, test_group_with_members: tuple[Group, list[GroupMember]]
+    ):
+        group, members = test_group_with_members
+        await db_session.execute(insert(Expense), [{
+            "id": "bulk-1", "group_id": group.id, "paid_by_member_id": members[0].id,
+            "total_amount": 5, "currency": "INR", "note": "Netflix (recurring)",
+        }])
+        await db_session.commit()
+        assert [e.id for e in await search_expenses(db_session, group.id, "netflix", 10)] == ["bulk-1"]
+        await rebuild_search_index(db_session)
+        await db_session.commit()
+        assert [e.id for e in await search_expenses(db_session, group.id, "netflix", 10)] == ["bulk-1"]
+
+    @pytest.mark.skipif(not TEST_DATABASE_URL.startswith("sqlite"), reason="SQLite FTS5 index only")
+    async def test_hits_survive_renumbered_rowids(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        taxi = await add(client, headers, group.id, members, "Airport taxi")
+        lunch = await add(client, headers, group.id, members, "Team lunch")
+        # What VACUUM may do to a table without an INTEGER PRIMARY KEY: swap the two rowids.
+        await db_session.execute(text(
+            "UPDATE expenses SET rowid = CASE id WHEN :a THEN -2 ELSE -1 END WHERE id IN (:a, :b)"
+        ), {"a": taxi, "b": lunch})
+        await db_session.execute(text(
+            "UPDATE expenses SET rowid = CASE rowid WHEN -1 THEN 1 ELSE 2 END WHERE rowid < 0"
+        ))
+        await db_session.commit()
+        assert [e.id for e in await search_expenses(db_session, group.id, "taxi", 10)] == [taxi]
+
+        await client.delete(f"/api/v1/groups/expenses/{taxi}", headers=headers)
+        assert await search_expenses(db_session, group.id, "taxi", 10) == []
+        assert [e.id for e in await search_expenses(db_session, group.id, "lunch", 10)] == [lunch]
+
+    def test_query_words(self):
+        assert search_terms('"Goa" hotel*, AND -beach_shack') == ["goa", "hotel", "and", "beach", "shack"]
+        assert search_terms("!!!") == []
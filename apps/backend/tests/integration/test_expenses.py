@@ -2,10 +2,16 @@
 Integration tests for expenses endpoints.
 """
 import pytest
-from datetime import datetime
+from datetime import date, datetime
 from httpx import AsyncClient
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.v1 import expenses as expenses_api
+from app.api.v1.expenses import ExpenseListItem
+from app.api.v1.settlements import SettlementOut
+from app.db.models.recurring_rule import RecurringRule
+from app.db.models.settlement import Settlement
 from app.db.models.user import User
 from app.db.models.group import Group, GroupMember
 from app.db.models.expense import Expense, ExpenseSplit
@@ -41,9 +47,179 @@ class TestExpensesList:
             headers={"Authorization": f"Bearer {auth_token2}"},
         )
         
-        # API returns 200 with empty list (no permission check on list endpoint)
-        assert response.status_code == 200
-        assert len(response.json()) == 0
+        assert response.status_code == 403
+
+
+    async def test_long_list_is_compressed(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        """Lists above COMPRESSION_MIN_BYTES are gzip-encoded for clients that accept it."""
+        group, members = test_group_with_members
+        db_session.add_all([
+            Expense(group_id=group.id, created_by=members[0].user_id, paid_by_member_id=members[0].id,
+                    total_amount=10 + i, currency=group.currency, note=f"Groceries {i}")
+            for i in range(30)
+        ])
+        await db_session.commit()
+
+        response = await client.get(
+            f"/api/v1/groups/{group.id}/expenses",
+            headers={"Authorization": f"Bearer {auth_token}", "Accept-Encoding": "gzip"},
+        )
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert len(response.json()) == 30
+
+    async def test_filters_combine_in_sql(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        """Date window, payer, participant, amount and recurring filters."""
+        group, members = test_group_with_members
+        rule = RecurringRule(
+            group_id=group.id, paid_by_member_id=members[0].id, total_amount=55, currency="INR",
+            splits_json=[], day_of_month=9, next_run_at=date(2026, 9, 9), created_by=members[0].user_id,
+        )
+        db_session.add(rule)
+        await db_session.flush()
+        rows = [
+            # (id, payer, participants, amount, day, recurring rule)
+            ("e1", 0, (0, 1), 100, 1, None),
+            ("e2", 1, (1,), 20, 5, None),
+            ("e3", 0, (0, 2), 55, 9, rule.id),
+            ("e4", 2, (0, 1, 2), 300, 12, None),
+        ]
+        for eid, payer, participants, amount, day, rule_id in rows:
+            db_session.add(Expense(
+                id=eid, group_id=group.id, paid_by_member_id=members[payer].id, total_amount=amount,
+                currency="INR", date=datetime(2026, 8, day), recurring_rule_id=rule_id,
+            ))
+            await db_session.flush()
+            for m in participants:
+                db_session.add(ExpenseSplit(expense_id=eid, member_id=members[m].id, share_amount=amount / len(participants)))
+        await db_session.commit()
+
+        async def ids(**params) -> list[str]:
+            resp = await client.get(
+                f"/api/v1/groups/{group.id}/expenses", headers={"Authorization": f"Bearer {auth_token}"}, params=params
+            )
+            assert resp.status_code == 200
+            return [e["id"] for e in resp.json()]
+
+        assert await ids() == ["e4", "e3", "e2", "e1"]
+        assert await ids(start="2026-08-05T00:00:00", end="2026-08-12T00:00:00") == ["e3", "e2"]
+        assert await ids(start="2026-08-05T05:30:00+05:30") == ["e4", "e3", "e2"]
+        assert await ids(paid_by_member_id=members[0].id) == ["e3", "e1"]
+        assert await ids(member_id=members[2].id) == ["e4", "e3"]
+        assert await ids(min_amount="50", max_amount="100") == ["e3", "e1"]
+        assert await ids(recurring="true") == ["e3"]
+        assert await ids(recurring="false", member_id=members[1].id, max_amount="200") == ["e2", "e1"]
+        assert await ids(recurring_rule_id=rule.id) == ["e3"]
+
+    async def test_keyset_pages(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        """`limit` pages newest first; X-Next-Cursor continues from the last row, ties broken by id."""
+        group, members = test_group_with_members
+        for i in range(5):
+            db_session.add(Expense(
+                id=f"p{i}", group_id=group.id, paid_by_member_id=members[0].id, total_amount=10 + i,
+                currency="INR", date=datetime(2026, 8, 1 + i // 2),
+            ))
+        await db_session.commit()
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        url = f"/api/v1/groups/{group.id}/expenses"
+
+        seen, before = [], None
+        while True:
+            params = {"limit": 2} | ({"before": before} if before else {})
+            resp = await client.get(url, headers=headers, params=params)
+            seen.append([e["id"] for e in resp.json()])
+            before = resp.headers.get("X-Next-Cursor")
+            if before is None:
+                break
+        assert seen == [["p4", "p3"], ["p2", "p1"], ["p0"]]
+        assert (await client.get(url, headers=headers, params={"before": "not-a-cursor"})).status_code == 400
+
+    async def test_unpaginated_list_loads_splits_in_batches(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+        monkeypatch,
+    ):
+        """Splits are loaded a batch of expense ids at a time, so a long list stays under the bind limit."""
+        monkeypatch.setattr(expenses_api, "SPLITS_BATCH", 2)
+        group, members = test_group_with_members
+        for i in range(5):
+            db_session.add(Expense(
+                id=f"b{i}", group_id=group.id, paid_by_member_id=members[0].id, total_amount=10,
+                currency="INR", date=datetime(2026, 8, 1 + i),
+            ))
+            await db_session.flush()
+            for m in members[: 1 + i % 3]:
+                db_session.add(ExpenseSplit(expense_id=f"b{i}", member_id=m.id, share_amount=1))
+        await db_session.commit()
+
+        resp = await client.get(f"/api/v1/groups/{group.id}/expenses", headers={"Authorization": f"Bearer {auth_token}"})
+        assert [(e["id"], len(e["participant_member_ids"])) for e in resp.json()] == [
+            ("b4", 2), ("b3", 1), ("b2", 3), ("b1", 2), ("b0", 1),
+        ]
+
+
+class TestResponseModels:
+    """The list routes render with orjson directly; their output must still match the declared models."""
+
+    async def test_direct_lists_match_their_response_models(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        expense = Expense(
+            group_id=group.id, created_by=members[0].user_id, paid_by_member_id=members[0].id,
+            total_amount=30.10, currency=group.currency, note=None,
+        )
+        db_session.add(expense)
+        await db_session.flush()
+        db_session.add(ExpenseSplit(expense_id=expense.id, member_id=members[1].id, share_amount=30.10))
+        db_session.add(Settlement(
+            group_id=group.id, from_member_id=members[1].id, to_member_id=members[0].id,
+            amount=10, currency=group.currency, status="success",
+        ))
+        await db_session.commit()
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        resp = await client.get(f"/api/v1/groups/{group.id}/expenses", headers=headers)
+        assert resp.headers["content-type"] == "application/json"
+        items = TypeAdapter(list[ExpenseListItem]).validate_python(resp.json(), strict=True)
+        assert items[0].total_amount == 30.10
+        assert items[0].participant_member_ids == [members[1].id]
+        assert set(resp.json()[0]) == set(ExpenseListItem.model_fields)
+
+        resp = await client.get(f"/api/v1/groups/{group.id}/settlements", headers=headers)
+        TypeAdapter(list[SettlementOut]).validate_python(resp.json(), strict=True)
+        assert set(resp.json()[0]) == set(SettlementOut.model_fields)
+
+    async def test_openapi_documents_typed_responses(self, client: AsyncClient):
+        schemas = (await client.get("/openapi.json")).json()["components"]["schemas"]
+        for name in ("ExpenseListItem", "ExpenseOut", "GroupDetail", "BalancesOut", "Transfer", "SettlementOut"):
+            assert name in schemas
 
 
 class TestExpensesCreate:
@@ -0,0 +1,164 @@
+"""Tests for group revisions, change events and the SSE stream."""
+import asyncio
+import json
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.events import _stream_user, group_events
+from app.core.events import EventHub, PostgresBroker, _asyncpg_dsn, hub
+from app.core.security import create_stream_token
+from app.db.models.group import Group, GroupMember
+from app.db.models.user import User
+from app.services.group_events import queue_group_event
+from tests.conftest import TEST_DATABASE_URL
+
+
+def parse_sse(chunk: str) -> dict:
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return json.loads(fields["data"])
+
+
+class TestEventHub:
+    def test_overflow_replaces_backlog_with_resync(self):
+        h = EventHub(queue_size=2)
+        q = h.subscribe("g")
+        for i in range(3):
+            h.deliver({"type": "expense.created", "group_id": "g", "revision": i})
+        assert q.qsize() == 1
+        assert q.get_nowait() == {"type": "resync", "group_id": "g"}
+
+    def test_only_subscribers_of_the_group_receive(self):
+        h = EventHub()
+        q = h.subscribe("g1")
+        h.deliver({"type": "expense.created", "group_id": "g2", "revision": 1})
+        assert q.empty()
+        h.unsubscribe("g1", q)
+        assert h.subscriber_count() == 0
+
+
+class TestRevisions:
+    async def test_change_bumps_revision_and_publishes_after_commit(
+        self, client: AsyncClient, auth_token: str, test_group_with_members: tuple[Group, list[GroupMember]]
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        queue = hub.subscribe(group.id)
+        try:
+            resp = await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers, json={
+                "total_amount": 20, "currency": "INR", "paid_by_member_id": members[0].id,
+                "splits": [{"member_id": members[0].id, "share_amount": 10},
+                           {"member_id": members[1].id, "share_amount": 10}],
+            })
+            assert resp.status_code == 200
+            event = queue.get_nowait()
+        finally:
+            hub.unsubscribe(group.id, queue)
+        assert event == {
+            "type": "expense.created", "group_id": group.id, "revision": 1, "expense_id": resp.json()["id"],
+        }
+        detail = await client.get(f"/api/v1/groups/{group.id}", headers=headers)
+        assert detail.json()["revision"] == 1
+
+    async def test_rolled_back_change_publishes_nothing(self, db_session: AsyncSession, test_group: Group):
+        group_id = test_group.id
+        queue = hub.subscribe(group_id)
+        try:
+            assert await queue_group_event(db_session, group_id, "expense.created") == 1
+            await db_session.rollback()
+            await db_session.commit()
+            assert queue.empty()
+        finally:
+            hub.unsubscribe(group_id, queue)
+        assert (await db_session.get(Group, group_id)).revision == 0
+
+
+class TestEventStream:
+    async def test_hello_then_changes_until_removed(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_user2: User,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        # httpx's ASGI transport buffers whole responses, so read the stream directly.
+        response = await group_events(group.id, current_user=test_user2, db=db_session)
+        assert response.media_type == "text/event-stream"
+        stream = response.body_iterator
+        hello = parse_sse(await stream.__anext__())
+        assert hello == {"type": "hello", "group_id": group.id, "revision": 0}
+
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        await client.post(f"/api/v1/groups/{group.id}/settlements", headers=headers, json={
+            "from_member_id": members[1].id, "to_member_id": members[0].id, "amount": 5,
+        })
+        event = parse_sse(await asyncio.wait_for(stream.__anext__(), 1))
+        assert (event["type"], event["revision"]) == ("settlement.created", 1)
+
+        await client.delete(f"/api/v1/groups/{group.id}/members/{members[1].id}", headers=headers)
+        event = parse_sse(await asyncio.wait_for(stream.__anext__(), 1))
+        assert event["type"] == "member.removed"
+        with pytest.raises(StopAsyncIteration):  # removed members stop receiving
+            await stream.__anext__()
+        assert hub.subscriber_count() == 0
+
+    async def test_requires_membership(self, client: AsyncClient, auth_token2: str, test_group: Group):
+        headers = {"Authorization": f"Bearer {auth_token2}"}
+        resp = await client.get(f"/api/v1/groups/{test_group.id}/events", headers=headers)
+        assert resp.status_code == 403
+        resp = await client.post(f"/api/v1/groups/{test_group.id}/events/token", headers=headers)
+        assert resp.status_code == 403
+        resp = await client.get(f"/api/v1/groups/{test_group.id}/events")
+        assert resp.status_code == 401
+        assert hub.subscriber_count() == 0
+
+    async def test_stream_token_opens_only_its_group(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_user: User,
+        test_group: Group,
+    ):
+        # EventSource cannot send headers, so it connects with a short-lived ?token=.
+        resp = await client.post(
+            f"/api/v1/groups/{test_group.id}/events/token", headers={"Authorization": f"Bearer {auth_token}"}
+        )
+        assert resp.status_code == 200
+        token = resp.json()["token"]
+        user = await _stream_user(test_group.id, token=token, credentials=None, db=db_session)
+        assert user.id == test_user.id
+
+        rejected = [
+            ("other-group", token),
+            (test_group.id, auth_token),  # the access token never works in the URL
+            (test_group.id, create_stream_token(test_user.id, test_group.id, -1)),
+        ]
+        for group_id, bad in rejected:
+            with pytest.raises(HTTPException) as exc:
+                await _stream_user(group_id, token=bad, credentials=None, db=db_session)
+            assert exc.value.status_code == 401
+        resp = await client.get(f"/api/v1/groups/{test_group.id}/events?access_token={auth_token}")
+        assert resp.status_code == 401
+
+
+@pytest.mark.skipif(not TEST_DATABASE_URL.startswith("postgresql"), reason="needs TEST_DB_URL=postgresql+asyncpg://...")
+class TestPostgresBroker:
+    async def test_notify_reaches_every_workers_hub(self):
+        hubs = [EventHub(), EventHub()]
+        brokers = [PostgresBroker(h, _asyncpg_dsn(TEST_DATABASE_URL)) for h in hubs]
+        queues = [h.subscribe("g") for h in hubs]
+        for broker in brokers:
+            await broker.start()
+        try:
+            brokers[0].publish({"type": "expense.created", "group_id": "g", "revision": 3})
+            for queue in queues:
+                event = await asyncio.wait_for(queue.get(), 5)
+                assert event["revision"] == 3
+        finally:
+            for broker in brokers:
+                await broker.stop()
@@ -240,3 +240,38 @@ class TestGroupsRemoveMember:
         # API returns 204 for idempotent delete operations
         assert response.status_code == 204
 
+
+    async def test_leaving_keeps_everyone_elses_balances(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        auth_token2: str,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        """A payer who removes themselves becomes a ghost; their expenses and settlements stay."""
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        resp = await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers, json={
+            "total_amount": 90, "currency": "INR", "note": "Dinner", "paid_by_member_id": members[1].id,
+            "splits": [{"member_id": m.id, "share_amount": 30} for m in members],
+        })
+        assert resp.status_code == 200
+        await client.post(f"/api/v1/groups/{group.id}/settlements", headers=headers, json={
+            "from_member_id": members[2].id, "to_member_id": members[1].id, "amount": 10,
+        })
+        url = f"/api/v1/groups/{group.id}/balances"
+        before = (await client.get(url, headers=headers)).json()["balances"]
+
+        response = await client.delete(
+            f"/api/v1/groups/{group.id}/members/{members[1].id}",
+            headers={"Authorization": f"Bearer {auth_token2}"},
+        )
+        assert response.status_code == 204
+
+        assert (await client.get(url, headers=headers)).json()["balances"] == before
+        assert len((await client.get(f"/api/v1/groups/{group.id}/expenses", headers=headers)).json()) == 1
+        body = (await client.get(f"/api/v1/groups/{group.id}", headers=headers)).json()
+        left = next(m for m in body["members"] if m["member_id"] == members[1].id)
+        assert left["is_ghost"] is True and left["user_id"] is None and left["name"]
+        resp = await client.get(f"/api/v1/groups/{group.id}/expenses", headers={"Authorization": f"Bearer {auth_token2}"})
+        assert resp.status_code == 403
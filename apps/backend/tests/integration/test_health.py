@@ -0,0 +1,90 @@
+"""Tests for liveness/readiness endpoints and the background startup catch-up."""
+import asyncio
+
+from httpx import AsyncClient
+
+from app.services import recurring_scheduler
+
+
+class TestHealthEndpoints:
+    async def test_healthz(self, client: AsyncClient):
+        resp = await client.get("/healthz")
+        assert resp.status_code == 200
+        assert resp.json() == {"status": "ok"}
+
+    async def test_readyz_reports_catchup_state(self, client: AsyncClient):
+        resp = await client.get("/readyz")
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["status"] == "ready"
+        assert body["recurring_catchup"]["status"] in ("pending", "running", "done", "failed")
+
+
+class TestBackgroundCatchup:
+    async def test_startup_catchup_does_not_block(self, monkeypatch):
+        release = asyncio.Event()
+
+        async def slow_run_once(progress=None):
+            progress["shards_total"] = 1
+            await release.wait()
+            progress["shards_done"] = 1
+            progress["materialized"] = 7
+            return 7
+
+        monkeypatch.setattr(recurring_scheduler, "_run_once", slow_run_once)
+
+        task = recurring_scheduler.start_startup_catchup()
+        await asyncio.sleep(0)
+        status = recurring_scheduler.catchup_status()
+        assert status["status"] == "running"
+        assert status["finished_at"] is None
+
+        release.set()
+        await task
+        status = recurring_scheduler.catchup_status()
+        assert status["status"] == "done"
+        assert status["materialized"] == 7
+        assert status["finished_at"] is not None
+
+    async def test_progress_reports_capped_rules(self, monkeypatch):
+        async def fake_materialize(db, today, shard, heartbeat, stats):
+            stats["capped"] += 2
+            return 5
+
+        async def leased(shard):
+            return True
+
+        async def release(db, name, holder):
+            return None
+
+        monkeypatch.setattr(recurring_scheduler.settings, "recurring_shards", 2)
+        monkeypatch.setattr(recurring_scheduler, "_acquire", leased)
+        monkeypatch.setattr(recurring_scheduler, "release_lease", release)
+        monkeypatch.setattr(recurring_scheduler, "materialize_due_rules", fake_materialize)
+
+        await recurring_scheduler.run_startup_catchup()
+        status = recurring_scheduler.catchup_status()
+        assert (status["materialized"], status["capped"]) == (10, 4)
+
+    async def test_progress_separates_skipped_and_failed_shards(self, monkeypatch):
+        async def materialize(db, today, shard, heartbeat, stats):
+            if shard[0] == 1:
+                raise RuntimeError("boom")
+            return 3
+
+        async def acquire(shard):
+            return shard != 2  # another worker holds shard 2
+
+        async def release(db, name, holder):
+            return None
+
+        monkeypatch.setattr(recurring_scheduler.settings, "recurring_shards", 3)
+        monkeypatch.setattr(recurring_scheduler, "_acquire", acquire)
+        monkeypatch.setattr(recurring_scheduler, "release_lease", release)
+        monkeypatch.setattr(recurring_scheduler, "materialize_due_rules", materialize)
+
+        await recurring_scheduler.run_startup_catchup()
+        status = recurring_scheduler.catchup_status()
+        assert status["shards_total"] == 3
+        assert (status["shards_done"], status["shards_skipped"], status["shards_failed"]) == (1, 1, 1)
+        assert status["materialized"] == 3
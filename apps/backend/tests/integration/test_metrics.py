@@ -0,0 +1,50 @@
+"""Tests for the Prometheus-style /metrics endpoint."""
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core.metrics import LLM_CALLS, Registry
+from app.db.models.group import Group
+from app.services.llm import LLMError, parse_with_llm
+
+
+class TestMetricsEndpoint:
+    async def test_exports_route_templates(self, client: AsyncClient, auth_token: str, test_group: Group):
+        await client.get(
+            f"/api/v1/groups/{test_group.id}/expenses",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        resp = await client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        body = resp.text
+        assert "# TYPE http_requests_total counter" in body
+        assert 'http_requests_total{method="GET",route="/api/v1/groups/{group_id}/expenses",status="200"}' in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/groups/{group_id}/expenses",le="+Inf"}' in body
+        assert test_group.id not in body
+        assert "# TYPE recurring_materialized_expenses_total counter" in body
+
+    async def test_token_required_when_configured(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "metrics_token", "s3cret")
+        assert (await client.get("/metrics")).status_code == 401
+        resp = await client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+        assert resp.status_code == 200
+
+    async def test_llm_errors_are_counted(self, monkeypatch):
+        monkeypatch.setattr(settings, "openrouter_api_key", "")
+        before = LLM_CALLS.value("text", "error")
+        with pytest.raises(LLMError):
+            await parse_with_llm(system="s", user="u", schema={})
+        assert LLM_CALLS.value("text", "error") == before + 1
+
+
+class TestRegistry:
+    def test_render_with_collector_and_escaping(self):
+        registry = Registry()
+        counter = registry.counter("jobs_total", "Jobs.", ("name",))
+        counter.inc('say "hi"')
+        counter.inc('say "hi"', amount=2)
+        registry.register_collector(lambda: [("queue_depth", "gauge", "Depth.", [("queue_depth", {}, 7)])])
+        text = registry.render()
+        assert 'jobs_total{name="say \\"hi\\""} 3' in text
+        assert "# TYPE queue_depth gauge\nqueue_depth 7" in text
@@ -0,0 +1,76 @@
+"""Tests for the opt-in profiling endpoints and per-request cProfile capture."""
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.core import profiling
+
+
+@pytest.fixture
+def profiling_enabled(monkeypatch):
+    monkeypatch.setattr(settings, "profiling_token", "prof-token")
+    return {"X-Profile-Token": "prof-token"}
+
+
+class TestProfilingAccess:
+    async def test_hidden_when_disabled(self, client: AsyncClient):
+        resp = await client.get("/debug/profile", params={"seconds": 0.01})
+        assert resp.status_code == 404
+
+    async def test_wrong_token_rejected(self, client: AsyncClient, profiling_enabled):
+        resp = await client.get("/debug/profile", params={"seconds": 0.01}, headers={"X-Profile-Token": "nope"})
+        assert resp.status_code == 403
+
+    async def test_request_not_profiled_without_token(self, client: AsyncClient, profiling_enabled):
+        resp = await client.get("/healthz")
+        assert "x-profile-id" not in resp.headers
+
+
+class TestSamplingProfiler:
+    async def test_returns_collapsed_stacks(self, client: AsyncClient, profiling_enabled):
+        resp = await client.get(
+            "/debug/profile", params={"seconds": 0.2, "interval_ms": 5}, headers=profiling_enabled
+        )
+        assert resp.status_code == 200
+        assert int(resp.headers["x-profile-samples"]) > 0
+        lines = resp.text.strip().splitlines()
+        assert lines
+        stack, count = lines[0].rsplit(" ", 1)
+        assert int(count) >= 1
+        assert any(line.startswith("MainThread;") for line in lines)
+
+    async def test_one_session_at_a_time(self, client: AsyncClient, profiling_enabled):
+        first = asyncio.create_task(
+            client.get("/debug/profile", params={"seconds": 0.3}, headers=profiling_enabled)
+        )
+        await asyncio.sleep(0.05)
+        second = await client.get("/debug/profile", params={"seconds": 0.01}, headers=profiling_enabled)
+        assert second.status_code == 409
+        assert (await first).status_code == 200
+
+
+class TestRequestProfile:
+    async def test_profile_captured_and_retrievable(self, client: AsyncClient, profiling_enabled):
+        resp = await client.get("/healthz", headers=profiling_enabled)
+        assert resp.status_code == 200
+        profile_id = resp.headers["x-profile-id"]
+
+        resp = await client.get(f"/debug/profiles/{profile_id}", headers=profiling_enabled)
+        assert resp.status_code == 200
+        assert resp.text.startswith("GET /healthz")
+        assert "function calls" in resp.text
+
+    async def test_unknown_profile_404(self, client: AsyncClient, profiling_enabled):
+        resp = await client.get("/debug/profiles/doesnotexist", headers=profiling_enabled)
+        assert resp.status_code == 404
+
+    def test_store_keeps_only_recent_profiles(self):
+        import cProfile
+
+        store = profiling.ProfileStore(size=2)
+        for i in range(3):
+            store.add(str(i), cProfile.Profile(), f"req {i}")
+        assert store.get("0") is None
+        assert store.get("2").startswith("req 2")
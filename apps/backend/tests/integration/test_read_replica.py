@@ -0,0 +1,95 @@
+"""Tests for routing read-only routes to the read replica (DB_READ_URL)."""
+import os
+import tempfile
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import deps
+from app.db import session as db_session_module
+from app.db.session import Base
+from app.db.models.group import Group
+from app.db.models.user import User
+
+
+@pytest_asyncio.fixture
+async def replica_sessions(monkeypatch):
+    """A schema-only database installed as the read replica; yields its sessionmaker."""
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    monkeypatch.setattr(db_session_module, "ReadSessionLocal", sessions)
+    monkeypatch.setattr(deps, "_recent_writers", {})
+    yield sessions
+    await engine.dispose()
+    os.remove(path)
+
+
+@pytest_asyncio.fixture
+async def empty_replica(replica_sessions):
+    """An empty replica standing in for a lagging one; users fall back to the primary."""
+    yield
+
+
+class TestReadReplicaRouting:
+    async def test_reads_use_primary_without_replica(
+        self, client: AsyncClient, auth_token: str, test_group: Group
+    ):
+        resp = await client.get("/api/v1/groups/", headers={"Authorization": f"Bearer {auth_token}"})
+        assert resp.status_code == 200
+        assert [g["id"] for g in resp.json()] == [test_group.id]
+
+    async def test_reads_go_to_replica(
+        self, client: AsyncClient, auth_token: str, test_group: Group, empty_replica
+    ):
+        resp = await client.get("/api/v1/groups/", headers={"Authorization": f"Bearer {auth_token}"})
+        assert resp.status_code == 200
+        assert resp.json() == []
+
+    async def test_own_writes_are_read_from_primary(
+        self, client: AsyncClient, auth_token: str, test_group: Group, empty_replica
+    ):
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        resp = await client.post("/api/v1/groups/", json={"name": "Trip"}, headers=headers)
+        assert resp.status_code == 200
+
+        resp = await client.get("/api/v1/groups/", headers=headers)
+        assert resp.status_code == 200
+        assert {g["name"] for g in resp.json()} == {"Test Group", "Trip"}
+
+    async def test_read_your_writes_window_expires(
+        self, client: AsyncClient, auth_token: str, test_group: Group, empty_replica, monkeypatch
+    ):
+        monkeypatch.setattr(deps.settings, "read_your_writes_seconds", 0.0)
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        await client.post("/api/v1/groups/", json={"name": "Trip"}, headers=headers)
+
+        resp = await client.get("/api/v1/groups/", headers=headers)
+        assert resp.json() == []
+
+    async def test_replica_read_never_checks_out_a_primary_connection(
+        self, client: AsyncClient, auth_token: str, test_user: User, db_session: AsyncSession, replica_sessions
+    ):
+        async with replica_sessions() as replica:
+            replica.add(User(id=test_user.id, email=test_user.email, name=test_user.name, auth_provider="email"))
+            await replica.commit()
+        # Like a fresh request session: no open connection, nothing in the identity map.
+        await db_session.commit()
+        db_session.expunge_all()
+        checkouts = []
+        pool = db_session.bind.sync_engine.pool
+        listener = lambda *args: checkouts.append(1)  # noqa: E731
+        event.listen(pool, "checkout", listener)
+        try:
+            resp = await client.get("/api/v1/groups/", headers={"Authorization": f"Bearer {auth_token}"})
+        finally:
+            event.remove(pool, "checkout", listener)
+        assert resp.status_code == 200
+        assert resp.json() == []
+        assert checkouts == []
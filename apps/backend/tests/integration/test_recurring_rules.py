@@ -4,14 +4,15 @@ from decimal import Decimal
 
 import pytest
 from httpx import AsyncClient
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.metrics import RECURRING_CAPPED, RECURRING_MATERIALIZED
 from app.db.models.expense import Expense, ExpenseSplit
 from app.db.models.group import Group, GroupMember
 from app.db.models.recurring_rule import RecurringRule
 from app.db.models.user import User
-from app.services.recurring_expenses import materialize_due_rules
+from app.services.recurring_expenses import materialize_due_rules, shard_of_group
 
 
 async def _add_user(db: AsyncSession, email: str, name: str) -> User:
@@ -98,6 +99,23 @@ class TestMaterializeDueRules:
         await db_session.refresh(rule)
         assert rule.next_run_at == date(2026, 4, 1)
 
+    async def test_materialized_count_is_exported_as_metric(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        await _add_rule(
+            db_session, group=g, payer=me, members=[me],
+            total=300.0, day_of_month=1,
+            next_run_at=date(2026, 1, 1), created_by=test_user,
+        )
+        before = RECURRING_MATERIALIZED.value()
+
+        created = await materialize_due_rules(db_session, today=date(2026, 3, 1))
+
+        assert created == 3
+        assert RECURRING_MATERIALIZED.value() - before == 3
+
     async def test_future_rule_is_skipped(
         self, db_session: AsyncSession, test_user: User
     ):
@@ -187,6 +205,195 @@ class TestMaterializeDueRules:
         # Next run advances to March 31.
         assert rule.next_run_at == date(2026, 3, 31)
 
+    async def test_missed_months_are_caught_up_with_their_own_dates(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        f = await _add_member(db_session, g, friend)
+        rule = await _add_rule(
+            db_session, group=g, payer=me, members=[me, f],
+            total=1000.0, day_of_month=31,
+            next_run_at=date(2026, 1, 31), created_by=test_user,
+        )
+
+        created = await materialize_due_rules(db_session, today=date(2026, 4, 2))
+        assert created == 3
+
+        exps = (await db_session.execute(
+            select(Expense).where(Expense.group_id == g.id).order_by(Expense.date)
+        )).scalars().all()
+        assert [e.date.date() for e in exps] == [date(2026, 1, 31), date(2026, 2, 28), date(2026, 3, 31)]
+        await db_session.refresh(rule)
+        assert rule.next_run_at == date(2026, 4, 30)
+
+    async def test_catch_up_is_capped_and_resumes_next_run(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        f = await _add_member(db_session, g, friend)
+        rule = await _add_rule(
+            db_session, group=g, payer=me, members=[me, f],
+            total=1000.0, day_of_month=1,
+            next_run_at=date(2026, 1, 1), created_by=test_user,
+        )
+
+        before = RECURRING_CAPPED.value()
+        stats: dict = {}
+        c1 = await materialize_due_rules(db_session, today=date(2026, 3, 1), max_occurrences=2, stats=stats)
+        await db_session.refresh(rule)
+        assert c1 == 2
+        assert rule.is_active is True
+        assert rule.next_run_at == date(2026, 3, 1)
+        assert stats == {"capped": 1}
+        assert RECURRING_CAPPED.value() - before == 1
+
+        stats = {}
+        c2 = await materialize_due_rules(db_session, today=date(2026, 3, 1), max_occurrences=2, stats=stats)
+        await db_session.refresh(rule)
+        assert c2 == 1
+        assert rule.next_run_at == date(2026, 4, 1)
+        assert stats == {"capped": 0}
+
+    async def test_rules_spanning_several_chunks_each_materialize_once(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        f = await _add_member(db_session, g, friend)
+        rules = [
+            await _add_rule(
+                db_session, group=g, payer=me, members=[me, f],
+                total=100.0 * (i + 1), day_of_month=1,
+                next_run_at=date(2026, 3, 1), created_by=test_user,
+            )
+            for i in range(3)
+        ]
+
+        created = await materialize_due_rules(db_session, today=date(2026, 3, 1), batch_size=2)
+        assert created == 3
+
+        exps = (await db_session.execute(
+            select(Expense).where(Expense.group_id == g.id)
+        )).scalars().all()
+        assert sorted(e.recurring_rule_id for e in exps) == sorted(r.id for r in rules)
+        n_splits = len((await db_session.execute(select(ExpenseSplit))).scalars().all())
+        assert n_splits == 6
+        for r in rules:
+            await db_session.refresh(r)
+            assert r.next_run_at == date(2026, 4, 1)
+
+    async def test_shards_partition_rules_by_group(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        rules = []
+        for _ in range(6):
+            g = await _add_group(db_session, test_user)
+            me = await _add_member(db_session, g, test_user)
+            f = await _add_member(db_session, g, friend)
+            rules.append(await _add_rule(
+                db_session, group=g, payer=me, members=[me, f],
+                total=100.0, day_of_month=1,
+                next_run_at=date(2026, 3, 1), created_by=test_user,
+            ))
+
+        in_shard_0 = {r.id for r in rules if shard_of_group(r.group_id, 2) == 0}
+        c0 = await materialize_due_rules(db_session, today=date(2026, 3, 1), shard=(0, 2))
+        assert c0 == len(in_shard_0)
+        exps = (await db_session.execute(select(Expense))).scalars().all()
+        assert {e.recurring_rule_id for e in exps} == in_shard_0
+
+        c1 = await materialize_due_rules(db_session, today=date(2026, 3, 1), shard=(1, 2))
+        assert c0 + c1 == 6
+
+    async def test_shard_is_selected_before_locking(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        rule = await _add_rule(
+            db_session, group=g, payer=me, members=[me],
+            total=100.0, day_of_month=1,
+            next_run_at=date(2026, 3, 1), created_by=test_user,
+        )
+        assert rule.group_hash % 4 == shard_of_group(g.id, 4)
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and "FROM recurring_rules" in statement:
+                statements.append(statement)
+
+        engine = db_session.bind.sync_engine
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            other = (shard_of_group(g.id, 4) + 1) % 4
+            assert await materialize_due_rules(db_session, today=date(2026, 3, 1), shard=(other, 4)) == 0
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+        # The rule's shard differs, so the locking scan returned (and locked) nothing.
+        assert len(statements) == 1
+        assert "group_hash %" in statements[0]
+
+    async def test_lost_heartbeat_stops_the_pass(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        f = await _add_member(db_session, g, friend)
+        for _ in range(3):
+            await _add_rule(
+                db_session, group=g, payer=me, members=[me, f],
+                total=100.0, day_of_month=1,
+                next_run_at=date(2026, 3, 1), created_by=test_user,
+            )
+        beats = iter([True, False])
+
+        async def heartbeat() -> bool:
+            return next(beats)
+
+        created = await materialize_due_rules(
+            db_session, today=date(2026, 3, 1), batch_size=1, heartbeat=heartbeat
+        )
+        assert created == 1
+
+    async def test_failing_rule_is_paused_without_losing_its_chunk(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        f = await _add_member(db_session, g, friend)
+        good = await _add_rule(
+            db_session, group=g, payer=me, members=[me, f],
+            total=500.0, day_of_month=1,
+            next_run_at=date(2026, 3, 1), created_by=test_user,
+        )
+        # Duplicate split member violates uq_expense_member at insert time.
+        bad = await _add_rule(
+            db_session, group=g, payer=me, members=[f, f],
+            total=500.0, day_of_month=1,
+            next_run_at=date(2026, 3, 1), created_by=test_user,
+        )
+
+        created = await materialize_due_rules(db_session, today=date(2026, 3, 1))
+        assert created == 1
+
+        await db_session.refresh(good)
+        await db_session.refresh(bad)
+        assert good.is_active is True
+        assert good.next_run_at == date(2026, 4, 1)
+        assert bad.is_active is False
+        assert "Materialization error" in bad.paused_reason
+        exps = (await db_session.execute(select(Expense))).scalars().all()
+        assert [e.recurring_rule_id for e in exps] == [good.id]
+
 
 class TestRecurringRulesEndpointsAuth:
     async def test_list_requires_auth(self, client: AsyncClient):
@@ -254,6 +461,122 @@ class TestRecurringRulesEndpoints:
         )
         assert resp.status_code == 204
 
+    async def test_removing_the_payer_pauses_the_rule_and_blocks_resume(
+        self, client: AsyncClient, auth_token: str, db_session: AsyncSession, test_user: User
+    ):
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        f = await _add_member(db_session, g, friend)
+        await db_session.commit()
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        payload = {
+            "paid_by_member_id": f.id,
+            "total_amount": 15000,
+            "currency": "INR",
+            "note": "Rent",
+            "splits": [
+                {"member_id": me.id, "share_amount": 7500, "share_percentage": None},
+                {"member_id": f.id, "share_amount": 7500, "share_percentage": None},
+            ],
+            "day_of_month": 1,
+        }
+        resp = await client.post(f"/api/v1/groups/{g.id}/recurring-rules", json=payload, headers=headers)
+        assert resp.status_code == 201, resp.text
+        rid = resp.json()["id"]
+
+        resp = await client.delete(f"/api/v1/groups/{g.id}/members/{f.id}", headers=headers)
+        assert resp.status_code in (200, 204), resp.text
+
+        rule = (await db_session.execute(
+            select(RecurringRule).where(RecurringRule.id == rid).execution_options(populate_existing=True)
+        )).scalar_one()
+        assert rule.is_active is False
+        assert rule.paid_by_member_id is None
+        assert f"id={f.id}" in rule.paused_reason
+
+        resp = await client.post(f"/api/v1/groups/{g.id}/recurring-rules/{rid}/resume", headers=headers)
+        assert resp.status_code == 400
+        assert await materialize_due_rules(db_session, today=date(2027, 1, 1)) == 0
+
+
+class TestRecurringSchedules:
+    async def test_biweekly_rule_catches_up_every_other_week(
+        self, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        f = await _add_member(db_session, g, friend)
+        rule = await _add_rule(
+            db_session, group=g, payer=me, members=[me, f],
+            total=200.0, day_of_month=1,
+            next_run_at=date(2026, 3, 2), created_by=test_user,
+        )
+        rule.frequency, rule.interval, rule.day_of_month = "weekly", 2, None
+        await db_session.commit()
+
+        created = await materialize_due_rules(db_session, today=date(2026, 4, 1))
+        assert created == 3
+        exps = (await db_session.execute(select(Expense).order_by(Expense.date))).scalars().all()
+        assert [e.date.date() for e in exps] == [date(2026, 3, 2), date(2026, 3, 16), date(2026, 3, 30)]
+        await db_session.refresh(rule)
+        assert rule.next_run_at == date(2026, 4, 13)
+
+    async def test_create_weekly_rule_via_api(
+        self, client: AsyncClient, auth_token: str, db_session: AsyncSession, test_user: User
+    ):
+        friend = await _add_user(db_session, "friend@example.com", "Friend")
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        f = await _add_member(db_session, g, friend)
+        await db_session.commit()
+
+        payload = {
+            "paid_by_member_id": me.id,
+            "total_amount": 300,
+            "currency": "INR",
+            "note": "Cleaner",
+            "splits": [
+                {"member_id": me.id, "share_amount": 150},
+                {"member_id": f.id, "share_amount": 150},
+            ],
+            "frequency": "weekly",
+            "interval": 2,
+            "day_of_week": 4,
+        }
+        resp = await client.post(
+            f"/api/v1/groups/{g.id}/recurring-rules",
+            json=payload,
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert resp.status_code == 201, resp.text
+        body = resp.json()
+        assert body["frequency"] == "weekly"
+        assert body["interval"] == 2
+        assert body["day_of_week"] == 4
+        assert body["day_of_month"] is None
+        assert date.fromisoformat(body["next_run_at"]) > date.today()
+
+    async def test_weekly_rule_requires_day_of_week(
+        self, client: AsyncClient, auth_token: str, db_session: AsyncSession, test_user: User
+    ):
+        g = await _add_group(db_session, test_user)
+        me = await _add_member(db_session, g, test_user)
+        await db_session.commit()
+        resp = await client.post(
+            f"/api/v1/groups/{g.id}/recurring-rules",
+            json={
+                "paid_by_member_id": me.id,
+                "total_amount": 100,
+                "currency": "INR",
+                "splits": [{"member_id": me.id, "share_amount": 100}],
+                "frequency": "weekly",
+            },
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert resp.status_code == 422
+
 
 class TestExpenseExposesRecurringRuleId:
     async def test_materialized_expense_has_recurring_rule_id_in_response(
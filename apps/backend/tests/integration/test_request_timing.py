@@ -0,0 +1,61 @@
+"""Tests for per-request query counting, Server-Timing and the slow-query log."""
+import logging
+import re
+
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.db.models.group import Group
+from app.db.query_stats import param_shape
+
+
+class TestServerTiming:
+    async def test_header_reports_queries(self, client: AsyncClient, auth_token: str, test_group: Group):
+        resp = await client.get(
+            f"/api/v1/groups/{test_group.id}/expenses",
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+        assert resp.status_code == 200
+        m = re.match(r'db;dur=([\d.]+);desc="(\d+) queries", app;dur=([\d.]+)', resp.headers["server-timing"])
+        assert m, resp.headers["server-timing"]
+        assert int(m.group(2)) >= 1
+        assert float(m.group(3)) >= float(m.group(1))
+
+    async def test_header_can_be_disabled(self, client: AsyncClient, monkeypatch):
+        monkeypatch.setattr(settings, "server_timing", False)
+        resp = await client.get("/healthz")
+        assert "server-timing" not in resp.headers
+
+    async def test_request_log_uses_route_template(
+        self, client: AsyncClient, auth_token: str, test_group: Group, caplog
+    ):
+        with caplog.at_level(logging.INFO, logger="app.requests"):
+            await client.get(
+                f"/api/v1/groups/{test_group.id}/expenses",
+                headers={"Authorization": f"Bearer {auth_token}"},
+            )
+        line = next(r.getMessage() for r in caplog.records if r.name == "app.requests")
+        assert "route=/api/v1/groups/{group_id}/expenses" in line
+        assert "status=200" in line
+        assert re.search(r"db_queries=[1-9]", line)
+
+
+class TestSlowQueryLog:
+    async def test_slow_queries_logged_with_param_types_only(
+        self, client: AsyncClient, auth_token: str, test_group: Group, caplog, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "slow_query_ms", 0)
+        with caplog.at_level(logging.WARNING, logger="app.db.slow_query"):
+            await client.get(
+                f"/api/v1/groups/{test_group.id}",
+                headers={"Authorization": f"Bearer {auth_token}"},
+            )
+        messages = [r.getMessage() for r in caplog.records if r.name == "app.db.slow_query"]
+        assert messages
+        assert any("'str'" in m for m in messages)
+        assert not any(test_group.id in m for m in messages)
+
+    def test_param_shape(self):
+        assert param_shape({"a": 1, "b": "x"}) == {"a": "int", "b": "str"}
+        assert param_shape(("x", 2.5)) == ["str", "float"]
+        assert param_shape([{"a": 1}, {"a": 2}], executemany=True) == "2 x {'a': 'int'}"
@@ -0,0 +1,42 @@
+"""Tests for DB-backed scheduler leases."""
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.leases import release_lease, try_acquire_lease
+
+
+NOW = datetime(2026, 3, 1, 5, 0, 0)
+
+
+class TestSchedulerLeases:
+    async def test_first_holder_wins_until_expiry(self, db_session: AsyncSession):
+        assert await try_acquire_lease(db_session, "recurring:0/1", "a", 60, now=NOW)
+        assert not await try_acquire_lease(db_session, "recurring:0/1", "b", 60, now=NOW)
+        # Still held 59s later...
+        later = NOW + timedelta(seconds=59)
+        assert not await try_acquire_lease(db_session, "recurring:0/1", "b", 60, now=later)
+        # ...but free to take over once it expires.
+        expired = NOW + timedelta(seconds=61)
+        assert await try_acquire_lease(db_session, "recurring:0/1", "b", 60, now=expired)
+        assert not await try_acquire_lease(db_session, "recurring:0/1", "a", 60, now=expired)
+
+    async def test_holder_can_renew(self, db_session: AsyncSession):
+        assert await try_acquire_lease(db_session, "recurring:0/1", "a", 60, now=NOW)
+        renewed_at = NOW + timedelta(seconds=50)
+        assert await try_acquire_lease(db_session, "recurring:0/1", "a", 60, now=renewed_at)
+        # The renewal pushed expiry past the original deadline.
+        assert not await try_acquire_lease(
+            db_session, "recurring:0/1", "b", 60, now=NOW + timedelta(seconds=61)
+        )
+
+    async def test_release_only_by_holder(self, db_session: AsyncSession):
+        assert await try_acquire_lease(db_session, "recurring:0/1", "a", 60, now=NOW)
+        await release_lease(db_session, "recurring:0/1", "b")
+        assert not await try_acquire_lease(db_session, "recurring:0/1", "b", 60, now=NOW)
+        await release_lease(db_session, "recurring:0/1", "a")
+        assert await try_acquire_lease(db_session, "recurring:0/1", "b", 60, now=NOW)
+
+    async def test_leases_are_independent(self, db_session: AsyncSession):
+        assert await try_acquire_lease(db_session, "recurring:0/2", "a", 60, now=NOW)
+        assert await try_acquire_lease(db_session, "recurring:1/2", "b", 60, now=NOW)
@@ -0,0 +1,164 @@
+"""Tests for GET /groups/{id}/stats, GET /me/spending and the expense rollups behind them."""
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.expense_rollup import ExpenseRollup
+from app.db.models.group import Group, GroupMember
+from app.db.models.recurring_rule import RecurringRule
+from app.services.recurring_expenses import materialize_due_rules
+from app.services.spending_stats import group_stats, rebuild_group_stats, spending_cache
+
+
+def expense(members: list[GroupMember], amount: float, day: str, payer: int = 0, shares: tuple = (0.5, 0.5)) -> dict:
+    return {
+        "total_amount": amount, "currency": "INR", "date": f"{day}T12:00:00",
+        "paid_by_member_id": members[payer].id,
+        "splits": [{"member_id": m.id, "share_amount": amount * s} for m, s in zip(members, shares)],
+    }
+
+
+async def assert_matches_rebuild(db: AsyncSession, group_id: str) -> dict:
+    incremental = await group_stats(db, group_id)
+    await rebuild_group_stats(db, group_id)
+    await db.commit()
+    assert await group_stats(db, group_id) == incremental
+    return incremental
+
+
+class TestGroupStats:
+    async def test_months_payers_and_shares_follow_every_write(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        url = f"/api/v1/groups/{group.id}"
+        await client.post(f"{url}/expenses", headers=headers, json=expense(members, 100, "2026-08-10"))
+        moved = (await client.post(f"{url}/expenses", headers=headers, json=expense(members, 40, "2026-08-20", payer=1))).json()["id"]
+        gone = (await client.post(f"{url}/expenses", headers=headers, json=expense(members, 60, "2026-09-01"))).json()["id"]
+        # Edit: new month, amount and split; delete: drops out entirely.
+        await client.put(f"/api/v1/groups/expenses/{moved}", headers=headers,
+                         json=expense(members, 30, "2026-09-15", payer=1, shares=(1, 0)))
+        await client.delete(f"/api/v1/groups/expenses/{gone}", headers=headers)
+
+        resp = await client.get(f"{url}/stats", headers=headers)
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body["months"] == [
+            {"month": "2026-08", "currency": "INR", "total": 100.0, "count": 1},
+            {"month": "2026-09", "currency": "INR", "total": 30.0, "count": 1},
+        ]
+        assert body["by_payer"] == [
+            {"member_id": members[0].id, "currency": "INR", "paid": 100.0, "count": 1},
+            {"member_id": members[1].id, "currency": "INR", "paid": 30.0, "count": 1},
+        ]
+        assert body["by_member"] == [
+            {"member_id": members[0].id, "currency": "INR", "share": 80.0},
+            {"member_id": members[1].id, "currency": "INR", "share": 50.0},
+        ]
+        await assert_matches_rebuild(db_session, group.id)
+
+        resp = await client.get(f"{url}/stats", headers=headers, params={"start": "2026-09", "end": "2026-09"})
+        assert [m["month"] for m in resp.json()["months"]] == ["2026-09"]
+
+    async def test_member_removal_keeps_rollups_consistent(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers,
+                          json=expense(members, 90, "2026-08-01", shares=(1 / 3, 1 / 3, 1 / 3)))
+        await client.delete(f"/api/v1/groups/{group.id}/members/{members[2].id}", headers=headers)
+        # The member keeps their splits as a ghost; the rollups still match a full recount.
+        await assert_matches_rebuild(db_session, group.id)
+
+    async def test_materialized_expenses_are_counted(
+        self, db_session: AsyncSession, test_group_with_members: tuple[Group, list[GroupMember]]
+    ):
+        group, members = test_group_with_members
+        db_session.add(RecurringRule(
+            group_id=group.id, paid_by_member_id=members[0].id, total_amount=Decimal("500"), currency="INR",
+            note="Rent", splits_json=[{"member_id": m.id, "share_amount": 250} for m in members[:2]],
+            day_of_month=1, next_run_at=date(2026, 1, 1), is_active=True, created_by=members[0].user_id,
+        ))
+        await db_session.commit()
+        assert await materialize_due_rules(db_session, today=date(2026, 3, 1)) == 3
+        stats = await assert_matches_rebuild(db_session, group.id)
+        assert [(m["month"], m["total"]) for m in stats["months"]] == [
+            ("2026-01", 500.0), ("2026-02", 500.0), ("2026-03", 500.0),
+        ]
+
+    async def test_members_only_and_month_format(self, client: AsyncClient, auth_token: str, auth_token2: str, test_group: Group):
+        url = f"/api/v1/groups/{test_group.id}/stats"
+        resp = await client.get(url, headers={"Authorization": f"Bearer {auth_token2}"})
+        assert resp.status_code == 403
+        resp = await client.get(url, headers={"Authorization": f"Bearer {auth_token}"}, params={"start": "2026-13"})
+        assert resp.status_code == 400
+        resp = await client.get(url, headers={"Authorization": f"Bearer {auth_token}"}, params={"start": "Sept"})
+        assert resp.status_code == 422
+
+
+class TestMySpending:
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+        spending_cache.clear()
+        yield
+        spending_cache.clear()
+
+    async def test_own_shares_across_groups_cached_by_revision(
+        self,
+        client: AsyncClient,
+        auth_token: str,
+        db_session: AsyncSession,
+        test_group: Group,
+        test_group_with_members: tuple[Group, list[GroupMember]],
+    ):
+        group, members = test_group_with_members
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers,
+                          json=expense(members, 100, "2026-08-10", payer=1))
+        await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers,
+                          json=expense(members, 40, "2026-09-02", shares=(0.25, 0.75)))
+        own = (await db_session.execute(
+            select(GroupMember).where(GroupMember.group_id == test_group.id, GroupMember.user_id == members[0].user_id)
+        )).scalar_one()
+        usd = expense([own], 12, "2026-09-05", shares=(1,)) | {"currency": "USD"}
+        await client.post(f"/api/v1/groups/{test_group.id}/expenses", headers=headers, json=usd)
+
+        resp = await client.get("/api/v1/me/spending", headers=headers)
+        assert resp.status_code == 200
+        assert resp.json() == {
+            "months": [
+                {"month": "2026-08", "currency": "INR", "share": 50.0},
+                {"month": "2026-09", "currency": "INR", "share": 10.0},
+                {"month": "2026-09", "currency": "USD", "share": 12.0},
+            ],
+            "totals": [{"currency": "INR", "share": 60.0}, {"currency": "USD", "share": 12.0}],
+        }
+
+        # Not written through the API, so no revision moved: the cached result stands.
+        await db_session.execute(delete(ExpenseRollup))
+        await db_session.commit()
+        assert (await client.get("/api/v1/me/spending", headers=headers)).json()["totals"][0]["share"] == 60.0
+
+        await rebuild_group_stats(db_session)
+        await db_session.commit()
+        await client.post(f"/api/v1/groups/{group.id}/expenses", headers=headers,
+                          json=expense(members, 20, "2026-09-03"))
+        assert (await client.get("/api/v1/me/spending", headers=headers)).json()["totals"][0]["share"] == 70.0
+
+    async def test_no_groups(self, client: AsyncClient, auth_token2: str):
+        resp = await client.get("/api/v1/me/spending", headers={"Authorization": f"Bearer {auth_token2}"})
+        assert resp.json() == {"months": [], "totals": []}
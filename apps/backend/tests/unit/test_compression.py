@@ -0,0 +1,104 @@
+"""Unit tests for Accept-Encoding negotiation and CompressionMiddleware."""
+import gzip
+import zlib
+
+import pytest
+
+from app.core import compression
+from app.core.compression import compressible, negotiate
+from app.core.middleware import CompressionMiddleware
+
+
+def asgi_app(content_type: bytes, chunks: list[bytes], extra_headers=()):
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type), *extra_headers]
+        if len(chunks) == 1:
+            headers.append((b"content-length", str(len(chunks[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+async def call(app, accept_encoding: bytes = b"gzip"):
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding)]}
+    await CompressionMiddleware(app)(scope, None, send)
+    start = messages[0]
+    return dict(start["headers"]), [m["body"] for m in messages[1:]]
+
+
+JSON = b'{"note": "Groceries", "amount": 123.45}' * 100
+
+
+class TestNegotiate:
+    def test_picks_gzip_and_honours_q_zero(self, monkeypatch):
+        monkeypatch.setattr(compression, "ENCODERS", {"gzip": compression._gzip})
+        assert negotiate("gzip, deflate") == "gzip"
+        assert negotiate("gzip;q=0, deflate") is None
+        assert negotiate("*") == "gzip"
+        assert negotiate("identity") is None
+        assert negotiate("") is None
+
+    def test_client_q_then_server_preference(self, monkeypatch):
+        monkeypatch.setattr(compression, "ENCODERS", {"zstd": None, "br": None, "gzip": None})
+        assert negotiate("gzip, br, zstd") == "zstd"
+        assert negotiate("gzip;q=1.0, br;q=0.5") == "gzip"
+        assert negotiate("br;q=0.9, *;q=0.1") == "br"
+
+    def test_compressible_types(self):
+        assert compressible("application/json")
+        assert compressible("text/html; charset=utf-8")
+        assert compressible("application/problem+json")
+        assert not compressible("image/png")
+        assert not compressible("application/zip")
+        assert not compressible("text/event-stream")
+
+
+class TestCompressionMiddleware:
+    async def test_compresses_large_json_with_exact_length(self):
+        headers, bodies = await call(asgi_app(b"application/json", [JSON]))
+        assert headers[b"content-encoding"] == b"gzip"
+        assert headers[b"vary"] == b"Accept-Encoding"
+        assert int(headers[b"content-length"]) == len(bodies[0]) < len(JSON)
+        assert gzip.decompress(bodies[0]) == JSON
+
+    async def test_large_body_compressed_off_loop(self, monkeypatch):
+        monkeypatch.setattr("app.core.middleware.OFFLOAD_BYTES", 1024)
+        headers, bodies = await call(asgi_app(b"application/json", [JSON]))
+        assert gzip.decompress(bodies[0]) == JSON
+
+    async def test_small_body_untouched(self):
+        headers, bodies = await call(asgi_app(b"application/json", [b'{"status": "ok"}']))
+        assert b"content-encoding" not in headers
+        assert bodies == [b'{"status": "ok"}']
+
+    @pytest.mark.parametrize("content_type", [b"image/jpeg", b"application/pdf"])
+    async def test_binary_media_untouched(self, content_type):
+        headers, bodies = await call(asgi_app(content_type, [JSON]))
+        assert b"content-encoding" not in headers
+        assert bodies == [JSON]
+
+    async def test_already_encoded_untouched(self):
+        headers, bodies = await call(asgi_app(b"application/json", [JSON], [(b"content-encoding", b"br")]))
+        assert headers[b"content-encoding"] == b"br"
+        assert bodies == [JSON]
+
+    async def test_no_accepted_encoding(self):
+        headers, bodies = await call(asgi_app(b"application/json", [JSON]), accept_encoding=b"identity")
+        assert b"content-encoding" not in headers
+        assert bodies == [JSON]
+
+    async def test_streamed_body_is_flushed_per_chunk(self):
+        chunks = [b'{"row": %d}\n' % i for i in range(5)]
+        headers, bodies = await call(asgi_app(b"application/x-ndjson+json", chunks))
+        assert headers[b"content-encoding"] == b"gzip"
+        assert b"content-length" not in headers
+        # Each chunk decodes on arrival, before the stream ends.
+        d = zlib.decompressobj(31)
+        assert d.decompress(bodies[0]) == chunks[0]
+        assert b"".join(d.decompress(b) for b in bodies[1:]) + d.flush() == b"".join(chunks[1:])
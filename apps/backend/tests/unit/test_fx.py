@@ -0,0 +1,63 @@
+"""Unit tests for the FX rate table — dated lookups, cross rates and reloads."""
+import os
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from app.core.config import settings
+from app.services import fx
+from app.services.fx import FxTable
+
+RATES = "date,currency,rate\n2026-08-01,USD,1.10\n2026-08-01,INR,92.4\n2026-08-03,USD,1.12\n"
+
+
+class TestFxTable:
+    def test_latest_rate_on_or_before_the_day(self, tmp_path):
+        path = tmp_path / "rates.csv"
+        path.write_text(RATES)
+        table = FxTable.from_csv(str(path), "EUR")
+        assert table.rate("EUR", "USD", date(2026, 8, 2)) == (Decimal("1.10"), date(2026, 8, 1))
+        assert table.rate("eur", "usd", date(2026, 9, 1)) == (Decimal("1.12"), date(2026, 8, 3))
+        assert table.rate("USD", "EUR", date(2026, 8, 1)) == (1 / Decimal("1.10"), date(2026, 8, 1))
+        assert table.rate("USD", "USD", date(2020, 1, 1)) == (Decimal(1), None)
+        assert table.rate("EUR", "USD", date(2026, 7, 31)) is None
+        assert table.rate("GBP", "EUR", date(2026, 8, 1)) is None
+
+    def test_cross_rate_uses_the_newer_date(self, tmp_path):
+        path = tmp_path / "rates.csv"
+        path.write_text(RATES)
+        rate, day = FxTable.from_csv(str(path), "EUR").rate("USD", "INR", date(2026, 8, 5))
+        assert rate == Decimal("92.4") / Decimal("1.12") and day == date(2026, 8, 3)
+
+    def test_rejects_bad_rows(self, tmp_path):
+        path = tmp_path / "rates.csv"
+        path.write_text("date,currency,rate\n2026-08-01,USD,0\n")
+        with pytest.raises(ValueError, match=":2:"):
+            FxTable.from_csv(str(path), "EUR")
+
+
+class TestFxTableCache:
+    def test_loaded_once_and_reloaded_when_the_file_changes(self, tmp_path, monkeypatch):
+        path = tmp_path / "rates.csv"
+        path.write_text(RATES)
+        monkeypatch.setattr(settings, "fx_rates_path", str(path))
+        monkeypatch.setattr(fx, "_loaded", None)
+        table = fx.fx_table()
+        assert fx.fx_table() is table
+
+        path.write_text(RATES + "2026-08-04,USD,1.2\n")
+        os.utime(path, (0, os.stat(path).st_mtime + 5))
+        assert fx.fx_table().rate("EUR", "USD", date(2026, 8, 4))[0] == Decimal("1.2")
+
+        # A broken edit keeps serving the last good table.
+        path.write_text("oops\n")
+        os.utime(path, (0, os.stat(path).st_mtime + 10))
+        assert fx.fx_table().rate("EUR", "USD", date(2026, 8, 4))[0] == Decimal("1.2")
+
+    def test_unset_or_missing_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(fx, "_loaded", None)
+        monkeypatch.setattr(settings, "fx_rates_path", "")
+        assert fx.fx_table() is None
+        monkeypatch.setattr(settings, "fx_rates_path", str(tmp_path / "missing.csv"))
+        assert fx.fx_table() is None
@@ -0,0 +1,13 @@
+"""Unit tests for the in-process metric primitives."""
+from app.core.metrics import Histogram
+
+
+class TestHistogram:
+    def test_buckets_are_cumulative(self):
+        h = Histogram((0.1, 1.0))
+        for v in (0.05, 0.1, 0.5, 3.0):
+            h.observe(v)
+        snap = h.snapshot()
+        assert snap["buckets"] == {"0.1": 2, "1.0": 3, "+Inf": 4}
+        assert snap["count"] == 4
+        assert abs(snap["sum"] - 3.65) < 1e-9
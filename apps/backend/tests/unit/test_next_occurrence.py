@@ -0,0 +1,53 @@
+"""Unit tests for the recurring occurrence generator — weekly/monthly/yearly cadences."""
+from datetime import date
+
+from app.services.recurring_expenses import first_occurrence, next_occurrence
+
+
+class TestNextOccurrence:
+    def test_weekly_keeps_weekday(self):
+        assert next_occurrence(date(2026, 3, 2), "weekly", 1, None) == date(2026, 3, 9)
+
+    def test_biweekly(self):
+        assert next_occurrence(date(2026, 12, 21), "weekly", 2, None) == date(2027, 1, 4)
+
+    def test_monthly_interval_1_matches_next_monthly_date(self):
+        assert next_occurrence(date(2026, 1, 31), "monthly", 1, 31) == date(2026, 2, 28)
+
+    def test_quarterly_rolls_over_year(self):
+        assert next_occurrence(date(2026, 11, 15), "monthly", 3, 15) == date(2027, 2, 15)
+
+    def test_every_n_months_restores_clamped_day(self):
+        assert next_occurrence(date(2026, 2, 28), "monthly", 2, 31) == date(2026, 4, 30)
+        assert next_occurrence(date(2026, 4, 30), "monthly", 3, 31) == date(2026, 7, 31)
+
+    def test_yearly_leap_day_clamps_and_restores(self):
+        assert next_occurrence(date(2028, 2, 29), "yearly", 1, 29) == date(2029, 2, 28)
+        assert next_occurrence(date(2031, 2, 28), "yearly", 1, 29) == date(2032, 2, 29)
+
+
+class TestFirstOccurrence:
+    def test_weekly_same_weekday_is_today(self):
+        # 2026-03-04 is a Wednesday.
+        assert first_occurrence("weekly", today=date(2026, 3, 4), day_of_week=2) == date(2026, 3, 4)
+
+    def test_weekly_after_today_skips_a_week(self):
+        assert first_occurrence(
+            "weekly", today=date(2026, 3, 4), day_of_week=2, after_today=True
+        ) == date(2026, 3, 11)
+
+    def test_weekly_later_weekday_this_week(self):
+        assert first_occurrence("weekly", today=date(2026, 3, 4), day_of_week=4) == date(2026, 3, 6)
+
+    def test_monthly_passed_day_moves_to_next_month(self):
+        assert first_occurrence("monthly", today=date(2026, 3, 20), day_of_month=5) == date(2026, 4, 5)
+
+    def test_yearly_passed_month_moves_to_next_year(self):
+        assert first_occurrence(
+            "yearly", today=date(2026, 3, 20), day_of_month=10, month=1
+        ) == date(2027, 1, 10)
+
+    def test_yearly_upcoming_month_this_year(self):
+        assert first_occurrence(
+            "yearly", today=date(2026, 3, 20), day_of_month=31, month=6
+        ) == date(2026, 6, 30)